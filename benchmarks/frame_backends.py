@@ -0,0 +1,114 @@
+"""Compare the pandas and polars frame backends on the largest SZKB tables.
+
+Times the client-side preparation ``load-szkb`` does before rows reach the
+driver (parsing, Bond mapping, synthetic ids, key checks and projection to
+the model fields) for quotes and bonds, once streamed through pandas
+(``iter_csv_chunks`` + ``prepare_chunk``) and once as a lazy polars query
+(``iter_prepared_polars``). Inputs are generated unless ``--base-dir``
+points at real quotes.csv / bonds.csv files. Polars uses all cores unless
+``POLARS_MAX_THREADS`` says otherwise.
+
+Usage:
+    python benchmarks/frame_backends.py [--rows 5000000] [--chunk-size 100000] [--base-dir data/szkb]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from neo4j_ontology_loader.ingest.pandas_io import iter_csv_chunks  # noqa: E402
+from neo4j_ontology_loader.ingest.polars_io import iter_prepared_polars  # noqa: E402
+from neo4j_ontology_loader.ingest.prepare import prepare_chunk  # noqa: E402
+from neo4j_ontology_loader.schema.registry import load_ontology_schema  # noqa: E402
+from neo4j_ontology_loader.schema.szkb_specs import get_szkb_node_specs  # noqa: E402
+
+
+def write_quotes(path: str, rows: int, block: int = 1_000_000) -> None:
+    rng = np.random.default_rng(0)
+    start = pd.Timestamp("2000-01-01")
+    for offset in range(0, rows, block):
+        n = min(block, rows - offset)
+        dates = (start + pd.to_timedelta(np.arange(offset, offset + n), unit="min")).strftime("%Y-%m-%dT%H:%M:%S")
+        pd.DataFrame({
+            "listing_id": rng.integers(1000, 5000, n).astype(str),
+            "instrument_id": rng.integers(1, 100_000, n),
+            "quote_date": dates,
+            "quote": rng.random(n) * 100.0,
+            "volume": rng.integers(0, 10_000, n),
+            # Feed columns the model does not have; projection pushdown skips them
+            "bid": rng.random(n) * 100.0,
+            "ask": rng.random(n) * 100.0,
+            "source": "bench",
+        }).to_csv(path, mode="a" if offset else "w", header=not offset, index=False)
+
+
+def write_bonds(path: str, rows: int) -> None:
+    rng = np.random.default_rng(1)
+    ids = np.arange(rows).astype(str)
+    pd.DataFrame({
+        "id": np.char.add("B", ids),
+        "isin": np.char.add("CH", ids),
+        "name@de": np.where(rng.random(rows) < 0.2, None, np.char.add("Anleihe ", ids)),
+        "shortName@de": np.char.add("Anl ", ids),
+        "nominalCurrency": rng.choice(["CHF", "EUR", "USD"], rows),
+        "denomination": 5000.0,
+        "nominalAmount": rng.integers(1, 500, rows) * 1e6,
+        "issuerId": rng.integers(1, 5000, rows).astype(str),
+        "interestType": rng.choice(["Fixed", "Variable", "Floating rate", "Staggered", ""], rows),
+        "actInterestRate": (rng.random(rows) * 5).round(3),
+        "payFreqPeriod": rng.choice(["P1Y", "P6M", "P3M", "P1M", "P2Y"], rows),
+        "maturityDate": "2030-06-30",
+        "lastCouponDate": "2025-06-30",
+        "isCallable": rng.random(rows) < 0.1,
+        "exercisePrice": np.where(rng.random(rows) < 0.9, np.nan, 100.0),
+        "exercisePriceCurr": "CHF",
+    }).to_csv(path, index=False)
+
+
+def with_pandas(path: str, plan, chunk_size: int) -> int:
+    return sum(len(prepare_chunk(chunk, plan).rows) for chunk in iter_csv_chunks(path, chunk_size, dtype=plan.csv_dtypes()))
+
+
+def with_polars(path: str, plan, chunk_size: int) -> int:
+    return sum(len(part.rows) for part in iter_prepared_polars(path, plan, chunk_size))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=5_000_000, help="Generated quote rows (bonds: a tenth)")
+    parser.add_argument("--chunk-size", type=int, default=100_000)
+    parser.add_argument("--base-dir", help="Directory with quotes.csv / bonds.csv to use instead of generated ones")
+    args = parser.parse_args()
+
+    schema = load_ontology_schema()
+    specs = {spec.source: spec for spec in get_szkb_node_specs()}
+    with tempfile.TemporaryDirectory() as tmp:
+        base_dir = args.base_dir or tmp
+        if args.base_dir is None:
+            write_quotes(os.path.join(tmp, "quotes.csv"), args.rows)
+            write_bonds(os.path.join(tmp, "bonds.csv"), max(args.rows // 10, 1))
+        for source in ("quotes", "bonds"):
+            path = os.path.join(base_dir, f"{source}.csv")
+            spec = specs[source]
+            plan = spec.chunk_plan(schema.entity(spec.label))
+            rates = {}
+            for name, run in (("pandas", with_pandas), ("polars", with_polars)):
+                started = time.perf_counter()
+                rows = run(path, plan, args.chunk_size)
+                rates[name] = rows / (time.perf_counter() - started)
+                print(f"{source:7} {name:7} rows={rows} {rates[name]:,.0f} rows/s")
+            print(f"{source:7} speedup={rates['polars'] / rates['pandas']:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
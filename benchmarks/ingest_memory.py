@@ -0,0 +1,122 @@
+"""Per-row memory overhead of the client-side node ingest pipeline.
+
+Writes (or reuses) a synthetic quote CSV, streams it in chunks and pushes
+every chunk through ``ingest_nodes`` against a driver that discards the
+writes, once with rows carried as dicts (``df_to_rows`` + field filtering)
+and once as column-oriented ``RowBatch`` projections. For each chunk the
+traced allocation peak above the parsed DataFrame is divided by the chunk
+size, so the numbers are the bytes each row costs between reader and
+driver.
+
+Usage:
+    python benchmarks/ingest_memory.py [--rows 10000000] [--chunk-size 100000] [--path quotes.csv]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from neo4j_ontology_loader.ingest.nodes import ingest_nodes  # noqa: E402
+from neo4j_ontology_loader.ingest.pandas_io import df_to_rows, iter_csv_chunks  # noqa: E402
+from neo4j_ontology_loader.ingest.rows import RowBatch  # noqa: E402
+from neo4j_ontology_loader.models.quotes import Quote  # noqa: E402
+from neo4j_ontology_loader.neo4j.execution import RetryPolicy, WriteMetrics  # noqa: E402
+
+FIELDS = set(Quote.model_fields) | {"id"}
+
+
+class NullDriver:
+    """Accepts write transactions and drops the parameters."""
+
+    def session(self, **kwargs):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute_write(self, work, *args, **kwargs):
+        return work(self, *args, **kwargs)
+
+    def run(self, cypher, **params):
+        return self
+
+    def consume(self):
+        return None
+
+
+def write_quotes(path: str, rows: int, block: int = 1_000_000) -> None:
+    rng = np.random.default_rng(0)
+    start = pd.Timestamp("2000-01-01")
+    for offset in range(0, rows, block):
+        n = min(block, rows - offset)
+        dates = (start + pd.to_timedelta(np.arange(offset, offset + n), unit="min")).strftime("%Y-%m-%dT%H:%M:%S")
+        pd.DataFrame({
+            "instrument_id": rng.integers(1, 100_000, n),
+            "listing_id": rng.integers(1000, 5000, n),
+            "quote": rng.random(n) * 100.0,
+            "quote_date": dates,
+            "source": "bench",
+        }).to_csv(path, mode="a" if offset else "w", header=not offset, index=False)
+
+
+def as_dicts(df: pd.DataFrame):
+    return [{k: v for k, v in r.items() if k in FIELDS} for r in df_to_rows(df)]
+
+
+def as_columns(df: pd.DataFrame):
+    return RowBatch.from_frame(df, FIELDS)
+
+
+def measure(path: str, chunk_size: int, prepare) -> tuple[float, float, int]:
+    """Return (peak bytes per row, rows per second, rows) for one pass over the file."""
+    driver, policy = NullDriver(), RetryPolicy(max_attempts=1)
+    worst, total, elapsed = 0.0, 0, 0.0
+    tracemalloc.start()
+    try:
+        for df in iter_csv_chunks(path, chunk_size):
+            df["id"] = df["listing_id"].astype(str) + ":" + df["quote_date"].astype(str)
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+            started = time.perf_counter()
+            ingest_nodes(driver, label="Quote", key="id", rows=prepare(df), policy=policy, metrics=WriteMetrics())
+            elapsed += time.perf_counter() - started
+            worst = max(worst, (tracemalloc.get_traced_memory()[1] - base) / len(df))
+            total += len(df)
+    finally:
+        tracemalloc.stop()
+    return worst, total / elapsed, total
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--chunk-size", type=int, default=100_000)
+    parser.add_argument("--path", help="Existing quote CSV to use instead of generating one")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.path
+        if path is None:
+            path = os.path.join(tmp, "quotes.csv")
+            write_quotes(path, args.rows)
+        for name, prepare in (("dicts", as_dicts), ("columns", as_columns)):
+            per_row, rate, total = measure(path, args.chunk_size, prepare)
+            print(f"{name:8} rows={total} peak={per_row:,.0f} B/row ({per_row * args.chunk_size / 2**20:,.1f} MiB/chunk) {rate:,.0f} rows/s (traced)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,90 @@
+"""Measure CLI startup cost using ``python -X importtime``.
+
+Runs ``import neo4j_ontology_loader.cli`` (and optionally a CLI invocation
+such as ``--help``) in fresh interpreters, reports the median wall time and
+the slowest cumulative imports, and exits non-zero when the budget is
+exceeded.
+
+Usage:
+    python benchmarks/startup_importtime.py [--runs 10] [--budget-ms 150] [--top 15]
+    python benchmarks/startup_importtime.py -- clean-database --help
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+
+
+def _env() -> dict[str, str]:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(SRC), env.get("PYTHONPATH")]))
+    return env
+
+
+def _command(cli_args: list[str]) -> list[str]:
+    if cli_args:
+        code = (
+            "import sys; from neo4j_ontology_loader.cli import app; "
+            f"sys.argv = ['neo4j-ontology-loader', *{cli_args!r}]; app()"
+        )
+    else:
+        code = "import neo4j_ontology_loader.cli"
+    return [sys.executable, "-c", code]
+
+
+def wall_times_ms(cli_args: list[str], runs: int) -> list[float]:
+    times: list[float] = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(_command(cli_args), env=_env(), capture_output=True)
+        times.append((time.perf_counter() - start) * 1000.0)
+    return times
+
+
+def slowest_imports(cli_args: list[str], top: int) -> list[tuple[int, str]]:
+    """Return ``(cumulative_us, module)`` for the slowest top-level-ish imports."""
+    cmd = _command(cli_args)
+    proc = subprocess.run([cmd[0], "-X", "importtime", *cmd[1:]], env=_env(), capture_output=True, text=True)
+    rows: list[tuple[int, str]] = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, self_us, cumulative_us, module = (part.strip() for part in line.replace("import time:", "|", 1).split("|"))
+        rows.append((int(cumulative_us), module))
+    rows.sort(reverse=True)
+    return rows[:top]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--budget-ms", type=float, default=150.0)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("cli_args", nargs="*", help="CLI arguments to invoke after '--'")
+    args = parser.parse_args()
+
+    times = wall_times_ms(args.cli_args, args.runs)
+    median = statistics.median(times)
+    target = " ".join(args.cli_args) or "import neo4j_ontology_loader.cli"
+    print(f"{target}: median={median:.1f}ms min={min(times):.1f}ms max={max(times):.1f}ms runs={args.runs}")
+    print("slowest imports (cumulative):")
+    for cumulative_us, module in slowest_imports(args.cli_args, args.top):
+        print(f"  {cumulative_us / 1000.0:8.1f}ms  {module}")
+
+    if median > args.budget_ms:
+        print(f"FAIL: median {median:.1f}ms exceeds budget {args.budget_ms:.0f}ms")
+        return 1
+    print(f"OK: within budget {args.budget_ms:.0f}ms")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,78 @@
+"""Compare load-path preprocessing with and without column-wise validation.
+
+Builds a synthetic Quote feed, then times ``prepare_chunk`` with the
+``load-szkb`` Quote plan on chunks of it, once as loaded by default
+(native type conversion) and once with ``--validate``
+(``ChunkPlan(validate=True)``). Both produce the ``RowBatch``es that are
+written. The target is a validated/unvalidated ratio below 2x.
+
+Usage:
+    python benchmarks/validation_throughput.py [--rows 1000000] [--chunk-size 100000] [--repeat 3]
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from neo4j_ontology_loader.ingest.prepare import ChunkPlan, prepare_chunk  # noqa: E402
+from neo4j_ontology_loader.schema.registry import load_ontology_schema  # noqa: E402
+from neo4j_ontology_loader.schema.szkb_specs import get_szkb_node_specs  # noqa: E402
+
+
+def quote_frame(rows: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    listing = rng.integers(1000, 5000, rows).astype(float)
+    # A few missing listing ids force the float dtype seen with real CSVs
+    listing[:: max(rows // 1000, 1)] = np.nan
+    dates = pd.date_range("2000-01-01", periods=rows, freq="min").strftime("%Y-%m-%dT%H:%M:%S")
+    return pd.DataFrame({
+        "instrument_id": rng.integers(1, 100_000, rows),
+        "listing_id": listing,
+        "quote": rng.random(rows) * 100.0,
+        "quote_date": dates,
+        "source": "bench",
+    })
+
+
+def quote_plan(validate: bool) -> ChunkPlan:
+    spec = next(spec for spec in get_szkb_node_specs() if spec.label == "Quote")
+    return spec.chunk_plan(load_ontology_schema().entity("Quote"), validate=validate)
+
+
+def prepared_rows(df: pd.DataFrame, plan: ChunkPlan, chunk_size: int) -> int:
+    return sum(len(prepare_chunk(df.iloc[i:i + chunk_size], plan).rows) for i in range(0, len(df), chunk_size))
+
+
+def best_of(df: pd.DataFrame, plan: ChunkPlan, chunk_size: int, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        prepared_rows(df, plan, chunk_size)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--chunk-size", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    df = quote_frame(args.rows)
+    base = best_of(df, quote_plan(validate=False), args.chunk_size, args.repeat)
+    checked = best_of(df, quote_plan(validate=True), args.chunk_size, args.repeat)
+    ratio = checked / base
+    print(f"rows={args.rows} unvalidated={args.rows / base:,.0f} rows/s validated={args.rows / checked:,.0f} rows/s ratio={ratio:.2f}x")
+    return 0 if ratio <= 2.0 else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
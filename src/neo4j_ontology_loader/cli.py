@@ -1,140 +1,467 @@
-import typer
-import pandas as pd
-
-from neo4j_ontology_loader.neo4j.driver import create_driver
-from neo4j_ontology_loader.schema.extract import (
-    extract_node_type,
-    all_relationship_types,
-    inheritance_relationship_types,
-)
-from neo4j_ontology_loader.schema.ddl import constraint_cypher
-from neo4j_ontology_loader.schema.persist import persist_schema, persist_relationship_types
-from neo4j_ontology_loader.schema.ddl_apply import apply_cypher_statements
-from neo4j_ontology_loader.schema.ddl_maintenance import (
-    clean_database as clean_database_maintenance,
-)
-from neo4j_ontology_loader.schema.ddl_szkb import szkb_loading_indexes
-from neo4j_ontology_loader.schema.types import EntityDef, PropertyDef
-
-from neo4j_ontology_loader.models.issuer import Issuer
-from neo4j_ontology_loader.models.instrument_type import InstrumentType
-from neo4j_ontology_loader.models.trading_venue import TradingVenue
-from neo4j_ontology_loader.models.listing import Listing
-from neo4j_ontology_loader.models.cross_currency_rate import CrossCurrencyRate
-from neo4j_ontology_loader.models.quotes import Quote
-from neo4j_ontology_loader.models.types import (
-    FinancialInstrument as FI,
-    Currency,
-    Date,
-    DateTime,
-    ContractSize,
-    Price,
-    CurrencyAmount,
-    InterestRate,
-    FinancialInstrumentIdentification,
-    Shorttext,
-    Longtext,
-    CfiCode,
-)
-from neo4j_ontology_loader.models.equity import Equity
-from neo4j_ontology_loader.models.option import Option
-
-from neo4j_ontology_loader.ingest.nodes import ingest_nodes
-from neo4j_ontology_loader.ingest.relationship import ingest_relationships
-from neo4j_ontology_loader.ingest.pandas_io import df_to_rows
+"""Command line entry point.
+
+Heavy dependencies (pandas, the neo4j driver, Pydantic models and schema
+extraction) are imported inside the command that needs them so that
+``--help`` and light commands do not pay for them at startup.
+"""
 import os
-from neo4j_ontology_loader.schema import build_rel_cypher_casted
 
-app = typer.Typer()
+import typer
+
+# Kept in sync with ingest.pandas_io.DEFAULT_CHUNK_SIZE (not imported to avoid loading pandas)
+DEFAULT_CSV_CHUNK_SIZE = 100_000
+
+# Plain (non-Rich) help output: rendering help through Rich roughly doubles
+# the startup time of `--help`.
+app = typer.Typer(rich_markup_mode=None)
+
+# Connection settings given on the command line; applied on top of the
+# environment-based Settings when the driver is created.
+_connection_overrides: dict = {}
+# Target databases given with --database (several only for load-szkb)
+_databases: list[str] = []
+
+
+@app.callback()
+def main(
+    uri: str = typer.Option(None, "--uri", help="Neo4j URI (env: NEO4J_URI)"),
+    user: str = typer.Option(None, "--user", help="Neo4j user (env: NEO4J_USER)"),
+    databases: list[str] = typer.Option(
+        None, "--database",
+        help="Target database (env: NEO4J_DATABASE); load-szkb accepts several and loads them concurrently",
+    ),
+    max_connection_pool_size: int = typer.Option(
+        None, "--max-connection-pool-size", help="Driver connection pool size (env: NEO4J_MAX_CONNECTION_POOL_SIZE)",
+    ),
+    connection_acquisition_timeout: float = typer.Option(
+        None, "--connection-acquisition-timeout",
+        help="Seconds to wait for a pooled connection (env: NEO4J_CONNECTION_ACQUISITION_TIMEOUT)",
+    ),
+    fetch_size: int = typer.Option(None, "--fetch-size", help="Records per fetch batch (env: NEO4J_FETCH_SIZE)"),
+    max_transaction_retry_time: float = typer.Option(
+        None, "--max-transaction-retry-time",
+        help="Seconds the driver retries managed transactions; loader writes use their own retries "
+        "(env: NEO4J_MAX_TRANSACTION_RETRY_TIME)",
+    ),
+    keep_alive: bool = typer.Option(
+        None, "--keep-alive/--no-keep-alive", help="TCP keep-alive on connections (env: NEO4J_KEEP_ALIVE)",
+    ),
+    warm_up: bool = typer.Option(
+        None, "--warm-up/--no-warm-up", help="Verify connectivity when the driver is created (env: NEO4J_WARM_UP)",
+    ),
+):
+    _databases[:] = list(dict.fromkeys(databases or []))
+    _connection_overrides.update(
+        neo4j_uri=uri,
+        neo4j_user=user,
+        neo4j_database=_databases[0] if _databases else None,
+        neo4j_max_connection_pool_size=max_connection_pool_size,
+        neo4j_connection_acquisition_timeout=connection_acquisition_timeout,
+        neo4j_fetch_size=fetch_size,
+        neo4j_max_transaction_retry_time=max_transaction_retry_time,
+        neo4j_keep_alive=keep_alive,
+        neo4j_warm_up=warm_up,
+    )
+
+
+def _driver(database: str | None = None):
+    """The shared pooled driver for the effective connection settings (or for ``database``)."""
+    from neo4j_ontology_loader.config import settings
+    from neo4j_ontology_loader.neo4j.driver import shared_driver
+
+    if database is None and len(_databases) > 1:
+        raise typer.BadParameter("Only load-szkb accepts more than one --database")
+    overrides = dict(_connection_overrides, neo4j_database=database or _connection_overrides.get("neo4j_database"))
+    return shared_driver(settings.with_overrides(**overrides))
+
+
+def _target_drivers() -> dict:
+    """One shared driver per --database target, by name ("default" for the server's home database)."""
+    from neo4j_ontology_loader.config import settings
+    from neo4j_ontology_loader.neo4j.driver import shared_drivers
+
+    return shared_drivers(settings.with_overrides(**_connection_overrides), _databases or [None])
+
+
+def _close_drivers() -> None:
+    from neo4j_ontology_loader.neo4j.driver import close_shared_drivers
+    from neo4j_ontology_loader.neo4j.execution import write_metrics
+    from utils.logging import get_logger
+
+    if write_metrics.units or write_metrics.failures:
+        get_logger().info("write metrics %s", write_metrics.summary())
+    close_shared_drivers()
 
 @app.command()
-def install_schema():
-    driver = create_driver()
-    try:
-        # Add all entity models under models/ (excluding relationship-only models)
-        for model in (
-            Issuer,
-            InstrumentType,
-            TradingVenue,
-            Listing,
-            CrossCurrencyRate,
-            Quote,
-        ):
-            node = extract_node_type(model)
-            persist_schema(driver, node)
-            apply_cypher_statements(driver, constraint_cypher(node))
+def install_schema(
+    no_cache: bool = typer.Option(
+        False,
+        "--no-cache",
+        help="Re-extract the schema from the models instead of using the on-disk schema cache",
+    ),
+):
+    from neo4j_ontology_loader.schema.ddl import constraint_cypher, object_property_constraint_cypher
+    from neo4j_ontology_loader.schema.persist import persist_schema, persist_relationship_types
+    from neo4j_ontology_loader.schema.ddl_apply import apply_cypher_statements
+    from neo4j_ontology_loader.schema.registry import load_ontology_schema
 
-        # Persist node types for type system (models/types.py)
-        # FinancialInstrument is abstract: constraints are skipped and it represents a schema concept
-        for model, is_abstract in (
-            (Currency, False),
-            (Date, False),
-            (DateTime, False),
-            (ContractSize, False),
-            (Price, False),
-            (CurrencyAmount, False),
-            (InterestRate, False),
-            (FinancialInstrumentIdentification, False),
-            (Shorttext, False),
-            (Longtext, False),
-            (CfiCode, False),
-            (FI, True),
-        ):
-            node = extract_node_type(model, abstract=is_abstract)
+    schema = load_ontology_schema(use_cache=not no_cache)
+    driver = _driver()
+    try:
+        # Registered entity models (models/*.py), the type system (models/types.py)
+        # and the flat SZKB Bond. Abstract types (FinancialInstrument) get no constraints.
+        for node in schema.entities:
             persist_schema(driver, node)
             apply_cypher_statements(driver, constraint_cypher(node))
+        # Materialized ObjectProperty nodes (Currency, Date, Price, ...) are keyed by their content
+        for node in schema.complex_properties:
+            apply_cypher_statements(driver, object_property_constraint_cypher(node))
 
-        # Bond model has nested complex fields and a currently incompatible import.
-        # We only persist what we can reliably map from SZKB bonds.csv.
-        bond_node = EntityDef(
-            name="Bond",
-            key="bond",
-            properties=[
-                PropertyDef(name="id", type="str", required=True, unique=True),
-                PropertyDef(name="isin", type="str", required=False, unique=True),
-                PropertyDef(name="name", type="str", required=False, unique=False),
-                PropertyDef(name="short_name", type="str", required=False, unique=False),
-                PropertyDef(name="currency_of_denomination", type="str", required=False, unique=False),
-                PropertyDef(name="denomination", type="float", required=False, unique=False),
-                PropertyDef(name="nominal_amount", type="float", required=False, unique=False),
-                PropertyDef(name="issuer_id", type="str", required=False, unique=False),
-                PropertyDef(name="interest_type", type="str", required=False, unique=False),
-                PropertyDef(name="interest_rate", type="float", required=False, unique=False),
-                PropertyDef(name="interest_payment_frequency", type="str", required=False, unique=False),
-                PropertyDef(name="maturity_date", type="str", required=False, unique=False),
-                PropertyDef(name="last_coupon_date", type="str", required=False, unique=False),
-                PropertyDef(name="is_callable", type="bool", required=False, unique=False),
-                PropertyDef(name="underlying_id", type="str", required=False, unique=False),
-                PropertyDef(name="conversion_price_value", type="float", required=False, unique=False),
-                PropertyDef(name="conversion_price_currency", type="str", required=False, unique=False),
-            ],
-        )
-        persist_schema(driver, bond_node)
-        apply_cypher_statements(driver, constraint_cypher(bond_node))
         # Persist relationship type definitions in ontology graph
         # Core relationships among primary entities
-        persist_relationship_types(driver, all_relationship_types())
+        persist_relationship_types(driver, schema.relationship_types)
         # Inheritance relations from concrete subtypes to abstract FinancialInstrument
-        persist_relationship_types(driver, inheritance_relationship_types())
+        persist_relationship_types(driver, schema.inheritance_relationship_types)
         typer.echo("Schema installed (ontology persisted + constraints applied).")
     finally:
-        driver.close()
+        _close_drivers()
+
+def _check_frame_backend(frame_backend: str, workers: int) -> None:
+    from neo4j_ontology_loader.ingest.polars_io import FRAME_BACKENDS
+
+    if frame_backend not in FRAME_BACKENDS:
+        raise typer.BadParameter(f"--frame-backend must be one of {', '.join(FRAME_BACKENDS)}")
+    if frame_backend == "polars" and workers > 1:
+        raise typer.BadParameter("--workers shards parsing for the pandas backend; polars parses on its own threads")
+
+
+def _prepared_parts(
+    path: str, plan, workers: int, read_chunks, frame_backend: str = "pandas", chunk_size: int = DEFAULT_CSV_CHUNK_SIZE
+):
+    """Prepared chunks of ``path``.
+
+    From a lazy polars query with ``--frame-backend polars`` (local files
+    polars can scan), from worker processes when it can be sharded, else
+    from ``read_chunks()``.
+    """
+    from neo4j_ontology_loader.ingest.parallel import can_shard, iter_prepared_shards
+    from neo4j_ontology_loader.ingest.prepare import prepare_chunk
+
+    if frame_backend == "polars":
+        from neo4j_ontology_loader.ingest.polars_io import can_scan, iter_prepared_polars
+        from utils.prefetch import read_ahead
+
+        if can_scan(path):
+            # The next chunk is prepared while this one is written
+            return read_ahead(iter_prepared_polars(path, plan, chunk_size))
+    if workers > 1 and can_shard(path):
+        return iter_prepared_shards(path, plan, workers=workers)
+    return (prepare_chunk(chunk, plan) for chunk in read_chunks())
+
+
+def _report_validation(label: str, part, rejects: str | None) -> None:
+    """Log rows rejected by ``--validate`` (and append them to ``rejects``)."""
+    if part.validation is not None:
+        from neo4j_ontology_loader.ingest.validation import report_validation
+
+        report_validation(label, part.validation, rejects)
+
+
+def _scan_chunks(path: str, chunk_size: int, plan):
+    """All columns of ``path``, chunk by chunk and read one chunk ahead (for --dry-run)."""
+    from neo4j_ontology_loader.ingest.arrow_io import is_columnar, iter_record_batches
+    from neo4j_ontology_loader.ingest.pandas_io import iter_csv_chunks
+    from utils.prefetch import read_ahead
+
+    if is_columnar(path):
+        return read_ahead(iter_record_batches(path))
+    return read_ahead(iter_csv_chunks(path, chunk_size, dtype=plan.csv_dtypes()))
+
+
+def _print_plan(tables, probe: bool, database: str | None = None) -> None:
+    """Report scanned tables; with ``probe``, time their writes on the target first (rolled back)."""
+    from neo4j_ontology_loader.ingest.plan import format_plan, probe_write_rate
+
+    if probe:
+        from neo4j.exceptions import DriverError, Neo4jError
+
+        try:
+            driver = _driver(database)
+            for table in tables:
+                if table.rows:
+                    probe_write_rate(driver, table)
+        except (DriverError, Neo4jError) as e:
+            typer.echo(f"Write probe failed ({e}); reporting without time estimates")
+        finally:
+            _close_drivers()
+    for line in format_plan(tables):
+        typer.echo(line)
+    typer.echo("Dry run: nothing was written.")
+
+
+def _ensure_indexes(driver, schema, needs=None, prefix: str = "") -> None:
+    """Create the indexes the load's lookups miss and wait until every index is ONLINE."""
+    from neo4j_ontology_loader.schema.ddl_advisor import ensure_load_indexes, index_cypher
+
+    advice = ensure_load_indexes(driver, schema, needs)
+    for need in advice.missing:
+        typer.echo(f"{prefix}Created index: {index_cypher(need)}")
+    if advice.uninstalled_constraints:
+        keys = ", ".join(f"{n.label}.{'/'.join(n.properties)}" for n in advice.uninstalled_constraints)
+        typer.echo(f"{prefix}Warning: no constraint on {keys} yet; run install-schema for indexed MERGEs")
+
+
+def _initial_load_keys(schema, object_properties: bool, rollup: bool) -> dict[str, str]:
+    """MERGE key per label an SZKB load writes (--initial-load)."""
+    from neo4j_ontology_loader.schema.szkb_specs import get_szkb_node_specs
+    from neo4j_ontology_loader.schema.types import OBJECT_PROPERTY_KEY
+
+    keys = {spec.label: spec.key for spec in get_szkb_node_specs()}
+    if rollup:
+        keys["QuoteBar"] = "id"
+    if object_properties:
+        keys.update((node.name, OBJECT_PROPERTY_KEY) for node in schema.complex_properties)
+    return keys
+
+
+def _check_empty(driver, keys, prefix: str = "") -> None:
+    from neo4j_ontology_loader.schema.ddl_initial_load import nonempty_labels
+
+    busy = nonempty_labels(driver, keys)
+    if busy:
+        raise typer.BadParameter(
+            f"{prefix}--initial-load needs empty labels; {', '.join(busy)} already have nodes (see clean-database)"
+        )
+
+
+def _defer_schema(driver, schema, keys, prefix: str = ""):
+    """Keep only the key constraints/indexes of the loaded labels (--initial-load)."""
+    from neo4j_ontology_loader.schema.ddl_advisor import planned_unique_keys
+    from neo4j_ontology_loader.schema.ddl_initial_load import defer_schema
+
+    deferred = defer_schema(driver, keys, planned_unique_keys(schema))
+    typer.echo(f"{prefix}Initial load: {len(deferred.dropped)} constraints and indexes deferred until the end")
+    return deferred
+
+
+def _restore_schema(driver, schema, deferred, prefix: str = "") -> bool:
+    """Rebuild the full schema after --initial-load; False if constraints could not be created."""
+    from neo4j_ontology_loader.schema.ddl_initial_load import format_restore, restore_schema
+    from neo4j_ontology_loader.schema.ddl_szkb import szkb_loading_indexes
+
+    typer.echo(f"{prefix}Rebuilding constraints and indexes ...")
+    report = restore_schema(driver, schema, deferred, szkb_loading_indexes(schema))
+    for line in format_restore(report):
+        typer.echo(prefix + line)
+    return not report.violations
+
+
+def _key_needs(label: str, key: str) -> list:
+    from neo4j_ontology_loader.schema.ddl_advisor import IndexNeed
+
+    return [IndexNeed(label, (key,), (f"MERGE key of {label}",))]
+
+
+def _load_nodes_server_side(
+    label: str, key: str, csv_path: str, client_options: bool, ensure_indexes: bool = True
+) -> None:
+    from neo4j_ontology_loader.ingest.arrow_io import is_columnar
+    from neo4j_ontology_loader.ingest.server_side import file_url, load_csv_nodes
+    from neo4j_ontology_loader.schema.registry import load_ontology_schema
+
+    if client_options:
+        raise typer.BadParameter("--server-side cannot be combined with --validate or --convert-csv")
+    if csv_path == "-" or is_columnar(csv_path):
+        raise typer.BadParameter("--server-side needs a CSV file the server can read")
+
+    schema = load_ontology_schema()
+    entity = schema.entity(label)
+    url = file_url(csv_path)
+    driver = _driver()
+    try:
+        if ensure_indexes:
+            _ensure_indexes(driver, schema, _key_needs(label, key))
+        counters = load_csv_nodes(driver, url, label, key, entity=entity)
+        typer.echo(
+            f"Loaded nodes for label={label} from {url} on the server "
+            f"(created={counters.nodes_created} properties_set={counters.properties_set})"
+        )
+    finally:
+        _close_drivers()
+
 
 @app.command()
-def load_nodes(label: str, key: str, csv_path: str):
-    driver = create_driver()
+def load_nodes(
+    label: str,
+    key: str,
+    csv_path: str = typer.Argument(
+        ...,
+        help="CSV (optionally .gz/.bz2/.xz/.zst compressed; '-' for stdin), Parquet (.parquet) or Arrow IPC (.arrow) input",
+    ),
+    validate: bool = typer.Option(
+        False, "--validate", help="Validate and coerce rows against the label's model before writing",
+    ),
+    rejects: str = typer.Option(
+        None, "--rejects", help="Append rows rejected by --validate to this CSV file",
+    ),
+    convert_csv: bool = typer.Option(
+        False, "--convert-csv", help="Convert CSV input to a cached Parquet file and load from that",
+    ),
+    chunk_size: int = typer.Option(
+        DEFAULT_CSV_CHUNK_SIZE, "--chunk-size", help="Rows per chunk when streaming CSV input",
+    ),
+    server_side: bool = typer.Option(
+        False, "--server-side",
+        help="Let Neo4j read the CSV with LOAD CSV; csv_path is relative to the server's import directory (or a URL)",
+    ),
+    rollup: bool = typer.Option(
+        False, "--rollup", help="For Quote: maintain daily/weekly/monthly QuoteBar OHLC rollups while loading",
+    ),
+    workers: int = typer.Option(
+        1, "--workers", help="Parse and preprocess plain CSV files in this many processes (byte-range shards)",
+    ),
+    frame_backend: str = typer.Option(
+        "pandas", "--frame-backend",
+        help="pandas | polars (lazy multithreaded scans of local files; requires the polars extra)",
+    ),
+    dry_run: bool = typer.Option(
+        False, "--dry-run",
+        help="Scan the input and report rows, keys, duplicates, nulls and a time estimate; writes nothing",
+    ),
+    probe: bool = typer.Option(
+        True, "--probe/--no-probe",
+        help="With --dry-run: time sample MERGE batches on the target in a rolled-back transaction",
+    ),
+    ensure_indexes: bool = typer.Option(
+        True, "--ensure-indexes/--no-ensure-indexes",
+        help="Create a missing index on the label's key and wait until indexes are ONLINE before writing",
+    ),
+):
+    if rollup and label != "Quote":
+        raise typer.BadParameter("--rollup is only supported for label Quote")
+    _check_frame_backend(frame_backend, workers)
+    if server_side:
+        if rollup:
+            raise typer.BadParameter("--rollup cannot be combined with --server-side")
+        if dry_run:
+            raise typer.BadParameter("--dry-run reads the input locally and cannot be combined with --server-side")
+        _load_nodes_server_side(label, key, csv_path, validate or convert_csv, ensure_indexes)
+        return
+
+    from neo4j_ontology_loader.ingest.nodes import ingest_nodes
+    from neo4j_ontology_loader.ingest.pandas_io import iter_csv_chunks
+    from neo4j_ontology_loader.ingest.arrow_io import cached_parquet_for_csv, is_columnar, iter_record_batches
+    from neo4j_ontology_loader.ingest.prepare import ChunkPlan, native_types
+    from neo4j_ontology_loader.ingest.rows import RowBatch
+    from utils.prefetch import read_ahead
+    from neo4j_ontology_loader.schema.registry import load_ontology_schema
+
+    schema = load_ontology_schema()
+    entity = schema.entity(label)
+    plan = ChunkPlan(label=label, key=key, validate=validate, types=native_types(entity))
+    if dry_run:
+        from neo4j_ontology_loader.ingest.plan import scan_table
+
+        _print_plan([scan_table(_scan_chunks(csv_path, chunk_size, plan), plan, source=csv_path)], probe)
+        return
+    driver = _driver()
+
+    def write(rows: RowBatch) -> None:
+        if not len(rows):
+            return
+        if rollup:
+            from neo4j_ontology_loader.ingest.rollup import ingest_quotes_with_bars
+
+            ingest_quotes_with_bars(driver, rows, key=key)
+        else:
+            ingest_nodes(driver, label=label, key=key, rows=rows)
+
     try:
-        df = pd.read_csv(csv_path)
-        ingest_nodes(driver, label=label, key=key, rows=df_to_rows(df))
+        if ensure_indexes:
+            _ensure_indexes(driver, schema, _key_needs(label, key))
+        convert = convert_csv and csv_path != "-" and not is_columnar(csv_path)
+        path = cached_parquet_for_csv(csv_path, text_columns=plan.text_columns()) if convert else csv_path
+
+        def read_chunks():
+            if is_columnar(path):
+                # Read only the model fields (and the key) one row group / batch at a time
+                columns = {p.name for p in entity.properties} | {key} if entity is not None else None
+                return read_ahead(iter_record_batches(path, columns))
+            # Stream (decompressing) CSV chunks; the next chunk is parsed while this one is written
+            return read_ahead(iter_csv_chunks(path, chunk_size, dtype=plan.csv_dtypes()))
+
+        skipped = 0
+        for part in _prepared_parts(path, plan, workers, read_chunks, frame_backend, chunk_size):
+            _report_validation(label, part, rejects)
+            skipped += part.skipped
+            write(part.rows)
+        if skipped:
+            typer.echo(f"Skipped {skipped} {label} rows without {key}")
         typer.echo(f"Loaded nodes for label={label} from {csv_path}")
     finally:
-        driver.close()
+        _close_drivers()
 
 @app.command()
-def load_szkb(base_dir: str = typer.Option(
-    "data/szkb",
-    help="Base directory containing SZKB CSV files",
-)):
+def load_szkb(
+    base_dir: str = typer.Option(
+        "data/szkb",
+        help="Base directory containing SZKB CSV files",
+    ),
+    validate: bool = typer.Option(
+        False, "--validate", help="Validate and coerce rows against the models before writing",
+    ),
+    rejects: str = typer.Option(
+        None, "--rejects", help="Append rows rejected by --validate to this CSV file",
+    ),
+    convert_csv: bool = typer.Option(
+        False, "--convert-csv", help="Convert CSV inputs to cached Parquet files and load from those",
+    ),
+    chunk_size: int = typer.Option(
+        DEFAULT_CSV_CHUNK_SIZE, "--chunk-size", help="Rows per chunk when streaming CSV input",
+    ),
+    server_side: bool = typer.Option(
+        False, "--server-side",
+        help="Let Neo4j read the CSVs with LOAD CSV (base-dir must be inside the server's import directory)",
+    ),
+    server_base_url: str = typer.Option(
+        "file:///", "--server-base-url", help="With --server-side: URL under which the server sees base-dir",
+    ),
+    rollup: bool = typer.Option(
+        False, "--rollup", help="Maintain daily/weekly/monthly QuoteBar OHLC rollups while loading quotes",
+    ),
+    workers: int = typer.Option(
+        1, "--workers", help="Parse and preprocess plain CSV files in this many processes (byte-range shards)",
+    ),
+    frame_backend: str = typer.Option(
+        "pandas", "--frame-backend",
+        help="pandas | polars (lazy multithreaded scans of local files; requires the polars extra)",
+    ),
+    object_properties: bool = typer.Option(
+        False, "--object-properties",
+        help="Also write nested values (currencies, dates, interest rates, ...) as shared ObjectProperty nodes",
+    ),
+    dry_run: bool = typer.Option(
+        False, "--dry-run",
+        help="Scan the input and report rows, keys, duplicates, nulls and a time estimate; writes nothing",
+    ),
+    probe: bool = typer.Option(
+        True, "--probe/--no-probe",
+        help="With --dry-run: time sample MERGE batches on the target in a rolled-back transaction",
+    ),
+    ensure_indexes: bool = typer.Option(
+        True, "--ensure-indexes/--no-ensure-indexes",
+        help="Create the indexes the load's MERGE keys and relationship endpoints miss and wait until ONLINE",
+    ),
+    initial_load: bool = typer.Option(
+        False, "--initial-load",
+        help="Into empty labels: defer all but the key constraints/indexes, CREATE new keys, then rebuild the schema",
+    ),
+    checkpoint_path: str = typer.Option(
+        None, "--checkpoint",
+        help="Record the parts written per database here and resume from it "
+        "(default with several --database: BASE_DIR/.nolo-load-szkb.jsonl)",
+    ),
+):
     """Load SZKB sample CSVs into the current database as nodes.
 
     Files expected in base_dir:
@@ -143,205 +470,398 @@ def load_szkb(base_dir: str = typer.Option(
       - instruments.csv      -> Instrument     (key: id)
       - listings.csv         -> Listing        (key: id)
       - cross_rates.csv      -> CrossCurrencyRate (synthetic key: id=currency:date)
+      - bonds.csv            -> Bond           (key: id)
       - quotes.csv           -> Quote             (synthetic key: id=listing_id:quote_date)
+
+    Each file may also be provided as Parquet (<name>.parquet) or Arrow IPC
+    (<name>.arrow), which take precedence over the CSV.
+
+    With --server-side, CSV files are loaded by the server itself through
+    LOAD CSV; Bonds (which need a Python mapping) and tables only available
+    as Parquet/Arrow are still loaded client-side.
+
+    With --rollup, quotes are loaded client-side and folded into daily,
+    weekly and monthly QuoteBar nodes linked to their Listing.
+
+    With --workers N, plain CSV files are split into line-aligned byte
+    ranges that N processes parse and prepare (mapping, synthetic ids,
+    validation, key checks, field projection) while this process writes.
+
+    With --frame-backend polars, local CSV, Parquet and Arrow files are
+    scanned lazily by polars: only the model fields are parsed, on all
+    cores, and synthetic ids and the Bond mapping are computed column-wise.
+    Compressed CSV and --dry-run scans keep using pandas.
+
+    With --object-properties, nested values of tables that map them (Bond:
+    name, identification, currency, maturity date, interest rate, conversion
+    price) are written as ObjectProperty nodes; equal values are one node.
+
+    With --dry-run, every input is scanned once and the rows, distinct keys,
+    duplicates, empty keys, null rates and relationship rows per RelSpec are
+    reported with a write-time estimate; nothing is written.
+
+    Unless --no-ensure-indexes is given, indexes for the lookups the load
+    makes (see advise-indexes) are created first and awaited until ONLINE.
+
+    With --initial-load (the loaded labels must be empty), only each
+    label's key stays indexed while loading; the other constraints and
+    indexes are dropped, rows with keys not written before are CREATEd
+    instead of MERGEd, and afterwards the full install-schema constraint
+    set and the load indexes are built and verified. Violated constraints
+    are reported and the command exits with status 1.
+
+    With several --database targets, every input is parsed and prepared
+    once and each prepared batch is written to all targets concurrently,
+    one writer per target. A failing target stops while the others finish;
+    the parts each target wrote are checkpointed, so rerunning the same
+    command only writes what is missing. The checkpoint is removed once
+    every target has loaded everything.
     """
-    driver = create_driver()
+    if server_side and (validate or convert_csv):
+        raise typer.BadParameter("--server-side cannot be combined with --validate or --convert-csv")
+    _check_frame_backend(frame_backend, workers)
+
+    from neo4j_ontology_loader.ingest.fanout import FanOut, format_targets, input_fingerprint
+    from neo4j_ontology_loader.ingest.nodes import NewKeys, ingest_nodes
+    from neo4j_ontology_loader.ingest.pandas_io import iter_csv_chunks
+    from neo4j_ontology_loader.ingest.rollup import ingest_quotes_with_bars
+    from neo4j_ontology_loader.ingest.arrow_io import (
+        cached_parquet_for_csv,
+        input_columns,
+        is_columnar,
+        iter_record_batches,
+    )
+    from neo4j_ontology_loader.schema.registry import load_ontology_schema
+    from neo4j_ontology_loader.schema.szkb_specs import NodeSpec, get_szkb_node_specs
+    from utils.prefetch import read_ahead
+
+    schema = load_ontology_schema()
+
+    def full(path: str) -> str:
+        return os.path.join(base_dir, path)
+
+    def resolve(stem: str, suffixes=(".parquet", ".arrow", ".csv", ".csv.gz", ".csv.zst", ".csv.bz2", ".csv.xz")) -> str:
+        # Prefer typed columnar inputs over CSV when both are present
+        for suffix in suffixes:
+            if os.path.exists(full(stem + suffix)):
+                return full(stem + suffix)
+        return full(stem + ".csv")
+
+    if dry_run:
+        from neo4j_ontology_loader.ingest.plan import scan_table
+        from neo4j_ontology_loader.schema.szkb_specs import get_szkb_relationship_specs
+
+        tables = []
+        for spec in get_szkb_node_specs():
+            path = resolve(spec.source)
+            if not os.path.exists(path):
+                typer.echo(f"Skipped: {path} not found")
+                continue
+            plan = spec.chunk_plan(schema.entity(spec.label), validate=validate)
+            rel_specs = [rel for rel in get_szkb_relationship_specs() if rel.source == spec.source]
+            scanned = _scan_chunks(path, chunk_size, plan)
+            tables.append(scan_table(scanned, plan, rel_specs, source=os.path.basename(path)))
+        # Probed on the first target
+        _print_plan(tables, probe, _databases[0] if _databases else None)
+        return
+
+    targets = _target_drivers()
+    checkpoint = None
+    if checkpoint_path or len(targets) > 1:
+        from neo4j_ontology_loader.ingest.fanout import LoadCheckpoint
+
+        checkpoint = LoadCheckpoint(checkpoint_path or full(".nolo-load-szkb.jsonl"))
+        if initial_load and checkpoint:
+            raise typer.BadParameter(
+                f"--initial-load cannot resume; clean the databases and remove {checkpoint.path} first"
+            )
+    fanout = FanOut(targets, checkpoint)
+    prefix = {name: f"[{name}] " if len(targets) > 1 else "" for name in targets}
+    # Per target: values already written (a value such as Currency CHF is written once per run) and
+    # their count, keys written by --initial-load and the schema it rebuilds afterwards
+    interners: dict = {}
+    values = dict.fromkeys(targets, 0)
+    # Per target: elementIds of the owners and values that object property links connect
+    id_caches: dict = {}
+    if object_properties:
+        from neo4j_ontology_loader.ingest.element_ids import ElementIdCache
+        from neo4j_ontology_loader.ingest.object_properties import ValueInterner, ingest_object_properties
+
+        interners = {name: ValueInterner() for name in targets}
+        id_caches = {name: ElementIdCache() for name in targets}
+    object_sources = [spec.source for spec in get_szkb_node_specs() if spec.objects is not None] if object_properties else []
+    new_keys: dict = {}
+    deferred: dict = {}
     try:
-        def full(path: str) -> str:
-            return os.path.join(base_dir, path)
-
-        # Only persist properties that exist on the corresponding Pydantic models
-        model_fields_by_label: dict[str, set[str]] = {
-            "InstrumentType": set(InstrumentType.model_fields.keys()),
-            "TradingVenue": set(TradingVenue.model_fields.keys()),
-            "Listing": set(Listing.model_fields.keys()),
-            "CrossCurrencyRate": set(CrossCurrencyRate.model_fields.keys()),
-            "Quote": set(Quote.model_fields.keys()),
-            # For Bond and Instrument we only keep the technical key 'id' (no CSV-derived attributes)
-            "Bond": {"id"},
-            "Instrument": {"id"},
-        }
-
-        def filter_props(label: str, rows: list[dict]) -> list[dict]:
-            allowed = model_fields_by_label.get(label)
-            if not allowed:
-                return rows
-            return [{k: v for k, v in r.items() if k in allowed} for r in rows]
-
-        # 1) Instrument types
-        path = full("instrument_types.csv")
-        if os.path.exists(path):
-            df = pd.read_csv(path)
-            typer.echo(f"Loading InstrumentType from {path} ...")
-            rows = filter_props("InstrumentType", df_to_rows(df))
-            ingest_nodes(driver, label="InstrumentType", key="id", rows=rows)
-        else:
-            typer.echo(f"Skipped: {path} not found")
-
-        # 2) Trading venues
-        path = full("trading_venues.csv")
-        if os.path.exists(path):
-            df = pd.read_csv(path)
-            typer.echo(f"Loading TradingVenue from {path} ...")
-            rows = filter_props("TradingVenue", df_to_rows(df))
-            ingest_nodes(driver, label="TradingVenue", key="id", rows=rows)
-        else:
-            typer.echo(f"Skipped: {path} not found")
-
-        # 3) Instruments
-        path = full("instruments.csv")
-        if os.path.exists(path):
-            df_instruments = pd.read_csv(path)
-            # Only use `id` as upsert key; skip rows without a valid id
-            before = len(df_instruments)
-            df_instruments = df_instruments[df_instruments["id"].notna()]
-            try:
-                # also drop empty-string ids if any
-                df_instruments = df_instruments[df_instruments["id"].astype(str).str.strip() != ""]
-            except Exception:
-                # If coercion fails, proceed with non-null filter only
-                pass
-            after = len(df_instruments)
-            skipped = before - after
-            typer.echo(f"Loading Instrument from {path} ...")
-            if skipped:
-                typer.echo(f"Skipped {skipped} Instrument rows without id")
-            rows = filter_props("Instrument", df_to_rows(df_instruments))
-            ingest_nodes(driver, label="Instrument", key="id", rows=rows)
-        else:
-            typer.echo(f"Skipped: {path} not found")
-
-        # 4) Listings
-        path = full("listings.csv")
-        if os.path.exists(path):
-            df_listings = pd.read_csv(path)
-            typer.echo(f"Loading Listing from {path} ...")
-            rows = filter_props("Listing", df_to_rows(df_listings))
-            ingest_nodes(driver, label="Listing", key="id", rows=rows)
-        else:
-            typer.echo(f"Skipped: {path} not found")
-
-        # 5) Cross currency rates (no natural single key -> synthetic id)
-        path = full("cross_rates.csv")
-        if os.path.exists(path):
-            df_cross = pd.read_csv(path)
-            if "currency" in df_cross.columns and "date" in df_cross.columns:
-                df_cross["id"] = df_cross["currency"].astype(str) + ":" + df_cross["date"].astype(str)
+        if initial_load:
+            keys = _initial_load_keys(schema, object_properties, rollup)
+            for name, driver in targets.items():
+                _check_empty(driver, keys, prefix[name])
+
+            def defer(name: str, driver) -> None:
+                deferred[name] = _defer_schema(driver, schema, keys, prefix[name])
+                new_keys[name] = {label: NewKeys() for label in keys}
+
+            fanout.run_each(defer)
+        elif ensure_indexes:
+            from neo4j_ontology_loader.schema.ddl_advisor import load_index_needs
+
+            needs = load_index_needs(schema, object_properties=object_properties)
+            fanout.run_each(lambda name, driver: _ensure_indexes(driver, schema, needs, prefix[name]))
+
+        def chunks(path: str, plan):
+            """Yield CSV DataFrame chunks, or Parquet/Arrow record batches projected to the plan's columns.
+
+            Reading runs one chunk ahead on a background thread.
+            """
+            if convert_csv and not is_columnar(path):
+                path = cached_parquet_for_csv(path, text_columns=plan.text_columns())
+            if is_columnar(path):
+                yield from read_ahead(iter_record_batches(path, plan.read_columns()))
             else:
-                raise typer.BadParameter("cross_rates.csv must contain 'currency' and 'date' columns")
-            typer.echo(f"Loading CrossCurrencyRate from {path} ...")
-            # Do not persist synthetic id; keep only model-defined properties
-            rows = filter_props("CrossCurrencyRate", df_to_rows(df_cross))
-            ingest_nodes(driver, label="CrossCurrencyRate", key="id", rows=rows)
-        else:
-            typer.echo(f"Skipped: {path} not found")
-
-        # 6) Bonds
-        path = full("bonds.csv")
-        if os.path.exists(path):
-            df_bonds_raw = pd.read_csv(path)
-
-            # Prepare mapping helpers
-            def map_interest_type(v: str) -> str | None:
-                s = str(v).strip().lower()
-                if not s or s == 'nan':
-                    return None
-                if 'fixed' in s:
-                    return 'fixed'
-                if 'variable' in s or 'float' in s:
-                    return 'variable'
-                if 'stagger' in s:
-                    return 'staggered'
-                return s
-
-            def map_freq(p: str) -> str | None:
-                s = str(p).strip().upper()
-                if not s or s == 'NAN':
-                    return None
-                return {
-                    'P1Y': 'annual',
-                    'P6M': 'semiAnnual',
-                    'P3M': 'quarterly',
-                    'P1M': 'monthly',
-                }.get(s, 'other')
-
-            # Build flat properties compatible with our persisted Bond schema
-            def transform_row(r: dict) -> dict:
-                def get(col: str):
-                    return r.get(col, None)
-
-                # Interest rate value in CSV is percentage (e.g., 4.375), convert to decimal
-                rate_pct = get('actInterestRate')
-                try:
-                    rate_val = float(rate_pct) / 100.0 if pd.notna(rate_pct) else None
-                except Exception:
-                    rate_val = None
-
-                # Conversion price
-                conv_price = get('exercisePrice')
-                try:
-                    conv_price_val = float(conv_price) if pd.notna(conv_price) else None
-                except Exception:
-                    conv_price_val = None
-
-                name_val = get('name@de') or get('shortName@de')
-
-                return {
-                    'id': get('id'),
-                    'isin': get('isin'),
-                    'name': name_val,
-                    'short_name': get('shortName@de'),
-                    'currency_of_denomination': get('nominalCurrency'),
-                    'denomination': get('denomination'),
-                    'nominal_amount': get('nominalAmount'),
-                    'issuer_id': get('issuerId'),
-                    'interest_type': map_interest_type(get('interestType')),
-                    'interest_rate': rate_val,
-                    'interest_payment_frequency': map_freq(get('payFreqPeriod')),
-                    'maturity_date': get('maturityDate'),
-                    'last_coupon_date': get('lastCouponDate'),
-                    'is_callable': get('isCallable'),
-                    'underlying_id': get('underlyingId'),
-                    'conversion_price_value': conv_price_val,
-                    'conversion_price_currency': get('exercisePriceCurr'),
-                }
-
-            # Filter out rows without an id, and transform
-            rows: list[dict] = []
-            before = len(df_bonds_raw)
-            for r in df_bonds_raw.to_dict(orient='records'):
-                if r.get('id') is None or str(r.get('id')).strip() == '':
-                    continue
-                rows.append(transform_row(r))
-            after = len(rows)
-            skipped = before - after
-            typer.echo(f"Loading Bond from {path} ...")
+                yield from read_ahead(iter_csv_chunks(path, chunk_size, dtype=plan.csv_dtypes()))
+
+        def check_synthetic_columns(spec: NodeSpec, path: str, names) -> None:
+            if not set(spec.synthetic_key) <= set(names):
+                quoted = " and ".join(f"'{c}'" for c in spec.synthetic_key)
+                raise typer.BadParameter(f"{os.path.basename(path)} must contain {quoted} columns")
+
+        def header(path: str) -> list[str]:
+            from neo4j_ontology_loader.ingest.server_side import csv_header
+
+            return input_columns(path) if is_columnar(path) else csv_header(path)
+
+        def part_writer(label: str, key: str, part, objects: bool):
+            def write(name: str, driver) -> None:
+                # Only owners of object properties are linked in this load, so only they are captured
+                id_cache = id_caches[name] if objects else None
+                if rollup and label == "Quote":
+                    ingest_quotes_with_bars(driver, part.rows, key=key)
+                else:
+                    labels = new_keys.get(name, {})
+                    ingest_nodes(
+                        driver, label=label, key=key, rows=part.rows, new_keys=labels.get(label), id_cache=id_cache,
+                    )
+                if part.objects:
+                    # Owners exist now; their values go in after them
+                    values[name] += ingest_object_properties(
+                        driver, label, key, part.objects, interner=interners[name], id_cache=id_cache,
+                    )
+
+            return write
+
+        def evict_after(spec: NodeSpec):
+            """Drop the cached elementIds a table's links used once its last part is written."""
+            if spec.source not in object_sources:
+                return None
+            # The value labels are shared by every table with object properties
+            labels = [spec.label] if spec.source != object_sources[-1] else None
+            return lambda name: id_caches[name].evict(labels)
+
+        def load_table(spec: NodeSpec, path: str) -> None:
+            label, key = spec.label, spec.key
+            # Sharded parsing reads the CSV itself, so --convert-csv keeps the sequential path
+            parse_workers = 1 if convert_csv else workers
+            layout = (chunk_size, parse_workers, convert_csv, validate, object_properties, frame_backend)
+            if not fanout.begin(spec.source, input_fingerprint(path, *layout)):
+                typer.echo(f"Skipped {label}: {path} already loaded")
+                return
+            typer.echo(f"Loading {label} from {path} ...")
+            if spec.synthetic_key:
+                check_synthetic_columns(spec, path, header(path))
+            plan = spec.chunk_plan(schema.entity(label), validate=validate, object_properties=object_properties)
+            parts = _prepared_parts(
+                path, plan, parse_workers, lambda: chunks(path, plan), frame_backend, chunk_size
+            )
+            skipped = index = 0
+            # Parsed and prepared once; every target that still needs a part gets it
+            objects = spec.source in object_sources
+            for index, part in enumerate(parts, start=1):
+                _report_validation(label, part, rejects)
+                skipped += part.skipped
+                if len(part.rows):
+                    fanout.submit(index - 1, len(part.rows), part_writer(label, key, part, objects))
+            fanout.end(index, after=evict_after(spec))
             if skipped:
-                typer.echo(f"Skipped {skipped} Bond rows without id")
-            rows = filter_props("Bond", rows)
-            ingest_nodes(driver, label="Bond", key="id", rows=rows)
-        else:
-            typer.echo(f"Skipped: {path} not found")
-
-        # 7) Quotes (no natural single key -> synthetic id)
-        path = full("quotes.csv")
-        if os.path.exists(path):
-            df_quotes = pd.read_csv(path)
-            if "listing_id" in df_quotes.columns and "quote_date" in df_quotes.columns:
-                df_quotes["id"] = df_quotes["listing_id"].astype(str) + ":" + df_quotes["quote_date"].astype(str)
+                typer.echo(f"Skipped {skipped} {label} rows without {key}")
+
+        def load_table_server_side(spec: NodeSpec, path: str) -> None:
+            from neo4j_ontology_loader.ingest.server_side import csv_header, file_url, load_csv_nodes
+
+            url = file_url(os.path.relpath(path, base_dir), server_base_url)
+            if not fanout.begin(spec.source, input_fingerprint(path, "server")):
+                typer.echo(f"Skipped {spec.label}: {url} already loaded")
+                return
+            typer.echo(f"Loading {spec.label} from {url} on the server ...")
+            header = csv_header(path)
+            if spec.synthetic_key:
+                check_synthetic_columns(spec, path, header)
+
+            def write(name: str, driver) -> None:
+                counters = load_csv_nodes(
+                    driver,
+                    url,
+                    spec.label,
+                    spec.key,
+                    entity=schema.entity(spec.label),
+                    synthetic_key=spec.synthetic_key,
+                    fields=spec.allowed_fields(schema.entity(spec.label)),
+                    columns=header,
+                )
+                typer.echo(
+                    f"  {prefix[name]}created={counters.nodes_created} properties_set={counters.properties_set}"
+                )
+
+            fanout.submit(0, 0, write)
+            fanout.end(1)
+
+        for spec in get_szkb_node_specs():
+            if not fanout.live():
+                break
+            # Rollups are computed client-side while quotes are written
+            if server_side and not spec.client_only and not (rollup and spec.label == "Quote"):
+                from neo4j_ontology_loader.ingest.server_side import SERVER_CSV_SUFFIXES
+
+                path = resolve(spec.source, SERVER_CSV_SUFFIXES)
+                if os.path.exists(path):
+                    load_table_server_side(spec, path)
+                    continue
+            path = resolve(spec.source)
+            if not os.path.exists(path):
+                typer.echo(f"Skipped: {path} not found")
             else:
-                raise typer.BadParameter("quotes.csv must contain 'listing_id' and 'quote_date' columns")
-            typer.echo(f"Loading Quote from {path} ...")
-            # Do not persist synthetic id; keep only model-defined properties
-            rows = filter_props("Quote", df_to_rows(df_quotes))
-            ingest_nodes(driver, label="Quote", key="id", rows=rows)
-        else:
-            typer.echo(f"Skipped: {path} not found")
+                load_table(spec, path)
+        fanout.close()
 
         # Relationships are model-driven only; no CSV-derived relationships are created here.
-        typer.echo("SZKB CSVs loaded.")
+        if object_properties:
+            for name in fanout.live():
+                typer.echo(f"{prefix[name]}{values[name]} object property values written")
+        if len(targets) > 1:
+            for line in format_targets(fanout.reports):
+                typer.echo(line)
+        failed = [r for r in fanout.reports.values() if r.failed]
+        if failed:
+            if len(targets) == 1:
+                typer.echo(f"Load failed at {failed[0].failed_at}: {failed[0].error}")
+            if checkpoint is not None:
+                typer.echo(f"Progress kept in {checkpoint.path}; rerun to resume the failed targets")
+        else:
+            typer.echo("SZKB CSVs loaded.")
+            if checkpoint is not None:
+                checkpoint.remove()
+        rebuilt = True
+        for name in fanout.live():
+            if name in deferred:
+                # Violations are reported by the rebuild itself
+                rebuilt &= _restore_schema(targets[name], schema, deferred.pop(name), prefix[name])
+        if failed or not rebuilt:
+            raise typer.Exit(code=1)
+    except Exception:
+        for name in deferred:
+            typer.echo(
+                f"{prefix[name]}Initial load failed; constraints stay deferred "
+                "(install-schema and install-szkb-ddl restore them)"
+            )
+        raise
+    finally:
+        fanout.close()
+        _close_drivers()
+
+@app.command()
+def watch(
+    directory: str = typer.Argument(..., help="Directory the feed files are dropped into"),
+    routes: list[str] = typer.Option(
+        None, "--route",
+        help="GLOB=Label[:key] routes files matching GLOB to Label (repeatable; checked before the SZKB names)",
+    ),
+    szkb_routes: bool = typer.Option(
+        True, "--szkb-routes/--no-szkb-routes",
+        help="Route SZKB feeds by name prefix (quotes*, cross_rates*, listings*, ...)",
+    ),
+    batch_rows: int = typer.Option(
+        50_000, "--batch-rows", help="Throughput target: write a label's batch once it holds this many rows",
+    ),
+    max_latency: float = typer.Option(
+        5.0, "--max-latency", help="Latency target: seconds a picked-up file may wait before its batch is written",
+    ),
+    settle: float = typer.Option(
+        1.0, "--settle", help="Seconds a file must be left unmodified before it is read",
+    ),
+    poll_interval: float = typer.Option(1.0, "--poll-interval", help="Seconds between directory scans"),
+    polling: bool = typer.Option(False, "--polling", help="Only poll the directory (no inotify)"),
+    journal: str = typer.Option(
+        None, "--journal", help="Processed-file journal (default: DIRECTORY/.nolo-watch.jsonl)",
+    ),
+    validate: bool = typer.Option(
+        False, "--validate", help="Validate and coerce rows against the models before writing",
+    ),
+    rejects: str = typer.Option(
+        None, "--rejects", help="Append rows rejected by --validate to this CSV file",
+    ),
+    chunk_size: int = typer.Option(
+        DEFAULT_CSV_CHUNK_SIZE, "--chunk-size", help="Rows per chunk when streaming CSV input",
+    ),
+    once: bool = typer.Option(False, "--once", help="Process the files present now, then exit"),
+    ensure_indexes: bool = typer.Option(
+        True, "--ensure-indexes/--no-ensure-indexes",
+        help="Create missing indexes on the routed labels' keys and wait until ONLINE before watching",
+    ),
+):
+    """Watch a directory and load arriving files in micro-batches per label.
+
+    Runs until interrupted (SIGINT/SIGTERM), reusing one driver. Files are
+    recorded in the journal once all their rows are written, so a file is
+    loaded at least once; interrupted files are loaded again on restart.
+    """
+    import signal
+    import threading
+
+    from neo4j_ontology_loader.ingest.watch import FolderWatcher, label_route
+    from neo4j_ontology_loader.ingest.watch import szkb_routes as szkb_feed_routes
+    from neo4j_ontology_loader.schema.registry import load_ontology_schema
+
+    if not os.path.isdir(directory):
+        raise typer.BadParameter(f"{directory} is not a directory")
+    schema = load_ontology_schema()
+    watch_routes = []
+    for text in routes or []:
+        pattern, sep, target = text.partition("=")
+        label, _, key = target.partition(":")
+        if not sep or not pattern or not label:
+            raise typer.BadParameter(f"--route must look like GLOB=Label[:key], got {text!r}")
+        watch_routes.append(label_route(pattern, label, key or "id", schema.entity(label), validate=validate))
+    if szkb_routes:
+        watch_routes += szkb_feed_routes(schema, validate=validate)
+    if not watch_routes:
+        raise typer.BadParameter("No routes: give --route or keep --szkb-routes")
+
+    def on_flush(label: str, files: int, rows: int, seconds: float) -> None:
+        typer.echo(f"  {label}: {rows} rows from {files} files in {seconds:.2f}s")
+
+    stop = threading.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, lambda *_: stop.set())
+    driver = _driver()
+    try:
+        if ensure_indexes:
+            needs = {(r.plan.label, r.plan.key) for r in watch_routes}
+            _ensure_indexes(driver, schema, [n for label, key in sorted(needs) for n in _key_needs(label, key)])
+        watcher = FolderWatcher(
+            driver, directory, watch_routes, journal_path=journal, batch_rows=batch_rows,
+            max_latency=max_latency, settle=settle, poll_interval=poll_interval, inotify=not polling,
+            chunk_size=chunk_size, rejects=rejects, on_flush=on_flush,
+        )
+        if not once:
+            typer.echo(f"Watching {directory} (Ctrl-C to stop) ...")
+        stats = watcher.run(stop, once=once)
+        typer.echo(
+            f"Loaded {stats.rows} rows from {stats.files} files in {stats.batches} batches "
+            f"({stats.failed_files} failed, {stats.skipped_rows} rows skipped)."
+        )
     finally:
-        driver.close()
+        _close_drivers()
+
 
 @app.command()
 def clean_database(
@@ -350,35 +870,182 @@ def clean_database(
         "--yes",
         "-y",
         help="Confirm cleanup without interactive prompt (drop all constraints/indexes and delete all nodes)",
-    )
+    ),
+    mode: str = typer.Option(
+        "auto",
+        "--mode",
+        help="auto | recreate (CREATE OR REPLACE DATABASE, Enterprise) | delete (parallel batched deletes)",
+    ),
+    labels: list[str] = typer.Option(
+        None, "--label", help="Only delete nodes of this label (repeatable); keeps schema",
+    ),
+    date_from: str = typer.Option(
+        None, "--from", help="With --label: only nodes whose date property is >= this ISO date",
+    ),
+    date_to: str = typer.Option(
+        None, "--to", help="With --label: only nodes whose date property is < this ISO date",
+    ),
+    batch_size: int = typer.Option(10_000, "--batch-size", help="Rows per delete transaction"),
+    concurrency: int = typer.Option(4, "--concurrency", help="Concurrent delete transactions and sessions"),
 ):
     """Drop all constraints and indexes, then delete all nodes and relationships.
 
+    With --label, only the given labels are deleted (optionally restricted
+    to a date range with --from/--to) and the schema is kept.
+
     Warning: This operation is destructive and cannot be undone.
     """
-    if not yes and not typer.confirm(
-        "This will drop ALL constraints and indexes and delete ALL nodes/relationships. Continue?"
-    ):
+    if (date_from or date_to) and not labels:
+        raise typer.BadParameter("--from/--to require --label")
+    if labels:
+        scope = f"delete {', '.join(labels)} nodes"
+        if date_from or date_to:
+            scope += f" with dates in [{date_from or '-inf'}, {date_to or '+inf'})"
+        prompt = f"This will {scope} and their relationships. Continue?"
+    else:
+        prompt = "This will drop ALL constraints and indexes and delete ALL nodes/relationships. Continue?"
+    if not yes and not typer.confirm(prompt):
         typer.echo("Aborted.")
         return
 
-    driver = create_driver()
+    from neo4j_ontology_loader.schema.ddl_maintenance import (
+        clean_database as clean_database_maintenance,
+        clean_selection,
+    )
+
+    def progress(target: str, deleted: int, remaining: int, seconds: float) -> None:
+        rate = deleted / seconds if seconds else 0.0
+        typer.echo(f"  {target}: deleted={deleted} remaining={remaining} ({rate:,.0f}/s)")
+
+    driver = _driver()
     try:
-        clean_database_maintenance(driver)
-        typer.echo("Database cleaned: constraints and indexes dropped, all data removed.")
+        if labels:
+            report = clean_selection(
+                driver, labels, date_from=date_from, date_to=date_to,
+                batch_size=batch_size, concurrency=concurrency, progress=progress,
+            )
+        else:
+            report = clean_database_maintenance(
+                driver, mode=mode, batch_size=batch_size, concurrency=concurrency, progress=progress,
+            )
+        if report.mode == "recreate":
+            typer.echo(f"Database recreated in {report.seconds:.1f}s: schema and all data removed.")
+        elif report.mode == "selective":
+            typer.echo(
+                f"Deleted {report.nodes_deleted} nodes in {report.seconds:.1f}s ({report.throughput:,.0f}/s)."
+            )
+        else:
+            typer.echo(
+                f"Database cleaned: constraints and indexes dropped, {report.nodes_deleted} nodes and "
+                f"{report.relationships_deleted} relationships removed in {report.seconds:.1f}s "
+                f"({report.throughput:,.0f}/s)."
+            )
     finally:
-        driver.close()
+        _close_drivers()
 
 
 @app.command()
-def install_szkb_ddl():
-    """Install SZKB-specific non-unique indexes to speed up CSV loading."""
-    driver = create_driver()
+def install_szkb_ddl(
+    concurrency: int = typer.Option(4, "--concurrency", help="Indexes created in parallel sessions"),
+    timeout: int = typer.Option(600, "--timeout", help="Seconds to wait for the indexes to come ONLINE"),
+):
+    """Install SZKB-specific non-unique indexes to speed up CSV loading, and wait until they are ONLINE."""
+    from neo4j_ontology_loader.schema.ddl_advisor import apply_indexes
+    from neo4j_ontology_loader.schema.ddl_szkb import szkb_loading_indexes
+
+    driver = _driver()
     try:
-        apply_cypher_statements(driver, szkb_loading_indexes())
+        apply_indexes(driver, szkb_loading_indexes(), concurrency=concurrency, timeout=timeout)
         typer.echo("SZKB DDL (indexes) installed.")
     finally:
-        driver.close()
+        _close_drivers()
+
+
+@app.command()
+def advise_indexes(
+    apply: bool = typer.Option(False, "--apply", help="Create the missing indexes and wait until they are ONLINE"),
+    object_properties: bool = typer.Option(
+        True, "--object-properties/--no-object-properties", help="Include the ObjectProperty value keys",
+    ),
+    concurrency: int = typer.Option(4, "--concurrency", help="With --apply: indexes created in parallel sessions"),
+    timeout: int = typer.Option(600, "--timeout", help="With --apply: seconds to wait for the indexes"),
+):
+    """Compare the indexes SZKB loads and queries need with the database's indexes.
+
+    Needs come from the node specs' MERGE keys, the relationship specs'
+    endpoint properties, the ObjectProperty keys and the as-of rate lookup;
+    those covered by install-schema's uniqueness constraints are left to
+    it. Also lists duplicate indexes and indexes without reads.
+    """
+    from neo4j_ontology_loader.schema.ddl_advisor import (
+        advise_load_indexes,
+        apply_indexes,
+        format_advice,
+        load_index_needs,
+    )
+    from neo4j_ontology_loader.schema.registry import load_ontology_schema
+
+    schema = load_ontology_schema()
+    driver = _driver()
+    try:
+        advice = advise_load_indexes(driver, schema, load_index_needs(schema, object_properties=object_properties))
+        for line in format_advice(advice):
+            typer.echo(line)
+        if not (advice.missing or advice.uninstalled_constraints or advice.redundant or advice.unused):
+            typer.echo("Indexes match the load's lookups.")
+        if apply and advice.missing:
+            apply_indexes(driver, advice.statements(), concurrency=concurrency, timeout=timeout)
+            typer.echo(f"{len(advice.missing)} indexes created and ONLINE.")
+    finally:
+        _close_drivers()
+
+
+@app.command()
+def export(
+    out_dir: str = typer.Argument(..., help="Output directory (nodes/<Label>/, relationships/<From>-<TYPE>-<To>/)"),
+    fmt: str = typer.Option("parquet", "--format", help="parquet (requires the arrow extra) | csv"),
+    labels: list[str] = typer.Option(
+        None, "--label", help="Only export this label and relationships among the selected labels (repeatable)",
+    ),
+    relationships: bool = typer.Option(
+        True, "--relationships/--no-relationships", help="Also export relationship edge lists",
+    ),
+    page_size: int = typer.Option(50_000, "--page-size", help="Rows per page (one query and one write each)"),
+    sessions: int = typer.Option(4, "--sessions", help="Parallel sessions"),
+    partitions: int = typer.Option(
+        None, "--partitions", help="Key ranges per large label (default: --sessions)",
+    ),
+):
+    """Export the graph described by the persisted ontology to Parquet or CSV files.
+
+    Each label is read in the order of its load key (or unique property,
+    or elementId) with key-range cursors and written page by page, so memory stays
+    bounded by one page per session.
+    """
+    from neo4j_ontology_loader.queries.export import FORMATS, export_graph
+
+    if fmt not in FORMATS:
+        raise typer.BadParameter(f"--format must be one of {', '.join(FORMATS)}")
+
+    def progress(target: str, rows: int, seconds: float) -> None:
+        if rows % (page_size * 20) == 0:
+            typer.echo(f"  {target}: {rows} rows ({seconds:.0f}s)")
+
+    driver = _driver()
+    try:
+        report = export_graph(
+            driver, out_dir, fmt=fmt, labels=labels or None, relationships=relationships,
+            page_size=page_size, sessions=sessions, partitions=partitions, progress=progress,
+        )
+        for target, rows in sorted(report.per_target.items()):
+            if rows:
+                typer.echo(f"  {target}: {rows}")
+        typer.echo(
+            f"Exported {report.nodes} nodes and {report.relationships} relationships to {len(report.files)} "
+            f"files in {report.seconds:.1f}s ({report.throughput:,.0f}/s)."
+        )
+    finally:
+        _close_drivers()
 
 if __name__ == "__main__":
     app()
@@ -1,9 +1,40 @@
 from pydantic import BaseModel
 import os
 
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
 class Settings(BaseModel):
     neo4j_uri: str = os.getenv("NEO4J_URI", "neo4j://localhost:7687")
     neo4j_user: str = os.getenv("NEO4J_USER", "neo4j")
     neo4j_password: str = os.getenv("NEO4J_PASSWORD", "ontology")
+    # Target database; None uses the server's default (home) database
+    neo4j_database: str | None = os.getenv("NEO4J_DATABASE") or None
+    # Connection pool and transaction tuning (passed to GraphDatabase.driver)
+    neo4j_max_connection_pool_size: int = int(os.getenv("NEO4J_MAX_CONNECTION_POOL_SIZE", "100"))
+    neo4j_connection_acquisition_timeout: float = float(os.getenv("NEO4J_CONNECTION_ACQUISITION_TIMEOUT", "60"))
+    neo4j_connection_timeout: float = float(os.getenv("NEO4J_CONNECTION_TIMEOUT", "30"))
+    neo4j_max_connection_lifetime: float = float(os.getenv("NEO4J_MAX_CONNECTION_LIFETIME", "3600"))
+    neo4j_fetch_size: int = int(os.getenv("NEO4J_FETCH_SIZE", "1000"))
+    neo4j_max_transaction_retry_time: float = float(os.getenv("NEO4J_MAX_TRANSACTION_RETRY_TIME", "30"))
+    neo4j_keep_alive: bool = _env_bool("NEO4J_KEEP_ALIVE", True)
+    # Call verify_connectivity() right after creating a driver (fail fast, warm the pool)
+    neo4j_warm_up: bool = _env_bool("NEO4J_WARM_UP", True)
+    # Read-through cache used by run_query(..., cache=True): max entries and seconds to live
+    query_cache_size: int = int(os.getenv("NOLO_QUERY_CACHE_SIZE", "1024"))
+    query_cache_ttl: float = float(os.getenv("NOLO_QUERY_CACHE_TTL", "300"))
+    # Directory for derived, disposable data (e.g. the extracted schema cache)
+    cache_dir: str = os.getenv(
+        "NOLO_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "neo4j_ontology_loader")
+    )
+
+    def with_overrides(self, **overrides) -> "Settings":
+        """Return a copy with the given (non-None) fields replaced, e.g. from CLI options."""
+        return self.model_copy(update={k: v for k, v in overrides.items() if v is not None})
 
 settings = Settings()
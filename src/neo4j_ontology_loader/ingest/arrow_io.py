@@ -0,0 +1,177 @@
+"""Parquet / Arrow IPC input.
+
+Columnar inputs keep their types (ids stay strings or integers instead of
+turning into floats) and are read one row group / record batch at a time
+with column projection, so rows can be handed to the writer without
+building an intermediate DataFrame.
+
+``pyarrow`` is an optional dependency (``pip install .[arrow]``) and is only
+imported when a columnar input is actually used.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, Iterator
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+PARQUET_SUFFIXES = (".parquet", ".pq")
+ARROW_SUFFIXES = (".arrow", ".feather", ".ipc")
+
+
+def require_pyarrow():
+    try:
+        import pyarrow
+    except ImportError as e:  # pragma: no cover - depends on the environment
+        raise RuntimeError(
+            "Parquet/Arrow input requires pyarrow; install it with `pip install neo4j-ontology-loader[arrow]`"
+        ) from e
+    return pyarrow
+
+
+def input_format(path: str) -> str:
+    """Return ``parquet``, ``arrow`` or ``csv`` based on the file suffix."""
+    suffix = Path(path).suffix.lower()
+    if suffix in PARQUET_SUFFIXES:
+        return "parquet"
+    if suffix in ARROW_SUFFIXES:
+        return "arrow"
+    return "csv"
+
+
+def is_columnar(path: str) -> bool:
+    return input_format(path) != "csv"
+
+
+def input_columns(path: str) -> list[str]:
+    """Column names of a Parquet or Arrow IPC file (reads only the footer/schema)."""
+    pa = require_pyarrow()
+    if input_format(path) == "parquet":
+        import pyarrow.parquet as pq
+
+        return list(pq.read_schema(path).names)
+    with pa.memory_map(path, "r") as source:
+        return list(pa.ipc.open_file(source).schema.names)
+
+
+def _projection(path: str, columns: Iterable[str] | None) -> list[str] | None:
+    if columns is None:
+        return None
+    wanted = set(columns)
+    # Keep file order; silently ignore requested columns the file does not have
+    return [c for c in input_columns(path) if c in wanted]
+
+
+def iter_record_batches(path: str, columns: Iterable[str] | None = None) -> Iterator["pa.RecordBatch"]:
+    """Yield record batches from a Parquet or Arrow IPC file.
+
+    Parquet is read one row group at a time; Arrow IPC files are memory
+    mapped so batches reference the file pages directly (zero-copy). Only
+    ``columns`` (when given) are materialized.
+    """
+    pa = require_pyarrow()
+    projection = _projection(path, columns)
+    if input_format(path) == "parquet":
+        import pyarrow.parquet as pq
+
+        parquet = pq.ParquetFile(path)
+        for i in range(parquet.num_row_groups):
+            yield from parquet.read_row_group(i, columns=projection).to_batches()
+        return
+
+    with pa.memory_map(path, "r") as source:
+        reader = pa.ipc.open_file(source)
+        for i in range(reader.num_record_batches):
+            batch = reader.get_batch(i)
+            yield batch.select(projection) if projection is not None else batch
+
+
+def cached_parquet_for_csv(
+    csv_path: str,
+    cache_dir: str | None = None,
+    *,
+    block_size: int = 64 << 20,
+    text_columns: Iterable[str] = (),
+) -> str:
+    """Convert a CSV file to Parquet once and return the cached Parquet path.
+
+    The cache entry is keyed by the absolute path, size and modification time
+    of the CSV (and ``text_columns``), so a changed source is converted again.
+    Conversion streams through pyarrow's CSV reader and writes one row group
+    per block. ``text_columns`` (e.g. ``ChunkPlan.text_columns()``) are kept
+    as strings, with empty cells as nulls, instead of having their type
+    inferred, so ids read the same as on the pandas path.
+    """
+    pa = require_pyarrow()
+    import pyarrow.csv as pacsv
+    import pyarrow.parquet as pq
+
+    if cache_dir is None:
+        from neo4j_ontology_loader.config import settings
+
+        cache_dir = os.path.join(settings.cache_dir, "parquet")
+    text = sorted(text_columns)
+    stat = os.stat(csv_path)
+    ident = f"{os.path.abspath(csv_path)}:{stat.st_size}:{stat.st_mtime_ns}:{','.join(text)}"
+    name = f"{Path(csv_path).stem}-{hashlib.sha256(ident.encode('utf-8')).hexdigest()[:16]}.parquet"
+    target = Path(cache_dir) / name
+    if target.exists():
+        return str(target)
+
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_suffix(".tmp")
+    convert = pacsv.ConvertOptions(column_types={c: pa.string() for c in text}, strings_can_be_null=True)
+    reader = pacsv.open_csv(csv_path, read_options=pacsv.ReadOptions(block_size=block_size), convert_options=convert)
+    with pq.ParquetWriter(tmp, reader.schema) as writer:
+        for batch in reader:
+            writer.write_batch(batch)
+    tmp.replace(target)
+    return str(target)
+
+
+def add_joined_column(batch: "pa.RecordBatch", name: str, columns: list[str], sep: str) -> "pa.RecordBatch":
+    """Return ``batch`` with ``name`` set to the string join of ``columns`` (e.g. a synthetic id)."""
+    pa = require_pyarrow()
+    import pyarrow.compute as pc
+
+    parts = [pc.cast(batch.column(c), pa.string()) for c in columns]
+    joined = pc.binary_join_element_wise(*parts, sep)
+    if name in batch.schema.names:
+        return batch.set_column(batch.schema.get_field_index(name), name, joined)
+    return batch.append_column(name, joined)
+
+
+def drop_empty(batch: "pa.RecordBatch", column: str) -> tuple["pa.RecordBatch", int]:
+    """Drop rows whose ``column`` is null or blank; return the batch and the dropped count."""
+    pa = require_pyarrow()
+    import pyarrow.compute as pc
+
+    values = batch.column(column)
+    keep = pc.and_(
+        pc.is_valid(values),
+        pc.not_equal(pc.utf8_trim_whitespace(pc.cast(values, pa.string())), ""),
+    )
+    keep = pc.fill_null(keep, False)
+    kept = batch.filter(keep)
+    return kept, batch.num_rows - kept.num_rows
+
+
+def has_native_type(batch: "pa.RecordBatch", column: str, kind: str) -> bool:
+    """Whether ``column`` already holds ``kind`` values (str, int, float, bool or date).
+
+    Timestamps always need converting: pyarrow gives them a ``ZoneInfo``,
+    which Neo4j stores as a zone id rather than the UTC offset the pandas
+    path writes.
+    """
+    pa = require_pyarrow()
+    checks = {
+        "str": lambda type_: pa.types.is_string(type_) or pa.types.is_large_string(type_),
+        "int": pa.types.is_integer,
+        "float": pa.types.is_floating,
+        "bool": pa.types.is_boolean,
+        "date": pa.types.is_date,
+    }
+    return kind in checks and checks[kind](batch.schema.field(column).type)
@@ -11,3 +11,117 @@ def merge_relationship(rel_type: str, from_label: str, from_key: str, to_label:
     MERGE (a)-[r:{rel_type}]->(b)
     SET r += $props
     """
+
+def merge_nodes_batch(label: str, key: str, *, return_element_ids: bool = False) -> str:
+    # $rows: [{key_value: ..., props: {...}}, ...]; idempotent, safe to replay
+    returning = "RETURN row.key_value AS value, elementId(n) AS element_id" if return_element_ids else ""
+    return f"""
+    UNWIND $rows AS row
+    MERGE (n:{label} {{{key}: row.key_value}})
+    SET n += row.props
+    {returning}
+    """
+
+def create_nodes_batch(label: str, key: str, *, return_element_ids: bool = False) -> str:
+    # Initial loads: rows whose key is known to be new skip MERGE's lookup. Not
+    # idempotent; replaying a committed batch duplicates its nodes.
+    returning = "RETURN row.key_value AS value, elementId(n) AS element_id" if return_element_ids else ""
+    return f"""
+    UNWIND $rows AS row
+    CREATE (n:{label} {{{key}: row.key_value}})
+    SET n += row.props
+    {returning}
+    """
+
+def merge_nodes_batch_reporting_created(label: str, key: str) -> str:
+    # Like merge_nodes_batch, but RETURNs the keys of nodes that did not exist before.
+    # Keys must be unique within $rows (all lookups run before the first MERGE).
+    return f"""
+    UNWIND $rows AS row
+    OPTIONAL MATCH (existing:{label} {{{key}: row.key_value}})
+    WITH row, existing IS NULL AS created
+    MERGE (n:{label} {{{key}: row.key_value}})
+    SET n += row.props
+    WITH row, created WHERE created
+    RETURN row.key_value AS value
+    """
+
+def merge_quote_bars() -> str:
+    # $rows: partial OHLC bars (see ingest.rollup.compute_bars) folded into existing bars:
+    # open/close follow the earliest/latest quote timestamp, so late quotes land correctly
+    return """
+    UNWIND $rows AS row
+    MERGE (b:QuoteBar {id: row.id})
+    WITH b, row,
+         b.first_quote_date IS NULL OR row.first_quote_date < b.first_quote_date AS earlier,
+         b.last_quote_date IS NULL OR row.last_quote_date >= b.last_quote_date AS later
+    SET b.instrument_id = row.instrument_id,
+        b.listing_id = row.listing_id,
+        b.period = row.period,
+        b.period_start = row.period_start,
+        b.open = CASE WHEN earlier THEN row.open ELSE b.open END,
+        b.first_quote_date = CASE WHEN earlier THEN row.first_quote_date ELSE b.first_quote_date END,
+        b.close = CASE WHEN later THEN row.close ELSE b.close END,
+        b.last_quote_date = CASE WHEN later THEN row.last_quote_date ELSE b.last_quote_date END,
+        b.high = CASE WHEN b.high IS NULL OR row.high > b.high THEN row.high ELSE b.high END,
+        b.low = CASE WHEN b.low IS NULL OR row.low < b.low THEN row.low ELSE b.low END,
+        b.count = coalesce(b.count, 0) + row.count
+    WITH b, row
+    CALL (b, row) {
+        MATCH (l:Listing {id: row.listing_ref})
+        MERGE (b)-[:BarOfListing]->(l)
+    }
+    """
+
+def merge_relationships_batch(rel_type: str, from_label: str, from_key: str, to_label: str, to_key: str) -> str:
+    # $rows: [{from_value: ..., to_value: ..., props: {...}}, ...]; idempotent, safe to replay
+    return f"""
+    UNWIND $rows AS row
+    MATCH (a:{from_label} {{{from_key}: row.from_value}})
+    MATCH (b:{to_label} {{{to_key}: row.to_value}})
+    MERGE (a)-[r:{rel_type}]->(b)
+    SET r += row.props
+    """
+
+def merge_relationships_by_element_id(rel_type: str) -> str:
+    # $rows: [{from_id: ..., to_id: ..., props: {...}}, ...] with endpoint elementIds
+    # resolved client-side (see ingest.element_ids); idempotent, safe to replay
+    return f"""
+    UNWIND $rows AS row
+    MATCH (a) WHERE elementId(a) = row.from_id
+    MATCH (b) WHERE elementId(b) = row.to_id
+    MERGE (a)-[r:{rel_type}]->(b)
+    SET r += row.props
+    """
+
+def lookup_element_ids(label: str, key: str) -> str:
+    return f"""
+    UNWIND $values AS value
+    MATCH (n:{label} {{{key}: value}})
+    RETURN value, elementId(n) AS element_id
+    """
+
+def load_csv_merge_nodes(
+    label: str,
+    key: str,
+    key_expression: str,
+    properties: dict[str, str] | None,
+    batch_size: int,
+) -> str:
+    # Server-side variant of merge_nodes_batch: Neo4j reads $url itself and commits
+    # every batch_size rows. `properties` maps property -> Cypher expression over `row`;
+    # empty cells keep the stored value. None copies every CSV column.
+    if properties is None:
+        set_clause = "SET n += row"
+    else:
+        assignments = ", ".join(f"{name}: coalesce({expr}, n.{name})" for name, expr in properties.items())
+        set_clause = f"SET n += {{{assignments}}}"
+    return f"""
+    LOAD CSV WITH HEADERS FROM $url AS row
+    WITH row, {key_expression} AS key_value
+    WHERE key_value IS NOT NULL AND trim(key_value) <> ''
+    CALL (row, key_value) {{
+        MERGE (n:{label} {{{key}: key_value}})
+        {set_clause}
+    }} IN TRANSACTIONS OF {batch_size} ROWS
+    """
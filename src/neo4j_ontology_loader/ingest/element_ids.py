@@ -0,0 +1,101 @@
+"""Client-side key -> elementId resolution for relationship loading.
+
+Relationship batches normally MATCH both endpoints by their key property,
+so every row repeats an index seek (QuoteOfListing resolves the same few
+thousand Listings for millions of quotes). ``ElementIdCache`` keeps a
+bounded LRU of ``key value -> elementIds`` per label, filled by one bulk
+lookup per batch for unknown keys or captured from the ``RETURN`` of node
+upserts, and relationship batches then MATCH endpoints by ``elementId``.
+A value maps to every node carrying it, so keys without a uniqueness
+constraint (``Quote.listing_id``) still connect all their nodes.
+
+elementIds are only stable while the node exists (Neo4j may reuse the id
+of a deleted node), so a cache must not outlive a load phase: call
+``evict`` between phases and after anything deletes nodes.
+"""
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Any, Iterable
+
+from neo4j import Driver
+
+from neo4j_ontology_loader.ingest.cypher_templates import lookup_element_ids
+from neo4j_ontology_loader.neo4j.session import run_query
+
+DEFAULT_MAX_PER_LABEL = 100_000
+
+
+class ElementIdCache:
+    """Bounded LRU of node key values to elementIds, one map per (label, key)."""
+
+    def __init__(self, max_per_label: int = DEFAULT_MAX_PER_LABEL):
+        self.max_per_label = max_per_label
+        self.hits = 0
+        self.lookups = 0
+        self._maps: dict[tuple[str, str], OrderedDict] = {}
+        self._lock = threading.Lock()
+
+    def _map(self, label: str, key: str) -> OrderedDict:
+        return self._maps.setdefault((label, key), OrderedDict())
+
+    def capture(self, label: str, key: str, pairs: Iterable[tuple[Any, str]]) -> None:
+        """Remember ``(key value, elementId)`` pairs, e.g. returned by node upserts.
+
+        The pairs given for a value replace what was known about it, so pass
+        all nodes of a value in one call.
+        """
+        grouped: dict[Any, list[str]] = {}
+        for value, element_id in pairs:
+            ids = grouped.setdefault(value, [])
+            if element_id not in ids:
+                ids.append(element_id)
+        with self._lock:
+            mapping = self._map(label, key)
+            for value, ids in grouped.items():
+                mapping[value] = tuple(ids)
+                mapping.move_to_end(value)
+            while len(mapping) > self.max_per_label:
+                mapping.popitem(last=False)
+
+    def resolve(
+        self, driver: Driver, label: str, key: str, values: Iterable[Any]
+    ) -> dict[Any, tuple[str, ...]]:
+        """Return the elementIds of the nodes of ``values``; unknown ones are fetched in a single query.
+
+        Values without a matching node are absent from the result.
+        """
+        wanted = set(values)
+        found: dict[Any, tuple[str, ...]] = {}
+        with self._lock:
+            mapping = self._map(label, key)
+            for value in wanted:
+                element_ids = mapping.get(value)
+                if element_ids is not None:
+                    mapping.move_to_end(value)
+                    found[value] = element_ids
+            self.hits += len(found)
+        missing = [v for v in wanted if v not in found]
+        if missing:
+            self.lookups += 1
+            records = run_query(lookup_element_ids(label, key), {"values": missing}, driver=driver)
+            fetched: dict[Any, list[str]] = {}
+            for r in records:
+                fetched.setdefault(r["value"], []).append(r["element_id"])
+            self.capture(label, key, ((v, e) for v, ids in fetched.items() for e in ids))
+            found.update((v, tuple(ids)) for v, ids in fetched.items())
+        return found
+
+    def evict(self, labels: Iterable[str] | None = None) -> None:
+        """Forget all entries, or those of ``labels``; call at phase boundaries."""
+        with self._lock:
+            if labels is None:
+                self._maps.clear()
+                return
+            labels = set(labels)
+            for map_key in [k for k in self._maps if k[0] in labels]:
+                del self._maps[map_key]
+
+    def __len__(self) -> int:
+        return sum(len(m) for m in self._maps.values())
@@ -0,0 +1,228 @@
+"""Fan prepared batches out to several target databases.
+
+``load-szkb`` with several ``--database`` targets reads and prepares every
+input once. ``FanOut`` hands each prepared part to one writer thread per
+target, so the targets load concurrently and in input order:
+
+- each target writes through its own driver (and connection pool);
+- a target may fall at most ``max_pending`` parts behind before the
+  reader waits for it, which bounds the memory held for slow targets;
+- a target whose write fails (after the write layer's retries) is marked
+  failed with its error and skips the rest of the load; the other targets
+  carry on and the failures are reported at the end;
+- with a ``LoadCheckpoint``, the parts each target has written are recorded
+  per input, so a rerun only writes what that target is missing.
+"""
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable
+
+from neo4j import Driver
+
+from utils.logging import get_logger
+
+# Prepared parts a target may have queued before the reader blocks
+DEFAULT_MAX_PENDING = 4
+
+
+def input_fingerprint(path: str, *layout) -> str:
+    """Identity of ``path``'s parts: size, mtime and whatever decides how it is chunked (``layout``)."""
+    stat = os.stat(path)
+    return ":".join(str(v) for v in (stat.st_size, stat.st_mtime_ns, *layout))
+
+
+class LoadCheckpoint:
+    """Parts of each input written per target, as JSON lines (the last entry per target and input wins).
+
+    Entries only count while the input's fingerprint is unchanged.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries: dict[tuple[str, str], dict] = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as fh:
+                for line in fh:
+                    try:
+                        entry = json.loads(line)
+                        self._entries[(entry["target"], entry["input"])] = entry
+                    except (ValueError, KeyError):
+                        # A torn last line from an interrupted write
+                        continue
+
+    def __bool__(self) -> bool:
+        return bool(self._entries)
+
+    def parts(self, target: str, name: str, fingerprint: str) -> int:
+        entry = self._entries.get((target, name))
+        return entry["parts"] if entry and entry["fingerprint"] == fingerprint else 0
+
+    def done(self, target: str, name: str, fingerprint: str) -> bool:
+        entry = self._entries.get((target, name))
+        return bool(entry and entry["fingerprint"] == fingerprint and entry["done"])
+
+    def record(self, target: str, name: str, fingerprint: str, parts: int, done: bool = False) -> None:
+        entry = {"target": target, "input": name, "fingerprint": fingerprint, "parts": parts, "done": done}
+        with self._lock:
+            self._entries[(target, name)] = entry
+            with open(self.path, "a", encoding="utf-8") as fh:
+                fh.write(json.dumps(entry) + "\n")
+                fh.flush()
+                os.fsync(fh.fileno())
+
+    def remove(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+
+@dataclass
+class TargetReport:
+    name: str
+    rows: int = 0
+    parts: int = 0
+    # Parts skipped because the checkpoint has them
+    resumed: int = 0
+    seconds: float = 0.0
+    error: str | None = None
+    failed_at: str | None = None
+
+    @property
+    def failed(self) -> bool:
+        return self.error is not None
+
+
+# write(target, driver): writes one prepared part to one target
+PartWriter = Callable[[str, Driver], None]
+
+
+class FanOut:
+    """Writes each submitted part to every live target on one thread per target."""
+
+    def __init__(
+        self,
+        targets: dict[str, Driver],
+        checkpoint: LoadCheckpoint | None = None,
+        *,
+        max_pending: int = DEFAULT_MAX_PENDING,
+    ):
+        self.targets = dict(targets)
+        self.checkpoint = checkpoint
+        self.reports = {name: TargetReport(name) for name in targets}
+        self._pools = {
+            name: ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"fanout-{name}") for name in targets
+        }
+        self._slots = {name: threading.BoundedSemaphore(max(max_pending, 1)) for name in targets}
+        self._input: tuple[str, str] | None = None
+        self._start: dict[str, int] = {}
+        self._logger = get_logger()
+
+    def live(self) -> list[str]:
+        return [name for name, report in self.reports.items() if not report.failed]
+
+    def begin(self, name: str, fingerprint: str = "") -> list[str]:
+        """Start input ``name``; returns the live targets that still need (part of) it."""
+        self._input = (name, fingerprint)
+        self._start = {}
+        for target in self.live():
+            if self.checkpoint is not None and self.checkpoint.done(target, name, fingerprint):
+                continue
+            self._start[target] = self.checkpoint.parts(target, name, fingerprint) if self.checkpoint else 0
+        return list(self._start)
+
+    def wants(self, index: int) -> bool:
+        """Whether any target still needs part ``index`` of the current input."""
+        return any(index >= start for start in self._start.values())
+
+    def submit(self, index: int, rows: int, write: PartWriter) -> None:
+        """Queue part ``index`` (``rows`` rows) for every target that has not written it yet."""
+        for target, start in self._start.items():
+            if index < start:
+                self.reports[target].resumed += 1
+                continue
+            self._slots[target].acquire()
+            self._pools[target].submit(self._write, target, self._input, index, rows, write)
+
+    def end(self, parts: int, after: Callable[[str], None] | None = None) -> None:
+        """Mark the current input complete (``parts`` parts) for the targets that wrote it.
+
+        ``after(target)`` runs on each of those targets once its writes of
+        the input are done (e.g. to drop per-target state of the input).
+        """
+        for target in self._start:
+            self._slots[target].acquire()
+            self._pools[target].submit(self._finish, target, self._input, parts, after)
+        self._input, self._start = None, {}
+
+    def _write(self, target: str, current: tuple[str, str], index: int, rows: int, write: PartWriter) -> None:
+        report = self.reports[target]
+        try:
+            if report.failed:
+                return
+            start = time.perf_counter()
+            write(target, self.targets[target])
+            report.seconds += time.perf_counter() - start
+            report.rows += rows
+            report.parts += 1
+            if self.checkpoint is not None:
+                self.checkpoint.record(target, current[0], current[1], index + 1)
+        except Exception as e:
+            report.error = f"{type(e).__name__}: {e}"
+            report.failed_at = f"{current[0]} part {index}"
+            self._logger.error("fan-out target=%s failed at %s: %s", target, report.failed_at, report.error)
+        finally:
+            self._slots[target].release()
+
+    def _finish(
+        self, target: str, current: tuple[str, str], parts: int, after: Callable[[str], None] | None
+    ) -> None:
+        try:
+            if self.checkpoint is not None and not self.reports[target].failed:
+                self.checkpoint.record(target, current[0], current[1], parts, done=True)
+            if after is not None:
+                after(target)
+        finally:
+            self._slots[target].release()
+
+    def run_each(self, work: Callable[[str, Driver], None]) -> None:
+        """Run ``work`` on every live target concurrently and wait (e.g. schema steps); failures mark the target."""
+        def run(target: str) -> None:
+            try:
+                work(target, self.targets[target])
+            except Exception as e:
+                self.reports[target].error = f"{type(e).__name__}: {e}"
+                self.reports[target].failed_at = getattr(work, "__name__", "setup")
+
+        futures = [self._pools[target].submit(run, target) for target in self.live()]
+        for future in futures:
+            future.result()
+
+    def close(self) -> None:
+        """Wait for every queued write."""
+        for pool in self._pools.values():
+            pool.shutdown(wait=True)
+
+    def __enter__(self) -> "FanOut":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def format_targets(reports: dict[str, TargetReport]) -> list[str]:
+    lines = []
+    for report in reports.values():
+        resumed = f", {report.resumed} parts already loaded" if report.resumed else ""
+        line = f"{report.name}: {report.rows} rows in {report.parts} parts, {report.seconds:.1f}s writing{resumed}"
+        if report.failed:
+            line += f" -- FAILED at {report.failed_at}: {report.error}"
+        lines.append(line)
+    return lines
@@ -1,47 +1,189 @@
+from typing import Iterable
+
+import numpy as np
 from neo4j import Driver
 from neo4j.exceptions import Neo4jError
-from neo4j_ontology_loader.ingest.cypher_templates import merge_node
+from neo4j_ontology_loader.ingest.cypher_templates import create_nodes_batch, merge_node, merge_nodes_batch
+from neo4j_ontology_loader.ingest.element_ids import ElementIdCache
+from neo4j_ontology_loader.ingest.rows import RowBatch, is_empty_key, is_missing
+from neo4j_ontology_loader.neo4j.execution import RetryPolicy, WriteMetrics, is_retryable, run_write
+from neo4j_ontology_loader.neo4j.query_cache import invalidate_labels
 from utils.logging import get_logger
-import math
 
-def ingest_nodes(driver: Driver, label: str, key: str, rows: list[dict]) -> None:
-    cypher = merge_node(label, key)
+DEFAULT_BATCH_SIZE = 1000
+
+
+class NewKeys:
+    """Keys written so far to a label that was empty when the load started.
+
+    Rows with a key not seen before can be CREATEd instead of MERGEd. Keys
+    are kept as sorted 64-bit hashes (8 bytes each); a hash collision only
+    sends a new key down the MERGE path.
+    """
+
+    def __init__(self):
+        self._seen = np.empty(0, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self._seen)
+
+    def split(self, items: list[dict]) -> tuple[list[dict], list[dict]]:
+        """``(new, known)`` payloads of a batch; later repeats of a key within the batch are known."""
+        if not items:
+            return [], []
+        hashes = np.fromiter((hash(item["key_value"]) for item in items), dtype=np.int64, count=len(items))
+        first = np.zeros(len(items), dtype=bool)
+        first[np.unique(hashes, return_index=True)[1]] = True
+        if len(self._seen):
+            pos = np.searchsorted(self._seen, hashes)
+            first &= self._seen[np.minimum(pos, len(self._seen) - 1)] != hashes
+        self._seen = np.union1d(self._seen, hashes[first])
+        return [i for i, f in zip(items, first) if f], [i for i, f in zip(items, first) if not f]
+
+
+def _write_batch(tx, cypher: str, batch: list[dict]) -> None:
+    tx.run(cypher, rows=batch).consume()
+
+
+def _write_batch_returning(tx, cypher: str, batch: list[dict]) -> list[tuple]:
+    return [(record["value"], record["element_id"]) for record in tx.run(cypher, rows=batch)]
+
+
+def _write_row(tx, cypher: str, key_value, props: dict) -> None:
+    tx.run(cypher, key_value=key_value, props=props).consume()
+
+
+def ingest_nodes(
+    driver: Driver,
+    label: str,
+    key: str,
+    rows: Iterable[dict] | RowBatch,
+    *,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    policy: RetryPolicy | None = None,
+    metrics: WriteMetrics | None = None,
+    id_cache: ElementIdCache | None = None,
+    new_keys: NewKeys | None = None,
+) -> None:
+    """MERGE nodes by ``key`` in batches of ``batch_size`` rows per transaction.
+
+    Each batch is a managed write with transient-error retries. If a batch
+    fails with a non-retryable error (e.g. a constraint violation), its
+    rows are written one by one so that only the offending rows are logged
+    and skipped. With ``id_cache``, the elementIds of upserted nodes are
+    captured for a following relationship phase.
+
+    With ``new_keys`` (initial loads into an empty label), rows whose key
+    was not written before are CREATEd and the rest MERGEd; a replayed
+    CREATE batch MERGEs, so a commit that was lost in transit does not
+    duplicate nodes.
+
+    ``rows`` may be dicts or a ``RowBatch``; a batch's rows are turned into
+    dicts one write batch at a time.
+    """
+    batch_cypher = merge_nodes_batch(label, key, return_element_ids=id_cache is not None)
+    create_cypher = create_nodes_batch(label, key, return_element_ids=id_cache is not None)
+    row_cypher = merge_node(label, key)
     logger = get_logger()
-    with driver.session() as session:
-        for row in rows:
-            props = dict(row)
-            # Skip rows without a usable key (None/NaN/empty string)
-            if key not in props:
+    write = _write_batch if id_cache is None else _write_batch_returning
+
+    def flush(batch: list[dict]) -> None:
+        if new_keys is None:
+            write_batch(batch)
+            return
+        fresh, known = new_keys.split(batch)
+        if fresh:
+            write_batch(fresh, create=True)
+        if known:
+            write_batch(known)
+
+    def write_batch(batch: list[dict], create: bool = False) -> None:
+        attempts = 0
+
+        def work(tx):
+            nonlocal attempts
+            # A retried CREATE batch MERGEs in case an earlier attempt committed
+            cypher = create_cypher if create and not attempts else batch_cypher
+            attempts += 1
+            return write(tx, cypher, batch)
+
+        try:
+            result = run_write(driver, work, rows=len(batch), policy=policy, metrics=metrics)
+            if id_cache is not None:
+                id_cache.capture(label, key, result)
+            return
+        except Neo4jError as e:
+            if is_retryable(e):
+                raise
+            logger.warning(
+                "ingest_nodes batch failed label=%s rows=%d error=%s; retrying row by row",
+                label,
+                len(batch),
+                str(e),
+            )
+        for item in batch:
+            try:
+                run_write(
+                    driver, _write_row, row_cypher, item["key_value"], item["props"],
+                    rows=1, policy=policy, metrics=metrics,
+                )
+            except Neo4jError as e:
+                if is_retryable(e):
+                    raise
+                # Log and continue on violations (e.g., uniqueness/constraint errors)
+                logger.error(
+                    "ingest_nodes error label=%s key=%s value=%s props_keys=%s error=%s",
+                    label,
+                    key,
+                    item["key_value"],
+                    list(item["props"].keys()),
+                    str(e),
+                )
+
+    def items():
+        # Yield {"key_value", "props"} payloads; dicts are only built here, per row
+        if isinstance(rows, RowBatch):
+            if key not in rows.columns:
                 logger.warning(
                     "ingest_nodes skip label=%s reason=missing-key key=%s row_keys=%s",
                     label,
                     key,
-                    list(props.keys()),
+                    list(rows.columns),
                 )
-                continue
-
-            key_value = props[key]
-            if (
-                key_value is None
-                or (isinstance(key_value, float) and math.isnan(key_value))
-                or (isinstance(key_value, str) and key_value.strip() == "")
-            ):
+                return
+            # None/NaN values are not written as properties
+            source = rows.records(drop_missing=True)
+        else:
+            source = ({k: v for k, v in row.items() if k == key or not is_missing(v)} for row in rows)
+        for props in source:
+            # Skip rows without a usable key (None/NaN/empty string)
+            if key not in props and not isinstance(rows, RowBatch):
                 logger.warning(
-                    "ingest_nodes skip label=%s reason=empty-key key=%s",
+                    "ingest_nodes skip label=%s reason=missing-key key=%s row_keys=%s",
                     label,
                     key,
+                    list(props.keys()),
                 )
                 continue
-            try:
-                session.run(cypher, key_value=key_value, props=props)
-            except Neo4jError as e:
-                # Log and continue on violations (e.g., uniqueness/constraint errors)
-                logger.error(
-                    "ingest_nodes error label=%s key=%s value=%s props_keys=%s error=%s",
+            key_value = props.get(key)
+            if is_empty_key(key_value):
+                logger.warning(
+                    "ingest_nodes skip label=%s reason=empty-key key=%s",
                     label,
                     key,
-                    key_value,
-                    list(props.keys()),
-                    str(e),
                 )
                 continue
+            yield {"key_value": key_value, "props": props}
+
+    try:
+        batch: list[dict] = []
+        for item in items():
+            batch.append(item)
+            if len(batch) >= batch_size:
+                flush(batch)
+                batch = []
+        if batch:
+            flush(batch)
+    finally:
+        # Cached reads of this label are stale once anything was committed
+        invalidate_labels([label])
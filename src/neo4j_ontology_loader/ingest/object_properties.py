@@ -0,0 +1,202 @@
+"""Materialize nested ObjectProperty values as shared nodes.
+
+Entity models embed value objects (Bond.interestRate, Equity.dividend_policy,
+FinancialInstrument.identificationList) whose types the ontology declares
+as ObjectProperty nodes (see ``schema.extract.complex_properties_node_types``).
+Each value is written as a node of its model's label, keyed by a hash of
+its content (scalar fields and nested values), and linked from its owner
+with ``Has<Field>`` and to its nested values with ``<Model><Field>``, the
+relationship names the schema uses.
+
+Because the key is derived from the content, equal values (Currency "CHF",
+a given Date) are one node. A ``ValueInterner`` remembers the values
+already written during a load, so each is sent once and later owners only
+get a relationship to it; MERGE on the key keeps re-runs idempotent.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict, defaultdict
+from enum import Enum
+from functools import lru_cache
+from typing import Any, Iterable, Mapping
+
+from neo4j import Driver
+from pydantic import BaseModel
+
+from neo4j_ontology_loader.ingest.element_ids import ElementIdCache
+from neo4j_ontology_loader.ingest.nodes import ingest_nodes
+from neo4j_ontology_loader.ingest.relationship import ingest_relationships
+from neo4j_ontology_loader.neo4j.execution import RetryPolicy, WriteMetrics
+from neo4j_ontology_loader.schema.extract import nested_relationship_name, object_relationship_name
+from neo4j_ontology_loader.schema.types import OBJECT_PROPERTY_KEY
+
+# Owners per flush
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_MAX_VALUES = 1_000_000
+
+
+class ValueInterner:
+    """Bounded LRU of ``(label, key)`` of the values already written in this load."""
+
+    def __init__(self, max_values: int = DEFAULT_MAX_VALUES):
+        self.max_values = max_values
+        self.reused = 0
+        self._seen: OrderedDict[tuple[str, str], None] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __contains__(self, item: tuple[str, str]) -> bool:
+        with self._lock:
+            if item in self._seen:
+                self._seen.move_to_end(item)
+                self.reused += 1
+                return True
+            return False
+
+    def add(self, items: Iterable[tuple[str, str]]) -> None:
+        with self._lock:
+            for item in items:
+                self._seen[item] = None
+                self._seen.move_to_end(item)
+            while len(self._seen) > self.max_values:
+                self._seen.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._seen.clear()
+
+    def __len__(self) -> int:
+        return len(self._seen)
+
+
+@lru_cache(maxsize=1)
+def _object_labels() -> frozenset[str]:
+    from neo4j_ontology_loader.schema.extract import discover_object_property_models
+
+    return frozenset(model.__name__ for model in discover_object_property_models())
+
+
+def _is_object(value: Any) -> bool:
+    return isinstance(value, BaseModel) and type(value).__name__ in _object_labels()
+
+
+def _items(value: Any) -> list:
+    return list(value) if isinstance(value, (list, tuple)) else [value]
+
+
+def _scalar(value: Any) -> Any:
+    return value.value if isinstance(value, Enum) else value
+
+
+def value_key(label: str, props: Mapping[str, Any], children: Iterable[tuple[str, str, str]]) -> str:
+    """Content key of a value: equal scalar fields and nested values give the same key."""
+    payload = json.dumps([label, sorted(props.items()), sorted(children)], default=str, separators=(",", ":"))
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+class _Batch:
+    def __init__(self, interner: ValueInterner):
+        self.interner = interner
+        self.nodes: dict[str, dict[str, dict]] = defaultdict(dict)
+        self.rels: dict[tuple[str, str, str, str], list[dict]] = defaultdict(list)
+
+    def value(self, obj: BaseModel) -> str:
+        """Collect ``obj`` and its nested values; return its key."""
+        label = type(obj).__name__
+        props: dict[str, Any] = {}
+        children: list[tuple[str, str, str]] = []
+        for name in type(obj).model_fields:
+            value = getattr(obj, name)
+            if value is None:
+                continue
+            items = _items(value)
+            if any(_is_object(item) for item in items):
+                rel = nested_relationship_name(label, name)
+                children += [(rel, type(item).__name__, self.value(item)) for item in items if _is_object(item)]
+            elif not any(isinstance(item, BaseModel) for item in items):
+                props[name] = [_scalar(item) for item in items] if isinstance(value, (list, tuple)) else _scalar(value)
+        key = value_key(label, props, children)
+        # Known values (and their nested links) were written with their first owner
+        if key not in self.nodes[label] and (label, key) not in self.interner:
+            self.nodes[label][key] = {OBJECT_PROPERTY_KEY: key, **props}
+            for rel, child_label, child_key in children:
+                self.rels[(rel, label, OBJECT_PROPERTY_KEY, child_label)].append(
+                    {"from_value": key, "to_value": child_key}
+                )
+        return key
+
+    def owner(self, label: str, key: str, key_value: Any, fields: Mapping[str, Any]) -> None:
+        for field, value in fields.items():
+            if value is None:
+                continue
+            for item in _items(value):
+                if _is_object(item):
+                    self.rels[(object_relationship_name(field), label, key, type(item).__name__)].append(
+                        {"from_value": key_value, "to_value": self.value(item)}
+                    )
+
+
+def _fields(owner: BaseModel | Mapping[str, Any]) -> Mapping[str, Any]:
+    if isinstance(owner, BaseModel):
+        return {name: getattr(owner, name) for name in type(owner).model_fields}
+    return owner
+
+
+def ingest_object_properties(
+    driver: Driver,
+    label: str,
+    key: str,
+    owners: Iterable[tuple[Any, BaseModel | Mapping[str, Any]]],
+    *,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    interner: ValueInterner | None = None,
+    policy: RetryPolicy | None = None,
+    metrics: WriteMetrics | None = None,
+    id_cache: ElementIdCache | None = None,
+) -> int:
+    """Write the ObjectProperty values of ``owners`` and link them to the owner nodes.
+
+    ``owners`` yields ``(key value, values)`` where values is a model
+    instance or a mapping of field name to value; fields holding other
+    entities (e.g. an underlying FinancialInstrument) are ignored. Owner
+    nodes must already exist. Values are written before the relationships
+    of each batch of ``batch_size`` owners. Returns the number of distinct
+    values written.
+
+    With ``id_cache``, the elementIds of the written values are captured
+    and the links match their endpoints by elementId (see
+    ``ingest.element_ids``); owners captured by their ``ingest_nodes`` are
+    not looked up again.
+    """
+    interner = interner if interner is not None else ValueInterner()
+    written = 0
+
+    def flush(batch: _Batch) -> int:
+        count = 0
+        for value_label, nodes in batch.nodes.items():
+            if nodes:
+                ingest_nodes(
+                    driver, label=value_label, key=OBJECT_PROPERTY_KEY, rows=list(nodes.values()),
+                    policy=policy, metrics=metrics, id_cache=id_cache,
+                )
+                interner.add((value_label, node_key) for node_key in nodes)
+                count += len(nodes)
+        for (rel_type, from_label, from_key, to_label), rows in batch.rels.items():
+            ingest_relationships(
+                driver, rel_type, from_label, from_key, to_label, OBJECT_PROPERTY_KEY, rows,
+                "from_value", "to_value", policy=policy, metrics=metrics, id_cache=id_cache,
+            )
+        return count
+
+    batch, owners_in_batch = _Batch(interner), 0
+    for key_value, values in owners:
+        batch.owner(label, key, key_value, _fields(values))
+        owners_in_batch += 1
+        if owners_in_batch >= batch_size:
+            written += flush(batch)
+            batch, owners_in_batch = _Batch(interner), 0
+    if owners_in_batch:
+        written += flush(batch)
+    return written
@@ -1,4 +1,108 @@
+import bz2
+import gzip
+import io
+import lzma
+import sys
+from pathlib import Path
+from typing import BinaryIO, Iterator
+
 import pandas as pd
 
+# Rows per DataFrame chunk when streaming CSV input
+DEFAULT_CHUNK_SIZE = 100_000
+
+# Magic numbers used to detect compression when the file name does not tell
+# (e.g. data piped through stdin).
+_MAGIC = (
+    (b"\x1f\x8b", "gzip"),
+    (b"BZh", "bz2"),
+    (b"\xfd7zXZ\x00", "xz"),
+    (b"\x28\xb5\x2f\xfd", "zstd"),
+)
+_SUFFIXES = {".gz": "gzip", ".bz2": "bz2", ".xz": "xz", ".lzma": "xz", ".zst": "zstd", ".zstd": "zstd"}
+
+
 def df_to_rows(df: pd.DataFrame) -> list[dict]:
     return df.to_dict(orient="records")
+
+
+def to_utc_datetime(col: pd.Series) -> pd.Series:
+    """Parse ISO-8601 strings / datetimes into UTC timestamps (object column, None when missing or invalid).
+
+    Naive values are taken as UTC. The driver stores the result as a native
+    Neo4j DateTime.
+    """
+    parsed = pd.to_datetime(col, utc=True, errors="coerce", format="ISO8601")
+    return parsed.astype(object).where(parsed.notna(), None)
+
+
+def to_date(col: pd.Series) -> pd.Series:
+    """Parse ``YYYY-MM-DD`` dates into ``datetime.date`` (object column, None when missing or invalid).
+
+    A time part is ignored. The driver stores the result as a native Neo4j Date.
+    """
+    text = col.where(col.isna(), col.astype(str).str.strip().str[:10])
+    parsed = pd.to_datetime(text, errors="coerce", format="%Y-%m-%d")
+    return parsed.dt.date.astype(object).where(parsed.notna(), None)
+
+
+def _sniff_compression(stream: io.BufferedReader) -> str | None:
+    head = stream.peek(6)[:6]
+    for magic, name in _MAGIC:
+        if head.startswith(magic):
+            return name
+    return None
+
+
+def _decompress(stream: BinaryIO, compression: str | None) -> BinaryIO:
+    if compression == "gzip":
+        return gzip.GzipFile(fileobj=stream, mode="rb")
+    if compression == "bz2":
+        return bz2.BZ2File(stream, mode="rb")
+    if compression == "xz":
+        return lzma.LZMAFile(stream, mode="rb")
+    if compression == "zstd":
+        try:
+            import zstandard
+        except ImportError as e:  # pragma: no cover - depends on the environment
+            raise RuntimeError(
+                "zstd input requires zstandard; install it with `pip install neo4j-ontology-loader[zstd]`"
+            ) from e
+        return zstandard.ZstdDecompressor().stream_reader(stream, read_across_frames=True)
+    return stream
+
+
+def open_csv_source(path: str) -> BinaryIO:
+    """Open a CSV source as a binary stream, decompressing transparently.
+
+    ``-`` reads stdin. gzip, bz2, xz and zstd are detected from the file
+    suffix, falling back to the stream's magic bytes. Decompression streams,
+    so nothing is written to disk.
+    """
+    if path == "-":
+        raw = sys.stdin.buffer
+        if not isinstance(raw, io.BufferedReader):
+            raw = io.BufferedReader(raw)
+        return _decompress(raw, _sniff_compression(raw))
+    raw = open(path, "rb")
+    return _decompress(raw, _SUFFIXES.get(Path(path).suffix.lower()) or _sniff_compression(raw))
+
+
+def csv_compression(path: str) -> str | None:
+    """Compression of a local CSV file (from its suffix or magic bytes), None when plain."""
+    compression = _SUFFIXES.get(Path(path).suffix.lower())
+    if compression is None:
+        with open(path, "rb") as raw:
+            compression = _sniff_compression(raw)
+    return compression
+
+
+def iter_csv_chunks(path: str, chunksize: int = DEFAULT_CHUNK_SIZE, **read_csv_kwargs) -> Iterator[pd.DataFrame]:
+    """Stream a (possibly compressed, possibly stdin) CSV as DataFrame chunks of ``chunksize`` rows."""
+    stream = open_csv_source(path)
+    try:
+        with pd.read_csv(stream, chunksize=chunksize, **read_csv_kwargs) as reader:
+            yield from reader
+    finally:
+        if path != "-":
+            stream.close()
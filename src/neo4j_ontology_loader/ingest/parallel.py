@@ -0,0 +1,87 @@
+"""Process-pool parsing and preprocessing of large CSV files.
+
+Streaming reads keep memory bounded, but CSV parsing, row mappings and
+synthetic-id construction still run on one Python thread while the writer
+waits. For plain local CSV files the input is instead split into byte-range
+shards cut at line boundaries; worker processes read and parse their shard
+and apply the ``ChunkPlan`` (see ``prepare``), and the writer receives the
+resulting compact ``RowBatch``es in file order, so later rows still win
+over earlier duplicates.
+
+Shards are cut at newlines, so quoted fields must not contain line breaks.
+Compressed files and stdin cannot be split and use the sequential path.
+"""
+from __future__ import annotations
+
+import io
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Iterator
+
+from neo4j_ontology_loader.ingest.prepare import ChunkPlan, PreparedChunk, prepare_chunk
+
+# Bytes of CSV per shard (~100-200k quote rows)
+DEFAULT_SHARD_BYTES = 8 << 20
+
+
+def can_shard(path: str) -> bool:
+    """True for local, uncompressed CSV files."""
+    from neo4j_ontology_loader.ingest.arrow_io import is_columnar
+    from neo4j_ontology_loader.ingest.pandas_io import csv_compression
+
+    return path != "-" and os.path.isfile(path) and not is_columnar(path) and csv_compression(path) is None
+
+
+def shard_ranges(path: str, shard_bytes: int = DEFAULT_SHARD_BYTES) -> tuple[bytes, list[tuple[int, int]]]:
+    """Return the header line and ``(start, end)`` byte ranges of whole lines after it."""
+    ranges: list[tuple[int, int]] = []
+    with open(path, "rb") as f:
+        header = f.readline()
+        size = os.fstat(f.fileno()).st_size
+        start = f.tell()
+        while start < size:
+            f.seek(min(start + max(shard_bytes, 1), size))
+            # Extend to the end of the line the cut falls into
+            f.readline()
+            end = f.tell()
+            ranges.append((start, end))
+            start = end
+    return header, ranges
+
+
+def prepare_shard(path: str, header: bytes, start: int, end: int, plan: ChunkPlan) -> PreparedChunk:
+    """Parse one byte range of ``path`` (prefixed with the header) and apply ``plan``; runs in a worker."""
+    import pandas as pd
+
+    with open(path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+    # Typed like the sequential reader, so ids do not depend on where the shards are cut
+    return prepare_chunk(pd.read_csv(io.BytesIO(header + data), dtype=plan.csv_dtypes()), plan)
+
+
+def iter_prepared_shards(
+    path: str,
+    plan: ChunkPlan,
+    *,
+    workers: int,
+    shard_bytes: int = DEFAULT_SHARD_BYTES,
+) -> Iterator[PreparedChunk]:
+    """Prepare the shards of ``path`` on ``workers`` processes and yield them in file order.
+
+    At most two shards per worker are in flight, which bounds memory while
+    keeping every worker busy.
+    """
+    header, ranges = shard_ranges(path, shard_bytes)
+    pool = ProcessPoolExecutor(max_workers=workers)
+    pending: deque[Future] = deque()
+    try:
+        for start, end in ranges:
+            pending.append(pool.submit(prepare_shard, path, header, start, end, plan))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
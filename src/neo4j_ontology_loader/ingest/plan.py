@@ -0,0 +1,254 @@
+"""Dry-run load planning: what a load would write, and roughly how long it would take.
+
+``scan_table`` makes one streaming pass over an input with the same
+``ChunkPlan`` a real load uses and collects per-label statistics: rows,
+rows skipped for empty keys (or dropped by a feed's row mapping), distinct
+keys and duplicates, null rates per column and the relationship rows each
+``RelSpec`` would derive from the raw feed. Distinct counts are exact up to
+``EXACT_KEYS`` keys and a HyperLogLog estimate (about 1% error) beyond, so
+memory stays bounded for tens of millions of quotes.
+
+``probe_write_rate`` calibrates the estimate against the target database by
+running a few batches of sampled rows through the load's MERGE statement
+in a transaction that is rolled back, so nothing is committed.
+"""
+from __future__ import annotations
+
+import json
+import math
+import time
+from dataclasses import dataclass, field
+from typing import Iterable, Sequence
+
+import numpy as np
+import pandas as pd
+from neo4j import Driver
+
+from neo4j_ontology_loader.ingest.cypher_templates import merge_nodes_batch
+from neo4j_ontology_loader.ingest.nodes import DEFAULT_BATCH_SIZE
+from neo4j_ontology_loader.ingest.pandas_io import df_to_rows
+from neo4j_ontology_loader.ingest.prepare import ChunkPlan, PreparedChunk, prepare_chunk
+from neo4j_ontology_loader.ingest.rows import is_empty_key
+
+# Distinct keys counted exactly (8 bytes each) before switching to HyperLogLog
+EXACT_KEYS = 2_000_000
+# HyperLogLog precision: 2**14 registers, ~0.8% standard error
+HLL_PRECISION = 14
+# Rows kept per label for the payload size and the write probe
+DEFAULT_SAMPLE_ROWS = 3000
+
+
+def _hashes(values: Sequence) -> np.ndarray:
+    return pd.util.hash_array(np.asarray(values, dtype=object))
+
+
+class KeyCardinality:
+    """Distinct count of values: exact up to ``exact_limit``, HyperLogLog beyond."""
+
+    def __init__(self, exact_limit: int = EXACT_KEYS, precision: int = HLL_PRECISION):
+        self.exact_limit = exact_limit
+        self.precision = precision
+        self._unique: np.ndarray | None = np.empty(0, dtype=np.uint64)
+        self._registers: np.ndarray | None = None
+
+    @property
+    def exact(self) -> bool:
+        return self._unique is not None
+
+    def add(self, values: Sequence) -> None:
+        if not len(values):
+            return
+        hashes = _hashes(values)
+        if self._unique is not None:
+            self._unique = np.union1d(self._unique, hashes)
+            if len(self._unique) <= self.exact_limit:
+                return
+            hashes, self._unique = self._unique, None
+            self._registers = np.zeros(1 << self.precision, dtype=np.uint8)
+        p = np.uint64(self.precision)
+        index = (hashes >> (np.uint64(64) - p)).astype(np.int64)
+        # Rank = leading zeros of the remaining bits + 1; the guard bit caps it at 64 - p + 1
+        rest = (hashes << p) | (np.uint64(1) << (p - np.uint64(1)))
+        rank = (64 - np.floor(np.log2(rest.astype(np.float64)))).astype(np.uint8)
+        np.maximum.at(self._registers, index, rank)
+
+    def count(self) -> int:
+        if self._unique is not None:
+            return len(self._unique)
+        m = len(self._registers)
+        estimate = 0.7213 / (1 + 1.079 / m) * m * m / np.sum(np.power(2.0, -self._registers.astype(np.float64)))
+        zeros = int(np.count_nonzero(self._registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            # Small-range correction (linear counting)
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+
+@dataclass
+class RelationshipPlan:
+    rel_type: str
+    from_label: str
+    to_label: str
+    rows: int = 0
+    pairs: KeyCardinality = field(default_factory=KeyCardinality)
+
+
+@dataclass
+class LabelPlan:
+    label: str
+    key: str
+    source: str = ""
+    rows: int = 0
+    skipped: int = 0
+    rejected: int = 0
+    keys: KeyCardinality = field(default_factory=KeyCardinality)
+    # Missing values per column, in input order
+    nulls: dict[str, int] = field(default_factory=dict)
+    sample: list[dict] = field(default_factory=list)
+    relationships: list[RelationshipPlan] = field(default_factory=list)
+    # Calibrated by probe_write_rate
+    rows_per_second: float | None = None
+
+    @property
+    def distinct_keys(self) -> int:
+        return min(self.keys.count(), self.rows)
+
+    @property
+    def duplicates(self) -> int:
+        """Rows that MERGE into a node written earlier in the same load."""
+        return self.rows - self.distinct_keys
+
+    def null_rates(self) -> dict[str, float]:
+        return {col: n / self.rows for col, n in self.nulls.items()} if self.rows else {}
+
+    @property
+    def payload_bytes(self) -> int:
+        """Estimated bytes of row parameters sent, from the sampled rows' JSON size."""
+        if not self.sample:
+            return 0
+        sample = json.dumps([_payload(row, self.key) for row in self.sample], default=str)
+        return int(len(sample) / len(self.sample) * self.rows)
+
+    @property
+    def seconds(self) -> float | None:
+        if not self.rows_per_second:
+            return None
+        return self.rows / self.rows_per_second
+
+    def add(self, part: PreparedChunk, sample_rows: int = DEFAULT_SAMPLE_ROWS) -> None:
+        rows = part.rows
+        self.skipped += part.skipped
+        if part.validation is not None:
+            self.rejected += part.validation.rows_rejected
+        if not len(rows):
+            return
+        if self.key not in rows.columns:
+            # ingest_nodes skips rows without the key column
+            self.skipped += len(rows)
+            return
+        self.rows += len(rows)
+        for name, values in zip(rows.columns, rows.data):
+            self.nulls[name] = self.nulls.get(name, 0) + int(pd.isna(np.asarray(values, dtype=object)).sum())
+        self.keys.add(rows.column(self.key))
+        for i in range(min(len(rows), sample_rows - len(self.sample))):
+            self.sample.append(rows.record(i))
+
+
+def _payload(row: dict, key: str) -> dict:
+    # The {key_value, props} item ingest_nodes sends per row
+    return {"key_value": row.get(key), "props": row}
+
+
+def scan_table(
+    chunks: Iterable,
+    plan: ChunkPlan,
+    rel_specs: Sequence = (),
+    *,
+    source: str = "",
+    sample_rows: int = DEFAULT_SAMPLE_ROWS,
+) -> LabelPlan:
+    """One pass over ``chunks`` (raw DataFrames or record batches) prepared with ``plan``.
+
+    ``rel_specs`` (``RelSpec``s whose source is this input) are applied to
+    the raw rows, as they read feed columns the projection drops.
+    """
+    stats = LabelPlan(label=plan.label, key=plan.key, source=source)
+    stats.relationships = [RelationshipPlan(s.rel_type, s.from_label, s.to_label) for s in rel_specs]
+    for chunk in chunks:
+        if rel_specs:
+            records = df_to_rows(chunk) if isinstance(chunk, pd.DataFrame) else chunk.to_pylist()
+            for spec, rel in zip(rel_specs, stats.relationships):
+                built = spec.build_rows(records)
+                rel.rows += len(built)
+                rel.pairs.add([f"{r['from_value']}\0{r['to_value']}" for r in built])
+        stats.add(prepare_chunk(chunk, plan), sample_rows)
+    return stats
+
+
+def probe_write_rate(
+    driver: Driver,
+    stats: LabelPlan,
+    *,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> float | None:
+    """Rows per second of the load's MERGE batches on the target, measured in a rolled-back transaction.
+
+    Runs the sampled rows of ``stats`` in batches of ``batch_size`` (as
+    ``ingest_nodes`` does) and rolls back, so the database is unchanged.
+    """
+    items = [_payload(row, stats.key) for row in stats.sample if not is_empty_key(row.get(stats.key))]
+    if not items:
+        return None
+    cypher = merge_nodes_batch(stats.label, stats.key)
+    with driver.session() as session:
+        tx = session.begin_transaction()
+        try:
+            start = time.perf_counter()
+            for i in range(0, len(items), batch_size):
+                tx.run(cypher, rows=items[i : i + batch_size]).consume()
+            seconds = time.perf_counter() - start
+        finally:
+            tx.rollback()
+    stats.rows_per_second = len(items) / seconds if seconds > 0 else None
+    return stats.rows_per_second
+
+
+def _size(n: float) -> str:
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if n < 1024 or unit == "GiB":
+            return f"{n:,.0f} {unit}" if unit == "B" else f"{n:,.1f} {unit}"
+        n /= 1024
+    return f"{n:,.1f} GiB"
+
+
+def format_plan(labels: Sequence[LabelPlan], *, batch_size: int = DEFAULT_BATCH_SIZE) -> list[str]:
+    """Report lines for a dry run: per-label statistics, relationships and estimates."""
+    lines: list[str] = []
+    total_seconds, total_bytes, unknown = 0.0, 0, False
+    for s in labels:
+        approx = "" if s.keys.exact else "~"
+        lines.append(
+            f"{s.label}{f' ({s.source})' if s.source else ''}: rows={s.rows} keys={approx}{s.distinct_keys} "
+            f"duplicates={approx}{s.duplicates} skipped={s.skipped}"
+            + (f" rejected={s.rejected}" if s.rejected else "")
+        )
+        rates = {col: rate for col, rate in s.null_rates().items() if rate}
+        if rates:
+            lines.append("  nulls: " + ", ".join(f"{col}={rate:.1%}" for col, rate in rates.items()))
+        for rel in s.relationships:
+            pairs = ("" if rel.pairs.exact else "~") + str(rel.pairs.count())
+            lines.append(f"  ({rel.from_label})-[:{rel.rel_type}]->({rel.to_label}): rows={rel.rows} distinct={pairs}")
+        payload = s.payload_bytes
+        total_bytes += payload
+        estimate = f"  writes: {math.ceil(s.rows / batch_size)} transactions, ~{_size(payload)} of parameters"
+        if s.seconds is not None:
+            estimate += f", ~{s.seconds:,.1f}s at {s.rows_per_second:,.0f} rows/s"
+            total_seconds += s.seconds
+        elif s.rows:
+            unknown = True
+        lines.append(estimate)
+    total = f"Total: {sum(s.rows for s in labels)} rows, ~{_size(total_bytes)} of parameters"
+    if total_seconds or not unknown:
+        total += f", ~{total_seconds:,.1f}s of writes" + (" (excluding unprobed labels)" if unknown else "")
+    lines.append(total)
+    return lines
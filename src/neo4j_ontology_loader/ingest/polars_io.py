@@ -0,0 +1,235 @@
+"""Polars frame backend for the client-side ingest pipeline.
+
+The pandas backend parses CSV on one thread and builds synthetic ids and
+mapped rows with per-element Python string operations. With
+``--frame-backend polars`` a ``ChunkPlan`` is instead applied as a lazy
+polars query:
+
+- CSV, Parquet and Arrow IPC inputs are scanned lazily, so only the columns
+  the plan needs are parsed (projection pushdown to the model fields);
+- parsing and expressions run on polars' thread pool (``POLARS_MAX_THREADS``);
+- row mappings with polars ``expressions`` (the Bond mapping) and synthetic
+  ids (``pl.concat_str``) are column-wise; a mapping without expressions is
+  still applied row by row;
+- properties with native Neo4j types (``ChunkPlan.types``) are cast in the
+  query, except datetimes, which go through ``pandas_io.to_utc_datetime``
+  so both backends accept the same ISO-8601 variants;
+- chunks stream from the query in file order.
+
+Validation keeps its pandas implementation: chunks of validating plans are
+handed to ``prepare_chunk`` as DataFrames.
+
+``polars`` is an optional dependency (``pip install .[polars]``) and is
+only imported when the backend is selected.
+"""
+from __future__ import annotations
+
+import os
+from dataclasses import replace
+from typing import TYPE_CHECKING, Iterable, Iterator
+
+from neo4j_ontology_loader.ingest.arrow_io import input_format
+from neo4j_ontology_loader.ingest.prepare import ChunkPlan, PreparedChunk, prepare_chunk
+from neo4j_ontology_loader.ingest.rows import RowBatch
+
+if TYPE_CHECKING:
+    import polars as pl
+
+FRAME_BACKENDS = ("pandas", "polars")
+
+# Rows polars samples to infer CSV column types (its default is 100)
+INFER_SCHEMA_ROWS = 10_000
+
+
+def require_polars():
+    try:
+        import polars
+    except ImportError as e:  # pragma: no cover - depends on the environment
+        raise RuntimeError(
+            "--frame-backend polars requires polars; install it with `pip install neo4j-ontology-loader[polars]`"
+        ) from e
+    return polars
+
+
+def can_scan(path: str) -> bool:
+    """True for local Parquet, Arrow IPC and uncompressed CSV files (stdin and compressed CSV stay on pandas)."""
+    from neo4j_ontology_loader.ingest.pandas_io import csv_compression
+
+    if path == "-" or not os.path.isfile(path):
+        return False
+    return input_format(path) != "csv" or csv_compression(path) is None
+
+
+def scan(path: str, text_columns: Iterable[str] = ()) -> "pl.LazyFrame":
+    """A lazy scan of ``path`` by its format; nothing is read until the query runs.
+
+    CSV ``text_columns`` are read as strings: types inferred from the first
+    rows would fail the query part-way through a load if, say, an id column
+    turned alphanumeric further down.
+    """
+    pl = require_polars()
+    fmt = input_format(path)
+    if fmt == "parquet":
+        return pl.scan_parquet(path)
+    if fmt == "arrow":
+        return pl.scan_ipc(path)
+    overrides = dict.fromkeys(text_columns, pl.String)
+    return pl.scan_csv(path, infer_schema_length=INFER_SCHEMA_ROWS, schema_overrides=overrides)
+
+
+def synthetic_key(columns: tuple[str, ...], sep: str = ":") -> "pl.Expr":
+    """The string join of ``columns``; null when any of them is null."""
+    pl = require_polars()
+    return pl.concat_str([pl.col(c).cast(pl.String) for c in columns], separator=sep)
+
+
+def native_expression(name: str, kind: str, dtype: "pl.DataType") -> "pl.Expr":
+    """Cast column ``name`` (of ``dtype``) to ``kind``; values that do not convert become null."""
+    pl = require_polars()
+    from neo4j_ontology_loader.ingest.validation import BOOL_STRINGS
+
+    col = pl.col(name)
+    if kind == "str":
+        if dtype == pl.String:
+            return col
+        if dtype.is_float():
+            # Like validation.as_text: 4411.0 -> "4411"
+            whole = col.cast(pl.Int64, strict=False).cast(pl.String)
+            return pl.when(col % 1 == 0).then(whole).otherwise(col.cast(pl.String))
+        return col.cast(pl.String)
+    if kind == "float":
+        return col.cast(pl.Float64, strict=False).fill_nan(None)
+    if kind == "int":
+        if dtype.is_integer():
+            return col
+        number = col.cast(pl.Float64, strict=False)
+        return pl.when(number % 1 == 0).then(number.cast(pl.Int64, strict=False))
+    if kind == "bool":
+        if dtype == pl.Boolean:
+            return col
+        text = col.cast(pl.String).str.strip_chars().str.to_lowercase()
+        return text.replace_strict(BOOL_STRINGS, default=None, return_dtype=pl.Boolean)
+    if kind == "date":
+        if dtype.is_temporal():
+            return col.cast(pl.Date)
+        return col.cast(pl.String).str.strip_chars().str.slice(0, 10).str.to_date("%Y-%m-%d", strict=False)
+    raise ValueError(f"No polars cast for {kind} values")
+
+
+def _typed(frame, plan: ChunkPlan):
+    """``frame`` (lazy or not) with the persisted ``plan.types`` columns cast, datetimes excepted."""
+    schema = frame.collect_schema()
+    casts = [
+        native_expression(name, kind, schema[name]).alias(name)
+        for name, kind in plan.types
+        if kind != "datetime" and name in schema and (plan.columns is None or name in plan.columns)
+    ]
+    return frame.with_columns(casts) if casts else frame
+
+
+def utc_datetimes(values: "pl.Series") -> list:
+    """``values`` as UTC timestamps, like ``pandas_io.to_utc_datetime`` (None when missing or invalid).
+
+    The usual ISO-8601 shapes are parsed by polars; any other non-null
+    value goes through ``to_utc_datetime``, so both backends agree.
+    """
+    import pandas as pd
+
+    from neo4j_ontology_loader.ingest.pandas_io import to_utc_datetime
+
+    pl = require_polars()
+    if isinstance(values.dtype, pl.Datetime):
+        parsed = (
+            values.dt.replace_time_zone("UTC") if values.dtype.time_zone is None else values.dt.convert_time_zone("UTC")
+        )
+    else:
+        text = values.cast(pl.String)
+        aware = text.str.replace(r"Z$", "+00:00").str.to_datetime(
+            "%Y-%m-%dT%H:%M:%S%.f%z", strict=False, time_unit="us"
+        )
+        naive = text.str.replace(" ", "T", literal=True).str.to_datetime(
+            "%Y-%m-%dT%H:%M:%S%.f", strict=False, time_unit="us"
+        )
+        day = text.str.to_date("%Y-%m-%d", strict=False).cast(pl.Datetime("us"))
+        parsed = aware.dt.convert_time_zone("UTC").fill_null(naive.fill_null(day).dt.replace_time_zone("UTC"))
+    # Through numpy, so the tzinfo is timezone.utc as with to_utc_datetime
+    # (polars' own values carry a ZoneInfo, which Neo4j stores as a zone id)
+    stamps = pd.Series(parsed.dt.replace_time_zone(None).to_numpy()).dt.tz_localize("UTC")
+    out = stamps.dt.to_pydatetime().where(stamps.notna(), None)
+    rest = (parsed.is_null() & values.is_not_null()).to_numpy()
+    if rest.any():
+        out[rest] = to_utc_datetime(pd.Series(values.filter(pl.Series(rest)).to_list(), dtype=object)).to_numpy()
+    return out.tolist()
+
+
+def _mapped_rows(plan: ChunkPlan) -> bool:
+    # A row mapping polars cannot express; applied per chunk in Python
+    return plan.transform is not None and plan.expressions is None
+
+
+def plan_query(lf: "pl.LazyFrame", plan: ChunkPlan) -> "pl.LazyFrame":
+    """The lazy part of ``plan``: mapping expressions, synthetic id, projection and casts."""
+    pl = require_polars()
+    if _mapped_rows(plan):
+        return lf
+    names = lf.collect_schema().names()
+    if plan.transform is not None:
+        lf = lf.select(plan.expressions(names))
+        names = lf.collect_schema().names()
+    if plan.synthetic_key and set(plan.synthetic_key) <= set(names):
+        lf = lf.with_columns(synthetic_key(plan.synthetic_key).alias(plan.key))
+        names = [*names, plan.key] if plan.key not in names else names
+    if plan.columns is not None and plan.objects is None:
+        # The nested values are mapped from the whole prepared row
+        lf = lf.select([pl.col(c) for c in names if c in plan.columns])
+    return lf if plan.validate else _typed(lf, plan)
+
+
+def prepare_frame(df: "pl.DataFrame", plan: ChunkPlan) -> PreparedChunk:
+    """Apply the eager part of ``plan`` to a chunk of the ``plan_query`` result."""
+    pl = require_polars()
+    skipped = 0
+    if _mapped_rows(plan):
+        records = df.to_dicts()
+        mapped = [row for row in map(plan.transform, records) if row is not None]
+        skipped = len(records) - len(mapped)
+        df = pl.DataFrame(mapped, infer_schema_length=None)
+        if plan.synthetic_key and len(df) and set(plan.synthetic_key) <= set(df.columns):
+            df = df.with_columns(synthetic_key(plan.synthetic_key).alias(plan.key))
+        if not plan.validate:
+            df = _typed(df, plan)
+
+    if plan.validate:
+        import pandas as pd
+
+        frame = pd.DataFrame(df.to_dict(as_series=False))
+        part = prepare_chunk(frame, replace(plan, transform=None, expressions=None, synthetic_key=(), types=()))
+        part.skipped += skipped
+        return part
+
+    if plan.key in df.columns:
+        before = len(df)
+        value = pl.col(plan.key)
+        df = df.filter(value.is_not_null() & (value.cast(pl.String).str.strip_chars() != ""))
+        skipped += before - len(df)
+
+    objects = None
+    if plan.objects is not None and plan.key in df.columns:
+        objects = [(row[plan.key], plan.objects(row)) for row in df.iter_rows(named=True)]
+    rows = RowBatch.from_polars(df, plan.columns)
+    parsed = {name for name, kind in plan.types if kind == "datetime"}
+    if parsed & set(rows.columns):
+        rows = RowBatch(rows.columns, [
+            utc_datetimes(df.get_column(name)) if name in parsed else values
+            for name, values in zip(rows.columns, rows.data)
+        ])
+    return PreparedChunk(rows=rows, skipped=skipped, objects=objects)
+
+
+def iter_prepared_polars(path: str, plan: ChunkPlan, chunk_size: int) -> Iterator[PreparedChunk]:
+    """Prepared chunks of ``path`` in file order, streamed from a lazy polars query."""
+    # Typed properties are cast by the query (null when a value does not convert)
+    text = plan.text_columns() | {name for name, _ in plan.types}
+    query = plan_query(scan(path, text), plan)
+    for df in query.collect_batches(chunk_size=chunk_size):
+        yield prepare_frame(df, plan)
@@ -0,0 +1,187 @@
+"""Per-chunk preprocessing shared by the sequential and the process-pool load paths.
+
+A ``ChunkPlan`` describes everything done to a parsed chunk before it is
+written: the row mapping of feeds that need one, synthetic ids, validation
+or the conversion to native Neo4j types, dropping rows without a key and
+the projection to the persisted columns. It is a plain picklable value, so worker processes can
+apply it to the shards they parse and send back compact ``RowBatch``es.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+from typing import TYPE_CHECKING, Callable
+
+import pandas as pd
+
+from neo4j_ontology_loader.ingest.rows import RowBatch
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+    from neo4j_ontology_loader.ingest.validation import ValidationResult
+
+
+@dataclass(frozen=True)
+class ChunkPlan:
+    label: str
+    key: str = "id"
+    # Columns to keep (projection); None keeps every column
+    columns: frozenset[str] | None = None
+    # Columns joined with ':' into ``key``, built from the raw values
+    synthetic_key: tuple[str, ...] = ()
+    # Module-level row mapping (None drops the row), applied first
+    transform: Callable[[dict], dict | None] | None = None
+    # Module-level builder of the polars expressions equivalent to ``transform``, given the
+    # input's column names; the polars backend selects them instead of mapping rows
+    expressions: Callable[[list[str]], list] | None = None
+    validate: bool = False
+    # (property, kind) converted to native Neo4j types when not validating (validation
+    # coerces them itself); see ``native_types``
+    types: tuple[tuple[str, str], ...] = ()
+    # Module-level mapping of a prepared row to its nested ObjectProperty values
+    objects: Callable[[dict], dict | None] | None = None
+
+    def read_columns(self) -> set[str] | None:
+        """Input columns to read from columnar files; None (all) when a row mapping needs the raw feed."""
+        if self.transform is not None or self.columns is None:
+            return None
+        return set(self.columns) | set(self.synthetic_key)
+
+    def text_columns(self) -> set[str]:
+        """Input columns to read as strings: the key, the synthetic-key parts and ``str`` properties.
+
+        Chunked readers guess column types per chunk, so an id column with a
+        blank cell in one chunk would otherwise turn into floats there.
+        """
+        if self.transform is not None:
+            # The mapping's input columns are not the properties
+            return {self.key}
+        return {self.key, *self.synthetic_key} | {name for name, kind in self.types if kind == "str"}
+
+    def csv_dtypes(self) -> dict[str, type]:
+        """``pd.read_csv`` ``dtype`` for ``text_columns``."""
+        return dict.fromkeys(sorted(self.text_columns()), str)
+
+
+@dataclass
+class PreparedChunk:
+    rows: RowBatch
+    # Rows dropped because the mapping rejected them or their key was empty
+    skipped: int = 0
+    # Validation outcome; its frame only keeps the index (rows_rejected stays correct)
+    validation: "ValidationResult | None" = None
+    # (key value, nested values) per row when the plan maps objects
+    objects: list[tuple] | None = None
+
+
+# PropertyDef types written as native Neo4j String, Integer, Float, Boolean, Date and DateTime values
+NATIVE_KINDS = ("str", "int", "float", "bool", "date", "datetime")
+
+
+def native_types(entity) -> tuple[tuple[str, str], ...]:
+    """``(property, kind)`` of the entity's properties with a native Neo4j type.
+
+    ``float | None`` counts as ``float``; types the schema does not name
+    precisely (``Optional``, models) are written as read.
+    """
+    if entity is None:
+        return ()
+    kinds = ((p.name, p.type.split("|")[0].strip()) for p in entity.properties)
+    return tuple((name, kind) for name, kind in kinds if kind in NATIVE_KINDS)
+
+
+def _untyped(chunk, plan: ChunkPlan, columnar: bool) -> list[tuple[str, str]]:
+    """The persisted ``plan.types`` columns of ``chunk`` that still need converting."""
+    names = set(chunk.schema.names if columnar else chunk.columns)
+    wanted = [(n, k) for n, k in plan.types if n in names and (plan.columns is None or n in plan.columns)]
+    if columnar:
+        from neo4j_ontology_loader.ingest.arrow_io import has_native_type
+
+        # Typed Parquet/Arrow columns are kept as they are
+        wanted = [(n, k) for n, k in wanted if not has_native_type(chunk, n, k)]
+    return wanted
+
+
+def _records(chunk) -> list[dict]:
+    from neo4j_ontology_loader.ingest.pandas_io import df_to_rows
+
+    return df_to_rows(chunk) if isinstance(chunk, pd.DataFrame) else chunk.to_pylist()
+
+
+def _transformed(chunk, transform) -> tuple[pd.DataFrame, int]:
+    records = _records(chunk)
+    mapped = [row for row in map(transform, records) if row is not None]
+    return pd.DataFrame(mapped), len(records) - len(mapped)
+
+
+def _with_synthetic_key(chunk, key: str, columns: tuple[str, ...]):
+    if not isinstance(chunk, pd.DataFrame):
+        from neo4j_ontology_loader.ingest.arrow_io import add_joined_column
+
+        return add_joined_column(chunk, key, list(columns), ":")
+    from neo4j_ontology_loader.ingest.validation import coerce_column
+
+    # Parts as the str properties are written (4411.0 -> "4411"); a missing part leaves no id
+    parts = [coerce_column(chunk[col], "str").astype("str") for col in columns]
+    synthetic = parts[0]
+    for part in parts[1:]:
+        synthetic = synthetic + ":" + part
+    chunk[key] = synthetic
+    return chunk
+
+
+def _drop_empty_keys(chunk, key: str) -> tuple[object, int]:
+    if not isinstance(chunk, pd.DataFrame):
+        from neo4j_ontology_loader.ingest.arrow_io import drop_empty
+
+        return drop_empty(chunk, key)
+    before = len(chunk)
+    chunk = chunk[chunk[key].notna()]
+    chunk = chunk[chunk[key].astype(str).str.strip() != ""]
+    return chunk, before - len(chunk)
+
+
+def prepare_chunk(chunk: "pd.DataFrame | pa.RecordBatch", plan: ChunkPlan) -> PreparedChunk:
+    """Apply ``plan`` to a DataFrame chunk or an Arrow record batch."""
+    skipped = 0
+    if plan.transform is not None:
+        chunk, skipped = _transformed(chunk, plan.transform)
+    columnar = not isinstance(chunk, pd.DataFrame)
+    names = chunk.schema.names if columnar else list(chunk.columns)
+
+    # Synthetic ids are built from the raw values, before dates are parsed
+    if plan.synthetic_key and len(chunk):
+        chunk = _with_synthetic_key(chunk, plan.key, plan.synthetic_key)
+        names = chunk.schema.names if columnar else list(chunk.columns)
+
+    validation = None
+    untyped = [] if plan.validate else _untyped(chunk, plan, columnar)
+    if plan.validate or untyped:
+        if columnar:
+            chunk, columnar = chunk.to_pandas(), False
+        if plan.validate:
+            from neo4j_ontology_loader.ingest.validation import validate_frame, validator_for
+            from neo4j_ontology_loader.schema.registry import load_ontology_schema
+
+            validator = validator_for(plan.label, load_ontology_schema().entity(plan.label))
+            if validator is not None:
+                result = validate_frame(chunk, validator)
+                chunk = result.frame
+                validation = replace(result, frame=chunk.iloc[:, :0])
+        else:
+            from neo4j_ontology_loader.ingest.validation import coerce_column
+
+            for col, kind in untyped:
+                chunk[col] = coerce_column(chunk[col], kind)
+
+    if plan.key in names:
+        chunk, dropped = _drop_empty_keys(chunk, plan.key)
+        skipped += dropped
+
+    objects = None
+    if plan.objects is not None and plan.key in names:
+        # Mapped from the full prepared row, before the projection drops the fields it needs
+        objects = [(row[plan.key], plan.objects(row)) for row in _records(chunk)]
+
+    rows = RowBatch.from_arrow(chunk, plan.columns) if columnar else RowBatch.from_frame(chunk, plan.columns)
+    return PreparedChunk(rows=rows, skipped=skipped, validation=validation, objects=objects)
@@ -1,5 +1,18 @@
 from neo4j import Driver
-from neo4j_ontology_loader.ingest.cypher_templates import merge_relationship
+from neo4j_ontology_loader.ingest.cypher_templates import (
+    merge_relationships_batch,
+    merge_relationships_by_element_id,
+)
+from neo4j_ontology_loader.ingest.element_ids import ElementIdCache
+from neo4j_ontology_loader.neo4j.execution import RetryPolicy, WriteMetrics, run_write
+from neo4j_ontology_loader.neo4j.query_cache import invalidate_labels
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+def _write_batch(tx, cypher: str, batch: list[dict]) -> None:
+    tx.run(cypher, rows=batch).consume()
+
 
 def ingest_relationships(
     driver: Driver,
@@ -8,11 +21,51 @@ def ingest_relationships(
     to_label: str, to_key: str,
     rows: list[dict],
     from_field: str, to_field: str,
+    *,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    policy: RetryPolicy | None = None,
+    metrics: WriteMetrics | None = None,
+    id_cache: ElementIdCache | None = None,
 ) -> None:
-    cypher = merge_relationship(rel_type, from_label, from_key, to_label, to_key)
-    with driver.session() as session:
+    """MERGE relationships in batches, each a managed write with transient-error retries.
+
+    With ``id_cache``, endpoints are resolved to elementIds client-side
+    (one lookup per batch for keys not seen before) and matched by
+    elementId instead of by key property. As with the key MATCH, a row
+    connects every node carrying its key values, and rows whose endpoints
+    do not exist are skipped.
+    """
+    if id_cache is None:
+        cypher = merge_relationships_batch(rel_type, from_label, from_key, to_label, to_key)
+    else:
+        cypher = merge_relationships_by_element_id(rel_type)
+
+    def flush(batch: list[dict]) -> None:
+        if id_cache is not None:
+            from_ids = id_cache.resolve(driver, from_label, from_key, (r["from_value"] for r in batch))
+            to_ids = id_cache.resolve(driver, to_label, to_key, (r["to_value"] for r in batch))
+            # A key value may match several nodes (keys without a uniqueness constraint)
+            batch = [
+                {"from_id": from_id, "to_id": to_id, "props": r["props"]}
+                for r in batch
+                for from_id in from_ids.get(r["from_value"], ())
+                for to_id in to_ids.get(r["to_value"], ())
+            ]
+            if not batch:
+                return
+        run_write(driver, _write_batch, cypher, batch, rows=len(batch), policy=policy, metrics=metrics)
+
+    batch: list[dict] = []
+    try:
         for row in rows:
             props = dict(row)
             from_value = props.pop(from_field)
             to_value = props.pop(to_field)
-            session.run(cypher, from_value=from_value, to_value=to_value, props=props)
+            batch.append({"from_value": from_value, "to_value": to_value, "props": props})
+            if len(batch) >= batch_size:
+                flush(batch)
+                batch = []
+        if batch:
+            flush(batch)
+    finally:
+        invalidate_labels([from_label, to_label])
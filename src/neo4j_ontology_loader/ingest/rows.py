@@ -0,0 +1,120 @@
+"""Compact, column-oriented row batches for the ingest pipeline.
+
+Turning every chunk into a list of dicts (and then filtering and copying
+those dicts again) costs a few hundred bytes per row before anything is
+sent. ``RowBatch`` instead keeps one Python list per column plus a single
+shared tuple of column names: field filtering is a column projection, and
+the per-row dicts the driver needs are only built when a write batch is
+serialized, so at most one write batch of dicts is alive at a time.
+"""
+from __future__ import annotations
+
+import math
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, Sequence
+
+if TYPE_CHECKING:
+    import pandas as pd
+    import polars as pl
+    import pyarrow as pa
+
+
+def is_empty_key(value: Any) -> bool:
+    """True for key values that cannot identify a node (None, NaN, blank strings)."""
+    return is_missing(value) or (isinstance(value, str) and value.strip() == "")
+
+
+def is_missing(value: Any) -> bool:
+    """True for values that should not become a property (None, NaN)."""
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+
+def _projection(names: Sequence[str], columns: Iterable[str] | None) -> list[str]:
+    if columns is None:
+        return list(names)
+    wanted = set(columns)
+    # Keep input order; requested columns the input does not have are ignored
+    return [name for name in names if name in wanted]
+
+
+class RowBatch:
+    """Rows of one chunk stored as per-column lists sharing one column schema."""
+
+    __slots__ = ("columns", "data")
+
+    def __init__(self, columns: Sequence[str], data: Sequence[list]):
+        if len(columns) != len(data):
+            raise ValueError("RowBatch needs one value list per column")
+        self.columns: tuple[str, ...] = tuple(columns)
+        self.data: tuple[list, ...] = tuple(data)
+
+    @classmethod
+    def from_frame(cls, df: "pd.DataFrame", columns: Iterable[str] | None = None) -> "RowBatch":
+        """Project a DataFrame chunk to ``columns`` (all when None) as Python values."""
+        names = _projection([str(c) for c in df.columns], columns)
+        return cls(names, [df[name].tolist() for name in names])
+
+    @classmethod
+    def from_arrow(cls, batch: "pa.RecordBatch", columns: Iterable[str] | None = None) -> "RowBatch":
+        """Project a pyarrow RecordBatch (or Table) to ``columns`` as Python values."""
+        names = _projection(batch.schema.names, columns)
+        return cls(names, [batch.column(name).to_pylist() for name in names])
+
+    @classmethod
+    def from_polars(cls, df: "pl.DataFrame", columns: Iterable[str] | None = None) -> "RowBatch":
+        """Project a polars DataFrame to ``columns`` as Python values (nulls become None)."""
+        names = _projection(df.columns, columns)
+        return cls(names, [df.get_column(name).to_list() for name in names])
+
+    @classmethod
+    def from_records(cls, records: Sequence[dict], columns: Iterable[str] | None = None) -> "RowBatch":
+        """Pivot dict rows into columns; missing values become None."""
+        if columns is None:
+            names: dict[str, None] = {}
+            for record in records:
+                names.update(dict.fromkeys(record))
+            columns = list(names)
+        names = list(dict.fromkeys(columns))
+        return cls(names, [[record.get(name) for record in records] for name in names])
+
+    @classmethod
+    def concat(cls, batches: Sequence["RowBatch"]) -> "RowBatch":
+        """Join batches that have the same columns into one."""
+        if not batches:
+            return cls((), ())
+        columns = batches[0].columns
+        if any(batch.columns != columns for batch in batches):
+            raise ValueError("RowBatch.concat needs batches with the same columns")
+        data = [[] for _ in columns]
+        for batch in batches:
+            for values, more in zip(data, batch.data):
+                values.extend(more)
+        return cls(columns, data)
+
+    def __len__(self) -> int:
+        return len(self.data[0]) if self.data else 0
+
+    def column(self, name: str) -> list:
+        return self.data[self.columns.index(name)]
+
+    def select(self, columns: Iterable[str]) -> "RowBatch":
+        """Column projection; the value lists are shared, not copied."""
+        names = _projection(self.columns, columns)
+        return RowBatch(names, [self.column(name) for name in names])
+
+    def record(self, index: int, *, drop_missing: bool = False) -> dict:
+        row = {name: values[index] for name, values in zip(self.columns, self.data)}
+        return {k: v for k, v in row.items() if not is_missing(v)} if drop_missing else row
+
+    def records(self, *, drop_missing: bool = False) -> Iterator[dict]:
+        """Yield the rows as dicts, one at a time (for serialization).
+
+        With ``drop_missing``, None and NaN values are left out, so they are
+        not written as properties.
+        """
+        columns = self.columns
+        if drop_missing:
+            for values in zip(*self.data):
+                yield {k: v for k, v in zip(columns, values) if not is_missing(v)}
+            return
+        for values in zip(*self.data):
+            yield dict(zip(columns, values))
@@ -0,0 +1,155 @@
+"""Server-side ingest with ``LOAD CSV``.
+
+When the CSV files already sit in Neo4j's import directory, Neo4j can read
+them itself: the loader only generates one ``LOAD CSV ... CALL { MERGE ... }
+IN TRANSACTIONS`` statement per file from the same label, key,
+synthetic-key and field definitions the client-side path uses, and no row
+travels through Python or Bolt.
+
+``LOAD CSV`` yields strings (empty cells are null), so property values are
+cast in Cypher according to the property types recorded in the schema.
+"""
+from __future__ import annotations
+
+import csv
+import io
+from urllib.parse import quote
+
+from neo4j import Driver
+
+from neo4j_ontology_loader.ingest.cypher_templates import load_csv_merge_nodes
+from neo4j_ontology_loader.neo4j.execution import RetryPolicy, WriteMetrics, run_autocommit
+from neo4j_ontology_loader.neo4j.query_cache import invalidate_labels
+from neo4j_ontology_loader.schema.types import EntityDef
+
+# Rows per server-side transaction
+DEFAULT_BATCH_SIZE = 10_000
+
+# Inputs LOAD CSV can read (it decompresses gzip itself)
+SERVER_CSV_SUFFIXES = (".csv", ".csv.gz")
+
+_CASTS = {"float": "toFloat", "int": "toInteger", "bool": "toBoolean"}
+
+# ISO-8601 shapes the client path parses (see pandas_io.to_date / to_utc_datetime); regexes
+# without backslashes so they need no escaping in Cypher string literals
+_DATE = "[0-9]{4}-(0[1-9]|1[0-2])-(0[1-9]|[12][0-9]|3[01])"
+_TIME = "T([01][0-9]|2[0-3]):[0-5][0-9](:[0-5][0-9]([.][0-9]+)?)?"
+_OFFSET = "(Z|[+-][0-9]{2}(:?[0-9]{2})?)"
+
+
+def _day_in_month(text: str) -> str:
+    # Whether the date ``text`` starts with exists (no 2024-02-30); month and day are well-formed
+    last_day = f"(date(left({text}, 7) + '-01') + duration('P1M') - duration('P1D')).day"
+    return f"toInteger(substring({text}, 8, 2)) <= {last_day}"
+
+
+def date_expression(value: str) -> str:
+    """Cypher for ``to_date``: the ``YYYY-MM-DD`` at the start of ``value``, null when invalid.
+
+    ``date()`` would fail the whole statement on a single malformed value.
+    """
+    text = f"left(trim({value}), 10)"
+    return f"CASE WHEN {text} =~ '{_DATE}' THEN CASE WHEN {_day_in_month(text)} THEN date({text}) END END"
+
+
+def datetime_expression(value: str) -> str:
+    """Cypher for ``to_utc_datetime``: ISO-8601 date or date-time, naive as UTC, null when invalid."""
+    text = f"replace(trim({value}), ' ', 'T')"
+    return (
+        f"CASE WHEN {text} =~ '{_DATE}({_TIME}{_OFFSET}?)?' THEN CASE WHEN {_day_in_month(text)} THEN "
+        f"CASE WHEN {text} =~ '{_DATE}' THEN datetime({text} + 'T00:00Z') "
+        f"WHEN {text} =~ '{_DATE}{_TIME}' THEN datetime({text} + 'Z') "
+        f"ELSE datetime({text}) END END END"
+    )
+
+
+def file_url(path: str, base_url: str = "file:///") -> str:
+    """URL under which the server reads ``path``; paths are relative to the import directory."""
+    if "://" in path:
+        return path
+    if not base_url.endswith("/"):
+        base_url += "/"
+    return base_url + quote(path.replace("\\", "/").lstrip("/"))
+
+
+def csv_header(path: str) -> list[str]:
+    """Column names of a local (optionally compressed) CSV file."""
+    from neo4j_ontology_loader.ingest.pandas_io import open_csv_source
+
+    stream = open_csv_source(path)
+    try:
+        line = io.TextIOWrapper(stream, encoding="utf-8-sig").readline()
+    finally:
+        stream.close()
+    return next(csv.reader([line]), [])
+
+
+def key_expression(key: str, synthetic_key: tuple[str, ...] | list[str] = ()) -> str:
+    """Cypher expression for the MERGE key; a synthetic key is null when any part is missing."""
+    if synthetic_key:
+        return " + ':' + ".join(f"row.{column}" for column in synthetic_key)
+    return f"row.{key}"
+
+
+def property_expressions(
+    entity: EntityDef | None,
+    fields: set[str] | frozenset[str] | None = None,
+    columns: list[str] | None = None,
+) -> dict[str, str] | None:
+    """Property -> typed Cypher expression for the entity's properties.
+
+    Restricted to ``fields`` (the field filter) and, when the header is
+    known, to the CSV ``columns``. Without an entity the ``fields`` are
+    copied as strings, and without either every column is (``None``).
+    """
+    if entity is not None:
+        types = {prop.name: prop.type for prop in entity.properties}
+    elif fields is not None:
+        types = {name: "str" for name in sorted(fields)}
+    else:
+        return None
+    out: dict[str, str] = {}
+    for name, type_ in types.items():
+        if fields is not None and name not in fields:
+            continue
+        if columns is not None and name not in columns:
+            continue
+        kind = type_.split("|")[0].strip()
+        if kind == "date":
+            out[name] = date_expression(f"row.{name}")
+        elif kind == "datetime":
+            out[name] = datetime_expression(f"row.{name}")
+        else:
+            cast = _CASTS.get(kind)
+            out[name] = f"{cast}(row.{name})" if cast else f"row.{name}"
+    return out
+
+
+def load_csv_nodes(
+    driver: Driver,
+    url: str,
+    label: str,
+    key: str = "id",
+    *,
+    entity: EntityDef | None = None,
+    synthetic_key: tuple[str, ...] | list[str] = (),
+    fields: set[str] | frozenset[str] | None = None,
+    columns: list[str] | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    policy: RetryPolicy | None = None,
+    metrics: WriteMetrics | None = None,
+):
+    """MERGE ``label`` nodes from the CSV at ``url`` on the server; return the summary counters."""
+    cypher = load_csv_merge_nodes(
+        label,
+        key,
+        key_expression(key, synthetic_key),
+        property_expressions(entity, fields, columns),
+        batch_size,
+    )
+    try:
+        summary = run_autocommit(driver, cypher, {"url": url}, policy=policy, metrics=metrics)
+    finally:
+        # IN TRANSACTIONS commits batches even when the statement fails later
+        invalidate_labels([label])
+    return summary.counters
@@ -0,0 +1,331 @@
+"""Batched, column-wise validation of DataFrame chunks against the models.
+
+Instantiating a Pydantic model per row is far too slow for quote volumes.
+Instead each model is compiled once into a list of ``ColumnRule`` objects
+(coerce + check per column) that run vectorized over a whole chunk. Only
+fields with complex annotations (nested models, lists) fall back to
+``pydantic.TypeAdapter`` over the column.
+"""
+from __future__ import annotations
+
+import inspect
+import json
+import os
+import types
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from enum import Enum
+from functools import lru_cache
+from typing import Any, Literal, Union, get_args, get_origin
+
+import pandas as pd
+from pydantic import BaseModel
+
+from neo4j_ontology_loader.schema.types import EntityDef
+from utils.logging import get_logger
+
+_SCALAR_KINDS = {str: "str", int: "int", float: "float", bool: "bool", datetime: "datetime", date: "date"}
+
+BOOL_STRINGS = {
+    "true": True, "t": True, "yes": True, "y": True, "1": True, "1.0": True,
+    "false": False, "f": False, "no": False, "n": False, "0": False, "0.0": False,
+}
+
+
+@dataclass(frozen=True)
+class ColumnRule:
+    name: str
+    # One of: str, int, float, bool, datetime, date, literal, complex
+    kind: str
+    required: bool
+    allowed: frozenset | None = None
+    # Only set for kind == "complex"
+    annotation: Any = None
+
+
+@dataclass(frozen=True)
+class FrameValidator:
+    label: str
+    rules: list[ColumnRule]
+
+
+@dataclass(frozen=True)
+class RowError:
+    row: Any
+    field: str
+    reason: str
+    value: Any
+
+
+@dataclass
+class ValidationResult:
+    frame: pd.DataFrame
+    errors: list[RowError] = field(default_factory=list)
+    rows_checked: int = 0
+
+    @property
+    def rows_rejected(self) -> int:
+        return self.rows_checked - len(self.frame)
+
+
+def _unwrap_optional(annotation: Any) -> Any:
+    origin = get_origin(annotation)
+    if origin is Union or origin is types.UnionType:
+        args = [a for a in get_args(annotation) if a is not type(None)]  # noqa: E721
+        if len(args) == 1:
+            return args[0]
+    return annotation
+
+
+def _rule_for(name: str, annotation: Any, required: bool) -> ColumnRule:
+    ann = _unwrap_optional(annotation)
+    if ann in _SCALAR_KINDS:
+        return ColumnRule(name=name, kind=_SCALAR_KINDS[ann], required=required)
+    if get_origin(ann) is Literal:
+        return ColumnRule(name=name, kind="literal", required=required, allowed=frozenset(get_args(ann)))
+    if inspect.isclass(ann) and issubclass(ann, Enum):
+        return ColumnRule(name=name, kind="literal", required=required, allowed=frozenset(m.value for m in ann))
+    return ColumnRule(name=name, kind="complex", required=required, annotation=ann)
+
+
+@lru_cache(maxsize=None)
+def compile_model(model: type[BaseModel]) -> FrameValidator:
+    """Compile a Pydantic model into column rules (cached per model)."""
+    rules = [_rule_for(name, f.annotation, f.is_required()) for name, f in model.model_fields.items()]
+    return FrameValidator(label=model.__name__, rules=rules)
+
+
+def compile_entity(node: EntityDef) -> FrameValidator:
+    """Compile an EntityDef (e.g. the flat SZKB Bond) using its recorded property types."""
+    type_kinds = {kind: kind for kind in _SCALAR_KINDS.values()}
+    rules = [
+        ColumnRule(name=p.name, kind=type_kinds.get(p.type, "str"), required=p.required)
+        for p in node.properties
+    ]
+    return FrameValidator(label=node.name, rules=rules)
+
+
+def validator_for(label: str, entity: EntityDef | None = None) -> FrameValidator | None:
+    """Return the validator for a label: from its registered model, else its EntityDef."""
+    from neo4j_ontology_loader.schema.registry import entity_models
+
+    for entry in entity_models():
+        if entry.label == label and not entry.abstract:
+            return compile_model(entry.model)
+    if entity is not None and not entity.abstract:
+        return compile_entity(entity)
+    return None
+
+
+# ------------------- column coercions -------------------
+# Each returns (coerced column, mask of non-null values that failed coercion).
+
+def as_text(value: Any) -> str:
+    """``str(value)``, except that whole floats lose their ``.0`` (ids read as floats: 4411.0 -> "4411")."""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _coerce_str(col: pd.Series, present: pd.Series) -> tuple[pd.Series, pd.Series]:
+    ok = pd.Series(False, index=col.index)
+    if isinstance(col.dtype, pd.StringDtype):
+        return col.astype(object).where(present, None), ok
+    out = pd.Series(None, index=col.index, dtype=object)
+    if pd.api.types.is_float_dtype(col.dtype):
+        # Ids read as float because of NaNs elsewhere in the column: 4411.0 -> "4411"
+        integral = present & (col % 1 == 0)
+        out[integral] = col[integral].astype("int64").astype(str)
+        rest = present & ~integral
+        out[rest] = col[rest].astype(str)
+    elif col.dtype == object:
+        out[present] = col[present].map(as_text)
+    else:
+        out[present] = col[present].astype(str)
+    return out, ok
+
+
+def _coerce_float(col: pd.Series, present: pd.Series) -> tuple[pd.Series, pd.Series]:
+    num = pd.to_numeric(col, errors="coerce")
+    bad = present & num.isna()
+    return num.astype(float).astype(object).where(present & ~bad, None), bad
+
+
+def _coerce_int(col: pd.Series, present: pd.Series) -> tuple[pd.Series, pd.Series]:
+    num = pd.to_numeric(col, errors="coerce")
+    bad = present & (num.isna() | (num % 1 != 0))
+    ok = present & ~bad
+    out = pd.Series(None, index=col.index, dtype=object)
+    out[ok] = num[ok].astype("int64").astype(object)
+    return out, bad
+
+
+def _coerce_bool(col: pd.Series, present: pd.Series) -> tuple[pd.Series, pd.Series]:
+    if pd.api.types.is_bool_dtype(col.dtype):
+        return col.astype(object), pd.Series(False, index=col.index)
+    mapped = col.astype(str).str.strip().str.lower().map(BOOL_STRINGS)
+    bad = present & mapped.isna()
+    return mapped.astype(object).where(present & ~bad, None), bad
+
+
+def _coerce_datetime(col: pd.Series, present: pd.Series) -> tuple[pd.Series, pd.Series]:
+    from neo4j_ontology_loader.ingest.pandas_io import to_utc_datetime
+
+    out = to_utc_datetime(col)
+    return out, present & out.isna()
+
+
+def _coerce_date(col: pd.Series, present: pd.Series) -> tuple[pd.Series, pd.Series]:
+    from neo4j_ontology_loader.ingest.pandas_io import to_date
+
+    out = to_date(col)
+    return out, present & out.isna()
+
+
+def _coerce_literal(col: pd.Series, present: pd.Series, allowed: frozenset) -> tuple[pd.Series, pd.Series]:
+    bad = present & ~col.isin(list(allowed))
+    return col.astype(object).where(present, None), bad
+
+
+def _coerce_complex(col: pd.Series, present: pd.Series, annotation: Any) -> tuple[pd.Series, pd.Series]:
+    from pydantic import ValidationError
+
+    def parse(v: Any) -> Any:
+        if isinstance(v, str):
+            try:
+                return json.loads(v)
+            except ValueError:
+                return v
+        return v
+
+    values = col[present]
+    bad = pd.Series(False, index=col.index)
+    if values.empty:
+        return col.astype(object).where(present, None), bad
+    raw = [parse(v) for v in values.tolist()]
+    try:
+        parsed = _type_adapter(annotation).validate_python(raw)
+    except ValidationError as e:
+        failed = {err["loc"][0] for err in e.errors() if err["loc"]}
+        bad_index = values.index[sorted(failed)]
+        bad[bad_index] = True
+        ok_positions = [i for i in range(len(raw)) if i not in failed]
+        parsed_ok = _type_adapter(annotation).validate_python([raw[i] for i in ok_positions])
+        parsed = [None] * len(raw)
+        for pos, value in zip(ok_positions, parsed_ok):
+            parsed[pos] = value
+    out = pd.Series(None, index=col.index, dtype=object)
+    out[values.index] = [v.model_dump() if isinstance(v, BaseModel) else v for v in parsed]
+    return out, bad
+
+
+_COERCIONS = {
+    "str": _coerce_str,
+    "int": _coerce_int,
+    "float": _coerce_float,
+    "bool": _coerce_bool,
+    "date": _coerce_date,
+    "datetime": _coerce_datetime,
+}
+
+
+def coerce_column(col: pd.Series, kind: str) -> pd.Series:
+    """Convert ``col`` to the Python values of a native ``kind`` (str, int, float, bool, date, datetime).
+
+    Unlike validation nothing is rejected: values that do not convert become None.
+    """
+    coerced, _ = _COERCIONS[kind](col, col.notna())
+    return coerced.astype(object).where(coerced.notna(), None)
+
+
+@lru_cache(maxsize=None)
+def _type_adapter(annotation: Any):
+    from pydantic import TypeAdapter
+
+    return TypeAdapter(list[annotation])
+
+
+def validate_frame(df: pd.DataFrame, validator: FrameValidator) -> ValidationResult:
+    """Coerce model columns of ``df`` and drop rows that fail validation.
+
+    Columns that are not model fields are passed through unchanged. Missing
+    required columns reject every row of the chunk.
+    """
+    out = df.copy(deep=False)
+    invalid = pd.Series(False, index=df.index)
+    failures: list[tuple[str, str, pd.Series]] = []
+
+    for rule in validator.rules:
+        if rule.name not in df.columns:
+            if rule.required:
+                missing = pd.Series(True, index=df.index)
+                failures.append((rule.name, "missing-column", missing))
+                invalid |= missing
+            continue
+        col = df[rule.name]
+        present = col.notna()
+        if rule.kind == "str":
+            coerced, bad = _coerce_str(col, present)
+        elif rule.kind == "float":
+            coerced, bad = _coerce_float(col, present)
+        elif rule.kind == "int":
+            coerced, bad = _coerce_int(col, present)
+        elif rule.kind == "bool":
+            coerced, bad = _coerce_bool(col, present)
+        elif rule.kind == "datetime":
+            coerced, bad = _coerce_datetime(col, present)
+        elif rule.kind == "date":
+            coerced, bad = _coerce_date(col, present)
+        elif rule.kind == "literal":
+            coerced, bad = _coerce_literal(col, present, rule.allowed)
+        else:
+            coerced, bad = _coerce_complex(col, present, rule.annotation)
+        out[rule.name] = coerced
+        if bad.any():
+            failures.append((rule.name, f"invalid-{rule.kind}", bad))
+            invalid |= bad
+        if rule.required:
+            missing = ~present
+            if missing.any():
+                failures.append((rule.name, "missing-value", missing))
+                invalid |= missing
+
+    errors: list[RowError] = []
+    for name, reason, mask in failures:
+        values = df[name] if name in df.columns else None
+        for idx in mask[mask].index:
+            errors.append(RowError(
+                row=idx,
+                field=name,
+                reason=reason,
+                value=None if values is None else values.at[idx],
+            ))
+    return ValidationResult(frame=out[~invalid], errors=errors, rows_checked=len(df))
+
+
+def report_validation(label: str, result: ValidationResult, rejects_path: str | None = None, *, limit: int = 20) -> None:
+    """Log a summary of rejected rows and optionally append them to a CSV file."""
+    if not result.errors:
+        return
+    logger = get_logger()
+    logger.warning(
+        "validation rejected label=%s rows=%d of=%d errors=%d",
+        label,
+        result.rows_rejected,
+        result.rows_checked,
+        len(result.errors),
+    )
+    for err in result.errors[:limit]:
+        logger.warning(
+            "validation error label=%s row=%s field=%s reason=%s value=%r",
+            label,
+            err.row,
+            err.field,
+            err.reason,
+            err.value,
+        )
+    if rejects_path:
+        frame = pd.DataFrame(
+            [{"label": label, "row": e.row, "field": e.field, "reason": e.reason, "value": e.value} for e in result.errors]
+        )
+        frame.to_csv(rejects_path, mode="a", header=not os.path.exists(rejects_path), index=False)
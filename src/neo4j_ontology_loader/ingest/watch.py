@@ -0,0 +1,435 @@
+"""Watch-folder ingestion: coalesce arriving feed files into micro-batches per label.
+
+A long-running ``FolderWatcher`` keeps one pooled driver and the loaded
+schema, and picks up files dropped into a directory (woken by inotify on
+Linux, polling elsewhere). Each file is routed to a label by its name,
+prepared chunk by chunk with the route's ``ChunkPlan`` and buffered per
+label; a label's buffer is written through ``ingest_nodes`` once it holds
+``batch_rows`` rows (throughput target) or its oldest file has waited
+``max_latency`` seconds (latency target).
+
+Processing is at-least-once: a file is recorded in the journal only after
+all of its rows are written, so files interrupted by a crash or a failed
+write are read again later; MERGE on the key makes the replay harmless.
+Files that cannot be read after ``max_attempts`` tries are recorded as
+failed and left alone. A file is identified by name, size and mtime, so a
+file replaced under the same name is loaded again.
+
+Producers should write files under a temporary name (``.tmp``/``.part``
+suffix or a leading dot) and rename them when complete; other files are
+only read once unmodified for ``settle`` seconds.
+"""
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import fnmatch
+import json
+import os
+import select
+import sys
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, Iterator
+
+from neo4j import Driver
+from neo4j.exceptions import DriverError, Neo4jError
+
+from neo4j_ontology_loader.ingest.nodes import DEFAULT_BATCH_SIZE, ingest_nodes
+from neo4j_ontology_loader.ingest.prepare import ChunkPlan, native_types, prepare_chunk
+from neo4j_ontology_loader.ingest.rows import RowBatch
+from utils.logging import get_logger
+
+DEFAULT_BATCH_ROWS = 50_000
+DEFAULT_MAX_LATENCY = 5.0
+DEFAULT_SETTLE = 1.0
+DEFAULT_POLL_INTERVAL = 1.0
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_CHUNK_SIZE = 100_000
+JOURNAL_NAME = ".nolo-watch.jsonl"
+# Files still being written by producers that write-then-rename
+IGNORED_SUFFIXES = (".tmp", ".part", ".partial")
+# Longest wait between retries while the database is unavailable
+MAX_BACKOFF = 60.0
+
+FlushCallback = Callable[[str, int, int, float], None]
+
+
+@dataclass(frozen=True)
+class WatchedFile:
+    name: str
+    path: str
+    size: int
+    mtime_ns: int
+
+
+@dataclass(frozen=True)
+class Route:
+    """Files whose name matches ``pattern`` (fnmatch) are prepared with ``plan``."""
+
+    pattern: str
+    plan: ChunkPlan
+
+    def matches(self, name: str) -> bool:
+        return fnmatch.fnmatchcase(name, self.pattern)
+
+
+def label_route(pattern: str, label: str, key: str, entity, *, validate: bool = False) -> Route:
+    """Route for a plain label feed keyed by ``key`` (as ``load-nodes`` loads it)."""
+    return Route(pattern, ChunkPlan(label=label, key=key, validate=validate, types=native_types(entity)))
+
+
+def szkb_routes(schema, *, validate: bool = False) -> list[Route]:
+    """Routes for SZKB feeds by file name prefix (``quotes*``, ``cross_rates*``, ...)."""
+    from neo4j_ontology_loader.schema.szkb_specs import get_szkb_node_specs
+
+    specs = sorted(get_szkb_node_specs(), key=lambda spec: len(spec.source), reverse=True)
+    return [Route(f"{spec.source}*", spec.chunk_plan(schema.entity(spec.label), validate=validate)) for spec in specs]
+
+
+class FileJournal:
+    """Append-only JSON-lines record of the files already ingested (or given up on)."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._entries: dict[str, tuple[int, int, str]] = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # A torn last line from a crash; the file is simply read again
+                        continue
+                    self._entries[entry["name"]] = (entry["size"], entry["mtime_ns"], entry["status"])
+
+    def seen(self, f: WatchedFile) -> bool:
+        entry = self._entries.get(f.name)
+        return entry is not None and entry[:2] == (f.size, f.mtime_ns)
+
+    def status(self, name: str) -> str | None:
+        entry = self._entries.get(name)
+        return entry[2] if entry is not None else None
+
+    def record(self, files: Iterable[WatchedFile], status: str = "done") -> None:
+        files = list(files)
+        if not files:
+            return
+        with open(self.path, "a", encoding="utf-8") as out:
+            for f in files:
+                out.write(json.dumps({"name": f.name, "size": f.size, "mtime_ns": f.mtime_ns, "status": status}) + "\n")
+            out.flush()
+            os.fsync(out.fileno())
+        for f in files:
+            self._entries[f.name] = (f.size, f.mtime_ns, status)
+
+    def compact(self, present: set[str]) -> None:
+        """Rewrite the journal without entries of files that no longer exist."""
+        self._entries = {name: entry for name, entry in self._entries.items() if name in present}
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as out:
+            for name, (size, mtime_ns, status) in self._entries.items():
+                out.write(json.dumps({"name": name, "size": size, "mtime_ns": mtime_ns, "status": status}) + "\n")
+            out.flush()
+            os.fsync(out.fileno())
+        os.replace(tmp, self.path)
+
+
+class _InotifyWaiter:
+    """Blocks until a file is closed after writing or moved into the directory (Linux)."""
+
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_TO = 0x00000080
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+
+    def __init__(self, directory: str):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        fd = libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        if libc.inotify_add_watch(fd, os.fsencode(directory), self.IN_CLOSE_WRITE | self.IN_MOVED_TO) < 0:
+            errno = ctypes.get_errno()
+            os.close(fd)
+            raise OSError(errno, f"inotify_add_watch failed for {directory}")
+        self.fd = fd
+
+    def wait(self, timeout: float) -> None:
+        ready, _, _ = select.select([self.fd], [], [], max(timeout, 0.0))
+        if ready:
+            # Drain the events; the directory is rescanned either way
+            try:
+                while os.read(self.fd, 65536):
+                    pass
+            except BlockingIOError:
+                pass
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+def directory_waiter(directory: str) -> _InotifyWaiter | None:
+    """An inotify waiter for ``directory``, or None where only polling is available."""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        return _InotifyWaiter(directory)
+    except (OSError, AttributeError) as e:
+        get_logger().info("watch inotify unavailable (%s); polling", e)
+        return None
+
+
+def _chunks(path: str, plan: ChunkPlan, chunk_size: int) -> Iterator:
+    from neo4j_ontology_loader.ingest.arrow_io import is_columnar, iter_record_batches
+    from neo4j_ontology_loader.ingest.pandas_io import iter_csv_chunks
+
+    if is_columnar(path):
+        return iter_record_batches(path, plan.read_columns())
+    return iter_csv_chunks(path, chunk_size, dtype=plan.csv_dtypes())
+
+
+@dataclass
+class WatchStats:
+    files: int = 0
+    rows: int = 0
+    batches: int = 0
+    failed_files: int = 0
+    # Rows without a key (or dropped by a feed's row mapping)
+    skipped_rows: int = 0
+
+
+@dataclass
+class _Pending:
+    key: str
+    parts: list[RowBatch] = field(default_factory=list)
+    rows: int = 0
+    # Files whose rows are all in this batch (or were written by an earlier flush)
+    files: list[WatchedFile] = field(default_factory=list)
+    # When the oldest file in the batch was picked up (time.monotonic)
+    since: float | None = None
+
+
+class FolderWatcher:
+    """Ingest files dropped into ``directory`` in micro-batches per label."""
+
+    def __init__(
+        self,
+        driver: Driver,
+        directory: str,
+        routes: list[Route],
+        *,
+        journal_path: str | None = None,
+        batch_rows: int = DEFAULT_BATCH_ROWS,
+        max_latency: float = DEFAULT_MAX_LATENCY,
+        settle: float = DEFAULT_SETTLE,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        inotify: bool = True,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        write_batch_size: int = DEFAULT_BATCH_SIZE,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        rejects: str | None = None,
+        on_flush: FlushCallback | None = None,
+    ):
+        self.driver = driver
+        self.directory = directory
+        self.routes = routes
+        self.journal = FileJournal(journal_path or os.path.join(directory, JOURNAL_NAME))
+        self.batch_rows = batch_rows
+        self.max_latency = max_latency
+        self.settle = settle
+        self.poll_interval = poll_interval
+        self.inotify = inotify
+        self.chunk_size = chunk_size
+        self.write_batch_size = write_batch_size
+        self.max_attempts = max_attempts
+        self.rejects = rejects
+        self.on_flush = on_flush
+        self.stats = WatchStats()
+        self._pending: dict[str, _Pending] = {}
+        self._attempts: dict[str, int] = defaultdict(int)
+        self._unrouted: set[str] = set()
+
+    def route(self, name: str) -> Route | None:
+        for route in self.routes:
+            if route.matches(name):
+                return route
+        return None
+
+    def _queued(self) -> set[str]:
+        return {f.name for pending in self._pending.values() for f in pending.files}
+
+    def ready_files(self) -> list[WatchedFile]:
+        """Files not yet ingested that have been left unmodified for ``settle`` seconds, oldest first."""
+        now = time.time()
+        queued = self._queued()
+        files: list[WatchedFile] = []
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                name = entry.name
+                if name.startswith(".") or name.endswith(IGNORED_SUFFIXES) or name in queued:
+                    continue
+                if not entry.is_file():
+                    continue
+                st = entry.stat()
+                f = WatchedFile(name, entry.path, st.st_size, st.st_mtime_ns)
+                if self.journal.seen(f) or now - st.st_mtime_ns / 1e9 < self.settle:
+                    continue
+                files.append(f)
+        return sorted(files, key=lambda f: (f.mtime_ns, f.name))
+
+    def _add(self, plan: ChunkPlan, parts: list[RowBatch], rows: int) -> _Pending:
+        pending = self._pending.setdefault(plan.label, _Pending(key=plan.key))
+        if pending.since is None:
+            pending.since = time.monotonic()
+        pending.parts.extend(parts)
+        pending.rows += rows
+        return pending
+
+    def _read(self, f: WatchedFile, plan: ChunkPlan) -> None:
+        # A file's rows are collected here and join the label's batch when the
+        # file is read to the end, or earlier when they fill the batch: a large
+        # file is then flushed mid-file. A file that fails after such a flush
+        # is read again from the start, so its first rows are written again
+        # (at least once; MERGE makes the replay harmless) but never buffered twice
+        parts: list[RowBatch] = []
+        rows = skipped = 0
+        validations = []
+        for chunk in _chunks(f.path, plan, self.chunk_size):
+            part = prepare_chunk(chunk, plan)
+            if part.validation is not None:
+                validations.append(part.validation)
+            skipped += part.skipped
+            if len(part.rows):
+                parts.append(part.rows)
+                rows += len(part.rows)
+            pending = self._pending.get(plan.label)
+            if rows + (pending.rows if pending is not None else 0) >= self.batch_rows:
+                # A large file is written as it is read; it is recorded once its last rows are written
+                self._add(plan, parts, rows)
+                parts, rows = [], 0
+                self.flush(plan.label)
+        if validations:
+            from neo4j_ontology_loader.ingest.validation import report_validation
+
+            for validation in validations:
+                report_validation(plan.label, validation, self.rejects)
+        self.stats.skipped_rows += skipped
+        self._add(plan, parts, rows).files.append(f)
+        self.stats.files += 1
+
+    def poll_once(self) -> int:
+        """Read the ready files into their labels' batches; return the number of files read.
+
+        Write errors propagate (the batches are kept for the next attempt);
+        files that fail to read are retried up to ``max_attempts`` times.
+        """
+        read = 0
+        for f in self.ready_files():
+            route = self.route(f.name)
+            if route is None:
+                if f.name not in self._unrouted:
+                    self._unrouted.add(f.name)
+                    get_logger().warning("watch skip file=%s reason=no-route", f.name)
+                continue
+            pending = self._pending.get(route.plan.label)
+            if pending is not None and pending.rows >= self.batch_rows:
+                # The label's last write failed; read no more of it until that batch is written
+                continue
+            try:
+                self._read(f, route.plan)
+            except (Neo4jError, DriverError):
+                raise
+            except Exception as e:
+                self._attempts[f.name] += 1
+                attempts = self._attempts[f.name]
+                get_logger().error("watch read failed file=%s attempt=%d error=%s", f.name, attempts, e)
+                if attempts >= self.max_attempts:
+                    self.journal.record([f], status="failed")
+                    self.stats.failed_files += 1
+                    del self._attempts[f.name]
+                continue
+            self._attempts.pop(f.name, None)
+            read += 1
+            if self._pending[route.plan.label].rows >= self.batch_rows:
+                self.flush(route.plan.label)
+        return read
+
+    def flush(self, label: str) -> None:
+        """Write the buffered rows of ``label``, then record its complete files."""
+        pending = self._pending.get(label)
+        if pending is None:
+            return
+        start = time.perf_counter()
+        # Rows of files with the same columns are written together (missing values must not unset properties)
+        groups: dict[tuple[str, ...], list[RowBatch]] = defaultdict(list)
+        for part in pending.parts:
+            groups[part.columns].append(part)
+        for parts in groups.values():
+            ingest_nodes(
+                self.driver, label=label, key=pending.key, rows=RowBatch.concat(parts),
+                batch_size=self.write_batch_size,
+            )
+        self.journal.record(pending.files)
+        del self._pending[label]
+        seconds = time.perf_counter() - start
+        self.stats.rows += pending.rows
+        self.stats.batches += 1
+        get_logger().info(
+            "watch flush label=%s files=%d rows=%d seconds=%.2f", label, len(pending.files), pending.rows, seconds
+        )
+        if self.on_flush:
+            self.on_flush(label, len(pending.files), pending.rows, seconds)
+
+    def flush_due(self, *, force: bool = False) -> None:
+        """Flush the labels whose oldest file has waited ``max_latency`` (all with ``force``)."""
+        now = time.monotonic()
+        for label, pending in list(self._pending.items()):
+            if force or (pending.since is not None and now - pending.since >= self.max_latency):
+                self.flush(label)
+
+    def _timeout(self) -> float:
+        # Wake up in time for the next latency deadline
+        deadlines = [p.since + self.max_latency for p in self._pending.values() if p.since is not None]
+        if not deadlines:
+            return self.poll_interval
+        return max(0.0, min(self.poll_interval, min(deadlines) - time.monotonic()))
+
+    def run(self, stop: threading.Event | None = None, *, once: bool = False) -> WatchStats:
+        """Process files until ``stop`` is set (or, with ``once``, until no ready file is left).
+
+        Pending batches are flushed before returning.
+        """
+        stop = stop or threading.Event()
+        logger = get_logger()
+        self.journal.compact(set(os.listdir(self.directory)))
+        waiter = directory_waiter(self.directory) if self.inotify and not once else None
+        backoff = 0.0
+        try:
+            while not stop.is_set():
+                try:
+                    read = self.poll_once()
+                    self.flush_due(force=once and not read)
+                    backoff = 0.0
+                except (Neo4jError, DriverError) as e:
+                    backoff = min(max(backoff * 2, self.poll_interval), MAX_BACKOFF)
+                    logger.warning("watch write failed error=%s; retrying in %.0fs", e, backoff)
+                    stop.wait(backoff)
+                    continue
+                if once and not read and not self._pending:
+                    break
+                timeout = self._timeout()
+                if waiter is not None:
+                    waiter.wait(timeout)
+                elif not once:
+                    stop.wait(timeout)
+        finally:
+            if waiter is not None:
+                waiter.close()
+            try:
+                self.flush_due(force=True)
+            except (Neo4jError, DriverError) as e:
+                # Not recorded, so these files are read again on the next start
+                logger.error("watch final flush failed error=%s", e)
+        return self.stats
@@ -1,7 +1,13 @@
+from datetime import datetime
+
 from pydantic import BaseModel, Field
 
+from neo4j_ontology_loader.schema.registry import register_entity
+
 
+@register_entity
 class CrossCurrencyRate(BaseModel):
     currency: str = Field(..., description="Currency code (e.g., CHF, USD, OPL)")
     cross_rate: float = Field(..., description="Cross rate value against base (likely CHF)")
-    date: str = Field(..., description="Timestamp of the rate in ISO-8601")
+    # Stored as a native DateTime (UTC) so that as-of lookups are index range seeks
+    date: datetime = Field(..., description="Timestamp of the rate (ISO-8601 in the feed)")
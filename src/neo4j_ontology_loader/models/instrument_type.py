@@ -1,6 +1,9 @@
 from pydantic import BaseModel, Field, ConfigDict
 
+from neo4j_ontology_loader.schema.registry import register_entity
 
+
+@register_entity
 class InstrumentType(BaseModel):
     id: str = Field(
         ..., description="Unique identifier for the instrument type", json_schema_extra={"unique": True}
@@ -1,5 +1,8 @@
 from pydantic import BaseModel, Field
 
+from neo4j_ontology_loader.schema.registry import register_entity
+
+@register_entity
 class Issuer(BaseModel):
     lei: str = Field(..., description="Legal Entity Identifier", json_schema_extra={"unique": True})
     legal_name: str
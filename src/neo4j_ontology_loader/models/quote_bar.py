@@ -0,0 +1,24 @@
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+from neo4j_ontology_loader.schema.registry import register_entity
+
+
+@register_entity
+class QuoteBar(BaseModel):
+    # OHLC rollup of the quotes of one listing over one period, maintained while loading quotes
+    id: str = Field(
+        ..., description="<instrument_id>/<listing_id>:<period>:<period_start>", json_schema_extra={"unique": True}
+    )
+    instrument_id: str = Field(..., description="Instrument identifier of the aggregated quotes")
+    listing_id: str = Field(..., description="Listing identifier of the aggregated quotes")
+    period: Literal["day", "week", "month"]
+    period_start: str = Field(..., description="First day of the period in ISO-8601 (weeks start on Monday)")
+    open: float
+    high: float
+    low: float
+    close: float
+    count: int = Field(..., description="Number of quotes aggregated into the bar")
+    first_quote_date: str = Field(..., description="Timestamp of the opening quote")
+    last_quote_date: str = Field(..., description="Timestamp of the closing quote")
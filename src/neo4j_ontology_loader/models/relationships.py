@@ -55,3 +55,11 @@ class QuoteOfListing(BaseModel):
     source_listing_id: str
     # Listing (to) identified by its id
     target_id: str
+
+
+# QuoteBar -> Listing
+class BarOfListing(BaseModel):
+    # QuoteBar (from) identified by its id
+    source_id: str
+    # Listing (to) identified by its id (<instrument_id>/<trading_place_id>)
+    target_id: str
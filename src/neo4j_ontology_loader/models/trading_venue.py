@@ -1,5 +1,8 @@
 from pydantic import BaseModel, Field
 
+from neo4j_ontology_loader.schema.registry import register_entity
+
+@register_entity
 class TradingVenue(BaseModel):
     id: str = Field(..., description="Unique identifier for the trading venue", json_schema_extra={"unique": True})
     legal_name: str
@@ -5,6 +5,8 @@ from typing import Literal, Optional, List
 
 from pydantic import BaseModel, Field
 
+from neo4j_ontology_loader.schema.registry import register_entity, register_object_property
+
 
 class OptionType(Enum):
     CALL = 'call'
@@ -58,22 +60,32 @@ class FinancialInstrumentType(Enum):
     OTHER = 'other'
 
 
+@register_entity
+@register_object_property
 class Currency(BaseModel):
     value: str = Field(..., description='ISO 4217 currency code.')
 
 
+@register_entity
+@register_object_property
 class Date(BaseModel):
     value: str = Field(..., description='Date according to ISO 8601 (YYYY-MM-DD).')
 
 
+@register_entity
+@register_object_property
 class DateTime(BaseModel):
     value: str = Field(..., description='DateTime according to ISO 8601.')
 
 
+@register_entity
+@register_object_property
 class ContractSize(BaseModel):
     value: float = Field(..., description='Contract size of an instrument.')
 
 
+@register_entity
+@register_object_property
 class Price(BaseModel):
     type: Literal['actual', 'percentage'] = Field(...,
                                                   description='Indicates whether the price is an actual currency amount per unit or a percentage.\n')
@@ -81,11 +93,15 @@ class Price(BaseModel):
     currency: Optional[Currency] = Field(None, description='Currency of the price, if applicable.')
 
 
+@register_entity
+@register_object_property
 class CurrencyAmount(BaseModel):
     amount: float = Field(..., description='Signed amount.')
     currency: Currency = Field(..., description='Currency of the amount.')
 
 
+@register_entity
+@register_object_property
 class InterestRate(BaseModel):
     type: Literal['fixed', 'variable', 'staggered'] = Field(...,
                                                             description='Type of interest: - fixed: fixed interest rate - variable: floating rate based on a benchmark - staggered: rate set at different levels for different periods\n')
@@ -99,6 +115,8 @@ class InterestRate(BaseModel):
     spread: Optional[float] = Field(None, description='Spread added to the base rate (basis) for floating rates.\n')
 
 
+@register_entity
+@register_object_property
 class FinancialInstrumentIdentification(BaseModel):
     identifier: str = Field(..., description='Instrument identification string.')
     type: Literal[
@@ -106,21 +124,28 @@ class FinancialInstrumentIdentification(BaseModel):
         ..., description='Type of instrument identifier (ISIN preferred, but other schemes are possible).\n')
 
 
+@register_entity
+@register_object_property
 class Shorttext(BaseModel):
     language: Literal['en', 'de', 'fr', 'it'] = Field(..., description='Language of the short name.')
     value: str = Field(..., description='Short text in the specified language.')
 
 
+@register_entity
+@register_object_property
 class Longtext(BaseModel):
     language: Literal['en', 'de', 'fr', 'it'] = Field(..., description='Language of the long name.')
     value: str = Field(..., description='Long narrative text in the specified language.')
 
 
+@register_entity
+@register_object_property
 class CfiCode(BaseModel):
     value: str = Field(...,
                        description='Classification of financial instrument (CFI) code according to ISO 10962. At least the CFI Category (1st char) and Group (2nd char) must be present.\n')
 
 
+@register_entity(abstract=True)
 class FinancialInstrument(BaseModel):
     type: FinancialInstrumentType = Field(..., description='Type discriminator for the financial instrument.')
     name: Longtext = Field(..., description='Name of the financial instrument in free text.')
@@ -138,6 +163,7 @@ class FinancialInstrument(BaseModel):
 
 # ---- Equity-specific embedded types ----
 
+@register_object_property
 class DividendPolicy(BaseModel):
     frequency: Optional[Literal['annual', 'semiAnnual', 'quarterly', 'monthly', 'irregular']] = Field(
         None, description='Typical frequency of dividend payments.'
@@ -151,6 +177,7 @@ class DividendPolicy(BaseModel):
     )
 
 
+@register_object_property
 class KeyFigures(BaseModel):
     marketCap: Optional[CurrencyAmount] = Field(None, description='Market capitalization.')
     sharesOutstanding: Optional[float] = Field(None, description='Number of shares outstanding.')
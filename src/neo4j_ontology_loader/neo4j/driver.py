@@ -1,8 +1,84 @@
+import threading
+
 from neo4j import GraphDatabase, Driver
-from neo4j_ontology_loader.config import settings
+from neo4j_ontology_loader.config import Settings, settings
+
+
+def driver_config(config: Settings) -> dict:
+    """Keyword arguments for GraphDatabase.driver derived from settings.
+
+    ``database`` and ``fetch_size`` become the defaults of every session
+    opened on the driver.
+    """
+    kwargs = dict(
+        max_connection_pool_size=config.neo4j_max_connection_pool_size,
+        connection_acquisition_timeout=config.neo4j_connection_acquisition_timeout,
+        connection_timeout=config.neo4j_connection_timeout,
+        max_connection_lifetime=config.neo4j_max_connection_lifetime,
+        fetch_size=config.neo4j_fetch_size,
+        max_transaction_retry_time=config.neo4j_max_transaction_retry_time,
+        keep_alive=config.neo4j_keep_alive,
+    )
+    if config.neo4j_database:
+        kwargs["database"] = config.neo4j_database
+    return kwargs
+
 
-def create_driver() -> Driver:
-    return GraphDatabase.driver(
-        settings.neo4j_uri,
-        auth=(settings.neo4j_user, settings.neo4j_password),
+def create_driver(config: Settings | None = None) -> Driver:
+    config = config or settings
+    driver = GraphDatabase.driver(
+        config.neo4j_uri,
+        auth=(config.neo4j_user, config.neo4j_password),
+        **driver_config(config),
     )
+    if config.neo4j_warm_up:
+        try:
+            driver.verify_connectivity()
+        except Exception:
+            driver.close()
+            raise
+    return driver
+
+
+_shared_lock = threading.Lock()
+_shared: dict[str, Driver] = {}
+
+
+def shared_driver(config: Settings | None = None) -> Driver:
+    """Return a process-wide pooled driver for ``config``, creating it on first use.
+
+    Reusing one driver keeps its connection pool warm across ingest phases
+    and helper calls. Close with ``close_shared_drivers`` (callers must not
+    close the returned driver themselves).
+    """
+    config = config or settings
+    ident = config.model_dump_json()
+    with _shared_lock:
+        driver = _shared.get(ident)
+        if driver is None:
+            driver = create_driver(config)
+            _shared[ident] = driver
+        return driver
+
+
+def shared_drivers(config: Settings | None, databases) -> dict[str, Driver]:
+    """Shared drivers for several target databases, by database name.
+
+    Each target gets its own driver (and pool), so a slow target cannot take
+    the connections of the others. ``None`` stands for ``config``'s own
+    database and is named after it (or "default" for the home database).
+    """
+    config = config or settings
+    drivers: dict[str, Driver] = {}
+    for database in databases:
+        target = config.with_overrides(neo4j_database=database)
+        drivers[target.neo4j_database or "default"] = shared_driver(target)
+    return drivers
+
+
+def close_shared_drivers() -> None:
+    with _shared_lock:
+        drivers = list(_shared.values())
+        _shared.clear()
+    for driver in drivers:
+        driver.close()
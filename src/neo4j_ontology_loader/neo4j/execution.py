@@ -0,0 +1,218 @@
+"""Unified execution layer for write transactions.
+
+All writes run as explicit transactions under a single retry loop:
+``run_write`` retries transient failures (deadlocks, leader switches, lost
+connections) with jittered exponential backoff and records
+attempts/retries/failures per error class in ``WriteMetrics``. The driver's
+managed ``execute_write`` is not used, as its own retries (for up to
+``max_transaction_retry_time``) would stack with these. ``RetryPolicy``
+alone bounds how long a failing unit of work is retried: at most
+``max_attempts`` attempts, with backoffs capped at ``max_delay`` (the
+default sleeps under 10s in total before giving up).
+
+Units of work must be idempotent: every loader write is a MERGE keyed by
+the node key (or both endpoint keys) followed by ``SET +=``, so replaying a
+batch after a failed commit converges to the same graph.
+
+Statements that batch themselves (``CALL { ... } IN TRANSACTIONS``, e.g.
+server-side ``LOAD CSV``) must run as auto-commit queries and go through
+``run_autocommit`` instead.
+"""
+from __future__ import annotations
+
+import random
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from neo4j import Driver
+from neo4j.exceptions import (
+    DriverError,
+    Neo4jError,
+    ServiceUnavailable,
+    SessionExpired,
+    TransientError,
+)
+
+from utils.logging import get_logger
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    max_attempts: int = 6
+    initial_delay: float = 0.2
+    max_delay: float = 10.0
+    multiplier: float = 2.0
+    # Fraction of the delay that is randomized (+/-) to avoid retry storms
+    jitter: float = 0.5
+
+    def delay(self, attempt: int) -> float:
+        """Backoff before retry number ``attempt`` (1-based)."""
+        base = min(self.max_delay, self.initial_delay * self.multiplier ** (attempt - 1))
+        return max(0.0, base * (1.0 + random.uniform(-self.jitter, self.jitter)))
+
+
+DEFAULT_RETRY_POLICY = RetryPolicy()
+
+
+def error_class(error: BaseException) -> str:
+    """Short metric key: the Neo4j status code when present, else the exception type."""
+    code = getattr(error, "code", None)
+    return code or type(error).__name__
+
+
+def is_retryable(error: BaseException) -> bool:
+    if isinstance(error, (TransientError, ServiceUnavailable, SessionExpired)):
+        return True
+    if isinstance(error, (Neo4jError, DriverError)):
+        try:
+            return bool(error.is_retryable())
+        except (AttributeError, TypeError):
+            return False
+    return False
+
+
+@dataclass
+class WriteMetrics:
+    """Thread-safe counters for write units of work."""
+    units: int = 0
+    rows: int = 0
+    # Failed attempts of a unit of work
+    attempt_errors: Counter = field(default_factory=Counter)
+    # Errors that escaped the driver and were retried by run_write
+    retries: Counter = field(default_factory=Counter)
+    # Errors that were given up on
+    failures: Counter = field(default_factory=Counter)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def record_success(self, rows: int) -> None:
+        with self._lock:
+            self.units += 1
+            self.rows += rows
+
+    def record(self, counter: str, error: BaseException) -> None:
+        with self._lock:
+            getattr(self, counter)[error_class(error)] += 1
+
+    def summary(self) -> str:
+        with self._lock:
+            return (
+                f"units={self.units} rows={self.rows} "
+                f"attempt_errors={dict(self.attempt_errors)} retries={dict(self.retries)} failures={dict(self.failures)}"
+            )
+
+
+# Process-wide metrics used when callers do not pass their own
+write_metrics = WriteMetrics()
+
+
+def run_write(
+    driver: Driver,
+    work: Callable[..., Any],
+    *args: Any,
+    rows: int = 0,
+    policy: RetryPolicy | None = None,
+    metrics: WriteMetrics | None = None,
+    **kwargs: Any,
+) -> Any:
+    """Run ``work(tx, *args, **kwargs)`` in a write transaction and commit it, with retries.
+
+    ``work`` must consume its results, as they are not available after the
+    commit. ``rows`` is only used for metrics. Non-retryable errors are
+    raised immediately; retryable ones after ``policy.max_attempts``
+    attempts.
+    """
+    policy = policy or DEFAULT_RETRY_POLICY
+    metrics = metrics or write_metrics
+    logger = get_logger()
+
+    def instrumented(tx, *a, **kw):
+        try:
+            return work(tx, *a, **kw)
+        except Exception as e:
+            metrics.record("attempt_errors", e)
+            raise
+
+    attempt = 1
+    while True:
+        try:
+            with driver.session() as session, session.begin_transaction() as tx:
+                result = instrumented(tx, *args, **kwargs)
+                tx.commit()
+            metrics.record_success(rows)
+            return result
+        except Exception as e:
+            if not is_retryable(e) or attempt >= policy.max_attempts:
+                metrics.record("failures", e)
+                raise
+            delay = policy.delay(attempt)
+            metrics.record("retries", e)
+            logger.warning(
+                "write retry attempt=%d/%d error=%s delay=%.2fs",
+                attempt,
+                policy.max_attempts,
+                error_class(e),
+                delay,
+            )
+            time.sleep(delay)
+            attempt += 1
+
+
+def run_statement(
+    driver: Driver,
+    cypher: str,
+    parameters: dict | None = None,
+    *,
+    rows: int = 0,
+    policy: RetryPolicy | None = None,
+    metrics: WriteMetrics | None = None,
+) -> list[dict]:
+    """Run a single write statement through ``run_write`` and return its records as dicts."""
+    def work(tx, query: str, params: dict) -> list[dict]:
+        return [record.data() for record in tx.run(query, params)]
+
+    return run_write(driver, work, cypher, parameters or {}, rows=rows, policy=policy, metrics=metrics)
+
+
+def run_autocommit(
+    driver: Driver,
+    cypher: str,
+    parameters: dict | None = None,
+    *,
+    policy: RetryPolicy | None = None,
+    metrics: WriteMetrics | None = None,
+):
+    """Run a self-batching statement (``CALL { ... } IN TRANSACTIONS``) as an auto-commit query.
+
+    Such statements cannot run inside a managed transaction, so the driver
+    does not retry them; the whole statement is retried here instead, which
+    is safe as long as it is idempotent (MERGE-based). Returns the result
+    summary.
+    """
+    policy = policy or DEFAULT_RETRY_POLICY
+    metrics = metrics or write_metrics
+    logger = get_logger()
+    attempt = 1
+    while True:
+        try:
+            with driver.session() as session:
+                summary = session.run(cypher, parameters or {}).consume()
+            metrics.record_success(0)
+            return summary
+        except Exception as e:
+            if not is_retryable(e) or attempt >= policy.max_attempts:
+                metrics.record("failures", e)
+                raise
+            delay = policy.delay(attempt)
+            metrics.record("retries", e)
+            logger.warning(
+                "auto-commit retry attempt=%d/%d error=%s delay=%.2fs",
+                attempt,
+                policy.max_attempts,
+                error_class(e),
+                delay,
+            )
+            time.sleep(delay)
+            attempt += 1
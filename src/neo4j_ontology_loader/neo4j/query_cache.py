@@ -0,0 +1,139 @@
+"""Opt-in read-through cache for small, hot query results.
+
+Ontology metadata (``Entity``, ``PropertyDefinition``, ``RelType``) and
+reference sets (InstrumentType, TradingVenue) are read over and over but
+change only when the loader writes them. ``run_query(..., cache=True)``
+serves such reads from an in-process LRU with a TTL and a size cap; the
+loader's write paths call ``invalidate_labels`` for the labels they touch,
+so cached reads are dropped as soon as this process changes them. Writes
+made by other processes are only picked up after the TTL.
+"""
+from __future__ import annotations
+
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Iterable
+
+# Labels in node patterns: (n:Label), (:Label:Other), (n:`Odd Label`)
+_LABEL_RE = re.compile(r"\(\s*\w*\s*((?::\s*(?:`[^`]+`|\w+)\s*)+)")
+_LABEL_PART_RE = re.compile(r"`([^`]+)`|(\w+)")
+_WRITE_RE = re.compile(r"\b(CREATE|MERGE|SET|DELETE|REMOVE|DROP|LOAD\s+CSV|FOREACH)\b", re.IGNORECASE)
+_STRING_RE = re.compile(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"")
+
+
+def normalize_query(query: str) -> str:
+    """Collapse whitespace so formatting differences share a cache entry."""
+    return " ".join(query.split())
+
+
+def query_labels(query: str) -> frozenset[str]:
+    """Labels referenced in the node patterns of ``query``."""
+    labels: set[str] = set()
+    for match in _LABEL_RE.finditer(_STRING_RE.sub("''", query)):
+        for quoted, plain in _LABEL_PART_RE.findall(match.group(1)):
+            labels.add(quoted or plain)
+    return frozenset(labels)
+
+
+def is_read_only(query: str) -> bool:
+    return _WRITE_RE.search(_STRING_RE.sub("''", query)) is None
+
+
+@dataclass
+class _Entry:
+    rows: tuple[dict, ...]
+    labels: frozenset[str]
+    expires: float
+
+
+@dataclass
+class QueryCache:
+    """Thread-safe LRU of query results with per-entry TTL and label tags."""
+    max_entries: int = 1024
+    ttl: float = 300.0
+    # Larger results are not cached (they are not the hot, small lookups this is for)
+    max_rows: int = 10_000
+    hits: int = 0
+    misses: int = 0
+    _entries: "OrderedDict[str, _Entry]" = field(default_factory=OrderedDict, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    @staticmethod
+    def key(query: str, parameters: dict | None, database: str | None) -> str:
+        params = json.dumps(parameters or {}, sort_keys=True, default=str)
+        return f"{database or ''}\x00{normalize_query(query)}\x00{params}"
+
+    def get(self, key: str) -> list[dict] | None:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.expires <= now:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            rows = entry.rows
+        # Callers may mutate what they get back
+        return [dict(row) for row in rows]
+
+    def put(self, key: str, rows: list[dict], labels: Iterable[str]) -> None:
+        if len(rows) > self.max_rows or self.max_entries <= 0:
+            return
+        entry = _Entry(
+            rows=tuple(dict(row) for row in rows),
+            labels=frozenset(labels),
+            expires=time.monotonic() + self.ttl,
+        )
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, labels: Iterable[str]) -> int:
+        """Drop entries reading any of ``labels`` (and entries with unknown labels)."""
+        labels = frozenset(labels)
+        with self._lock:
+            stale = [k for k, e in self._entries.items() if not e.labels or e.labels & labels]
+            for key in stale:
+                del self._entries[key]
+        return len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_cache_lock = threading.Lock()
+_cache: QueryCache | None = None
+
+
+def query_cache() -> QueryCache:
+    """The process-wide cache, created on first use from settings."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            from neo4j_ontology_loader.config import settings
+
+            _cache = QueryCache(max_entries=settings.query_cache_size, ttl=settings.query_cache_ttl)
+        return _cache
+
+
+def invalidate_labels(labels: Iterable[str]) -> None:
+    """Drop cached reads of ``labels``; a no-op when the cache was never used."""
+    if _cache is not None:
+        _cache.invalidate(labels)
+
+
+def clear_query_cache() -> None:
+    if _cache is not None:
+        _cache.clear()
@@ -1,31 +1,42 @@
 from __future__ import annotations
 
 from contextlib import contextmanager
-from typing import Iterator, Optional
+from typing import TYPE_CHECKING, Iterator, Optional
 
 from neo4j import Driver, Session
 
-from .driver import create_driver
+from .driver import shared_driver
+from .query_cache import QueryCache, invalidate_labels, is_read_only, query_cache, query_labels
+
+if TYPE_CHECKING:
+    import pandas as pd
+    import pyarrow as pa
 
 
 @contextmanager
-def get_session(driver: Optional[Driver] = None, *, database: Optional[str] = None) -> Iterator[Session]:
+def get_session(
+    driver: Optional[Driver] = None,
+    *,
+    database: Optional[str] = None,
+    fetch_size: Optional[int] = None,
+) -> Iterator[Session]:
     """
     Context manager that yields a Neo4j Session.
 
-    If no Driver is provided, a temporary Driver will be created from settings
-    and closed automatically when the context exits.
+    If no Driver is provided, the process-wide pooled driver for the current
+    settings is used (see ``shared_driver``), so repeated helper calls reuse
+    its connections instead of opening a new driver each time.
     """
-    owns_driver = False
     if driver is None:
-        driver = create_driver()
-        owns_driver = True
-    try:
-        with driver.session(database=database) as session:
-            yield session
-    finally:
-        if owns_driver:
-            driver.close()
+        driver = shared_driver()
+    # Only pass options when given so the driver's configured defaults apply
+    session_kwargs: dict = {}
+    if database is not None:
+        session_kwargs["database"] = database
+    if fetch_size is not None:
+        session_kwargs["fetch_size"] = fetch_size
+    with driver.session(**session_kwargs) as session:
+        yield session
 
 
 def run_query(
@@ -34,11 +45,88 @@ def run_query(
     *,
     database: Optional[str] = None,
     driver: Optional[Driver] = None,
+    cache: bool = False,
 ) -> list[dict]:
     """Run a Cypher query and return a list of records as dicts.
 
-    This is a convenience helper for simple, ad-hoc queries.
+    This is a convenience helper for simple, ad-hoc queries; use
+    ``stream_query`` for large results. With ``cache=True`` read-only
+    queries are served from the read-through cache (see ``query_cache``).
     """
+    cacheable = cache and is_read_only(query)
+    if cacheable:
+        key = QueryCache.key(query, parameters, database)
+        rows = query_cache().get(key)
+        if rows is not None:
+            return rows
     with get_session(driver, database=database) as session:
         result = session.run(query, parameters or {})
-        return [record.data() for record in result]
+        rows = [record.data() for record in result]
+    if cacheable:
+        query_cache().put(key, rows, query_labels(query))
+    elif not is_read_only(query):
+        invalidate_labels(query_labels(query))
+    return rows
+
+
+def stream_query(
+    query: str,
+    parameters: Optional[dict] = None,
+    *,
+    database: Optional[str] = None,
+    driver: Optional[Driver] = None,
+    batch_size: Optional[int] = None,
+) -> Iterator:
+    """Lazily yield records as dicts, or lists of up to ``batch_size`` dicts.
+
+    Records are pulled from the server as they are consumed (``batch_size``
+    is also used as the fetch size), so memory stays bounded by one batch.
+    The session stays open until the iterator is exhausted or closed.
+    """
+    with get_session(driver, database=database, fetch_size=batch_size) as session:
+        result = session.run(query, parameters or {})
+        if not batch_size:
+            for record in result:
+                yield record.data()
+            return
+        batch: list[dict] = []
+        for record in result:
+            batch.append(record.data())
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+
+def to_dataframe(
+    query: str,
+    parameters: Optional[dict] = None,
+    *,
+    database: Optional[str] = None,
+    driver: Optional[Driver] = None,
+    expand: bool = False,
+) -> "pd.DataFrame":
+    """Run a query and return the result as a pandas DataFrame (``Result.to_df``).
+
+    With ``expand``, nodes, relationships, lists and maps are flattened into
+    one column per entry.
+    """
+    with get_session(driver, database=database) as session:
+        return session.run(query, parameters or {}).to_df(expand=expand)
+
+
+def to_arrow(
+    query: str,
+    parameters: Optional[dict] = None,
+    *,
+    database: Optional[str] = None,
+    driver: Optional[Driver] = None,
+    expand: bool = False,
+) -> "pa.Table":
+    """Run a query and return the result as a pyarrow Table (requires the ``arrow`` extra)."""
+    from neo4j_ontology_loader.ingest.arrow_io import require_pyarrow
+
+    pa = require_pyarrow()
+    frame = to_dataframe(query, parameters, database=database, driver=driver, expand=expand)
+    return pa.Table.from_pandas(frame, preserve_index=False)
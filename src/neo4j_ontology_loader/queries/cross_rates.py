@@ -0,0 +1,105 @@
+"""Batched as-of lookups of CrossCurrencyRate.
+
+Cross rates are stored per currency with a native ``date`` (DateTime, UTC)
+and indexed on ``(currency, date)`` (see ``install-szkb-ddl``), so "rate
+for CHF as of T" is an index seek for the latest rate at or before T. All
+lookups of a call are sent as one ``UNWIND`` per batch, with duplicates
+sent once.
+
+``cross_rate`` is the value of one unit of the currency in the base
+currency (CHF), which itself has no rate nodes and converts at 1.0.
+"""
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Iterable, Optional
+
+import pandas as pd
+from neo4j import Driver
+
+from neo4j_ontology_loader.neo4j.session import run_query
+
+BASE_CURRENCY = "CHF"
+DEFAULT_BATCH_SIZE = 10_000
+
+
+def cross_rates_as_of() -> str:
+    # $lookups: [{idx, currency, at}]; one row per lookup that has a rate at or before `at`
+    return """
+    UNWIND $lookups AS lookup
+    CALL (lookup) {
+        MATCH (r:CrossCurrencyRate {currency: lookup.currency})
+        WHERE r.date <= lookup.at
+        RETURN r
+        ORDER BY r.date DESC
+        LIMIT 1
+    }
+    RETURN lookup.idx AS idx, r.cross_rate AS rate, r.date AS date
+    """
+
+
+def rates_as_of(
+    lookups: Iterable[tuple[str, datetime | str]],
+    *,
+    base_currency: str = BASE_CURRENCY,
+    driver: Optional[Driver] = None,
+    database: Optional[str] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> list[Optional[float]]:
+    """Latest cross rate at or before each ``(currency, timestamp)``; None where there is none.
+
+    Timestamps may be datetimes or ISO-8601 strings; naive values are UTC.
+    """
+    pairs = list(lookups)
+    if not pairs:
+        return []
+    currencies = [currency for currency, _ in pairs]
+    stamps = pd.to_datetime(pd.Series([at for _, at in pairs], dtype=object), utc=True, format="ISO8601")
+
+    unique: dict[tuple, int] = {}
+    positions = []
+    for currency, ts in zip(currencies, stamps):
+        positions.append(unique.setdefault((currency, ts), len(unique)))
+
+    found: dict[int, float] = {}
+    params = [
+        {"idx": idx, "currency": currency, "at": ts.to_pydatetime()}
+        for (currency, ts), idx in unique.items()
+        if currency != base_currency
+    ]
+    for start in range(0, len(params), batch_size):
+        records = run_query(
+            cross_rates_as_of(), {"lookups": params[start:start + batch_size]}, driver=driver, database=database,
+        )
+        found.update((r["idx"], r["rate"]) for r in records)
+
+    return [
+        1.0 if currency == base_currency else found.get(pos)
+        for currency, pos in zip(currencies, positions)
+    ]
+
+
+def convert_amounts(
+    amounts: Iterable[float],
+    currencies: Iterable[str],
+    timestamps: Iterable[datetime | str],
+    to_currency: str = BASE_CURRENCY,
+    **kwargs,
+) -> list[Optional[float]]:
+    """Convert amounts into ``to_currency`` at the rates valid at each timestamp.
+
+    Source and target rates are resolved in one batched lookup. Amounts
+    whose rates are unknown convert to None. ``kwargs`` go to ``rates_as_of``.
+    """
+    amounts, currencies, timestamps = list(amounts), list(currencies), list(timestamps)
+    n = len(amounts)
+    rates = rates_as_of(
+        list(zip(currencies, timestamps)) + [(to_currency, ts) for ts in timestamps], **kwargs
+    )
+    out: list[Optional[float]] = []
+    for amount, source, target in zip(amounts, rates[:n], rates[n:]):
+        if amount is None or source is None or not target:
+            out.append(None)
+        else:
+            out.append(amount * source / target)
+    return out
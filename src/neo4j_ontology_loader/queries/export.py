@@ -0,0 +1,432 @@
+"""Paged export of the loaded graph to Parquet or CSV files.
+
+Labels, their properties and the relationship types come from the persisted
+ontology (``Entity``/``PropertyDefinition``/``RelType``, see
+``schema.persist``). Every label is read with key-range cursors
+(``WHERE n.id > $last ORDER BY n.id LIMIT $limit``) on the key the loader
+MERGEs it by (``NodeSpec.key``, including the synthetic Quote id), else on
+its unique property (e.g. ``lei`` for Issuer). The MERGE key index (see
+``schema.ddl_advisor``) or the uniqueness constraint serves these as index
+seeks, so each page costs the same however deep into the label it is.
+Labels with neither are paged by ``elementId`` instead (exported as an
+``element_id`` column), which needs a scan per page: a non-unique key would
+skip the rows sharing a page's last value. Large labels are split into key
+ranges that are exported in parallel, each on its own session, and every
+page is appended to the range's part file as it arrives; memory is bounded
+by one page per running session.
+
+Layout of the output directory::
+
+    nodes/<Label>/part-00000.parquet
+    relationships/<From>-<TYPE>-<To>/part-00000.parquet   (from_id, to_id)
+
+Only the key and the properties declared in the ontology are exported, typed as declared
+(values that do not convert are left empty, as in loads); edge lists hold
+the keys of both endpoints. Node keys of a label must be of one type, as
+range predicates do not compare across types.
+"""
+from __future__ import annotations
+
+import csv
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Any, Callable, Iterator
+
+import pandas as pd
+from neo4j import Driver
+
+from neo4j_ontology_loader.neo4j.session import run_query
+from neo4j_ontology_loader.schema.persist import ONTO_NODE, ONTO_PROP, ONTO_REL
+
+DEFAULT_PAGE_SIZE = 50_000
+# Column of the labels paged by elementId, which have no unique property
+ELEMENT_ID = "element_id"
+DEFAULT_SESSIONS = 4
+FORMATS = ("parquet", "csv")
+
+ProgressCallback = Callable[[str, int, float], None]
+
+
+@dataclass(frozen=True)
+class ExportTable:
+    """A label (``kind="node"``) or a relationship type between two labels (``kind="relationship"``)."""
+
+    name: str
+    kind: str
+    label: str
+    # (column, ontology type) in output order, key first
+    columns: tuple[tuple[str, str], ...] = ()
+    # Unique property ``label`` is paged by; None pages by elementId
+    key: str | None = None
+    rel_type: str | None = None
+    to_label: str | None = None
+    to_key: str | None = None
+
+
+@dataclass
+class ExportReport:
+    nodes: int = 0
+    relationships: int = 0
+    seconds: float = 0.0
+    # Exported rows per table and the files written
+    per_target: dict[str, int] = field(default_factory=dict)
+    files: list[str] = field(default_factory=list)
+
+    @property
+    def throughput(self) -> float:
+        total = self.nodes + self.relationships
+        return total / self.seconds if self.seconds else 0.0
+
+
+def _quote(name: str) -> str:
+    return "`" + name.replace("`", "``") + "`"
+
+
+def _identity(var: str, key: str | None) -> str:
+    """Cypher expression identifying the nodes bound to ``var``: their key, else their elementId."""
+    return f"{var}.{_quote(key)}" if key is not None else f"elementId({var})"
+
+
+def _key_column(key: str | None) -> str:
+    return key if key is not None else ELEMENT_ID
+
+
+def loader_keys() -> dict[str, str]:
+    """The key each label is MERGEd by in SZKB loads (``NodeSpec.key``)."""
+    from neo4j_ontology_loader.schema.szkb_specs import get_szkb_node_specs
+
+    return {spec.label: spec.key for spec in get_szkb_node_specs()}
+
+
+def _label_key(properties: list[dict], merge_key: str | None) -> tuple[str | None, str]:
+    """The key a label is paged by and its type: its MERGE key, else a unique property; None without either."""
+    declared = {p["name"]: p["type"] for p in properties}
+    if merge_key is not None:
+        # Synthetic keys (Quote, CrossCurrencyRate) are not declared; they are text
+        return merge_key, declared.get(merge_key, "str")
+    unique = sorted(p["name"] for p in properties if p.get("unique"))
+    if not unique:
+        return None, "str"
+    key = "id" if "id" in unique else unique[0]
+    return key, declared[key]
+
+
+def ontology_tables(
+    driver: Driver, *, labels: list[str] | None = None, keys: dict[str, str] | None = None
+) -> list[ExportTable]:
+    """Node and relationship tables of the persisted ontology, without abstract types.
+
+    ``labels`` restricts the export to these labels and the relationships
+    between them. ``keys`` maps labels to the key they were loaded by
+    (default: ``loader_keys()``).
+    """
+    merge_keys = loader_keys() if keys is None else keys
+    entities = run_query(
+        f"""
+        MATCH (e:{ONTO_NODE}) WHERE NOT coalesce(e.abstract, false)
+        OPTIONAL MATCH (e)-[:HAS_PROPERTY]->(p:{ONTO_PROP})
+        RETURN e.name AS label, collect(p {{.name, .type, .unique}}) AS properties
+        ORDER BY label
+        """,
+        driver=driver,
+    )
+    rels = run_query(
+        f"""
+        MATCH (from:{ONTO_NODE})<-[:FROM]-(r:{ONTO_REL})-[:TO]->(to:{ONTO_NODE})
+        WHERE NOT coalesce(from.abstract, false) AND NOT coalesce(to.abstract, false)
+        RETURN r.name AS type, from.name AS from_label, to.name AS to_label
+        ORDER BY type, from_label, to_label
+        """,
+        driver=driver,
+    )
+    wanted = set(labels) if labels else None
+    label_keys = {row["label"]: _label_key(row["properties"], merge_keys.get(row["label"])) for row in entities}
+    tables: list[ExportTable] = []
+    for row in entities:
+        if wanted is not None and row["label"] not in wanted:
+            continue
+        key, key_type = label_keys[row["label"]]
+        declared = {p["name"]: p["type"] for p in row["properties"]}
+        declared.pop(key, None)
+        columns = ((_key_column(key), key_type),) + tuple(sorted(declared.items()))
+        tables.append(ExportTable(name=row["label"], kind="node", label=row["label"], columns=columns, key=key))
+    for row in rels:
+        if wanted is not None and not {row["from_label"], row["to_label"]} <= wanted:
+            continue
+        (from_key, from_type), (to_key, to_type) = label_keys[row["from_label"]], label_keys[row["to_label"]]
+        tables.append(
+            ExportTable(
+                name=f"{row['from_label']}-{row['type']}-{row['to_label']}",
+                kind="relationship",
+                label=row["from_label"],
+                columns=(("from_id", from_type), ("to_id", to_type)),
+                key=from_key,
+                rel_type=row["type"],
+                to_label=row["to_label"],
+                to_key=to_key,
+            )
+        )
+    return tables
+
+
+def node_page_cypher(
+    label: str, key: str | None, columns: list[str], *, first: bool, lower: bool, upper: bool
+) -> str:
+    """One page of ``label`` in key order, after ``$last`` (or from ``$lower``) and below ``$upper``.
+
+    ``key`` None pages by elementId, returned as the ``element_id`` column.
+    """
+    k = _identity("n", key)
+    conditions = [f"{k} > $last" if not first else f"{k} >= $lower" if lower else f"{k} IS NOT NULL"]
+    if upper:
+        conditions.append(f"{k} < $upper")
+    projection = ", ".join(
+        f"{k if c == _key_column(key) else f'n.{_quote(c)}'} AS {_quote(c)}" for c in columns
+    )
+    return (
+        f"MATCH (n:{_quote(label)}) WHERE {' AND '.join(conditions)} "
+        f"RETURN {projection} ORDER BY {k} LIMIT $limit"
+    )
+
+
+def edge_page_cypher(
+    rel_type: str,
+    from_label: str,
+    to_label: str,
+    key: str | None,
+    to_key: str | None,
+    *,
+    first: bool,
+    lower: bool,
+    upper: bool,
+) -> str:
+    """One page of source nodes in key order, each with the keys of its ``rel_type`` targets."""
+    k = _identity("n", key)
+    conditions = [f"{k} > $last" if not first else f"{k} >= $lower" if lower else f"{k} IS NOT NULL"]
+    if upper:
+        conditions.append(f"{k} < $upper")
+    return (
+        f"MATCH (n:{_quote(from_label)}) WHERE {' AND '.join(conditions)} "
+        f"WITH n ORDER BY {k} LIMIT $limit "
+        f"RETURN {k} AS from_id, "
+        f"[(n)-[:{_quote(rel_type)}]->(m:{_quote(to_label)}) | {_identity('m', to_key)}] AS to_ids"
+    )
+
+
+def key_ranges(session, label: str, key: str | None, partitions: int, min_rows: int) -> list[tuple[Any, Any]]:
+    """Split the keys of ``label`` into up to ``partitions`` ``[lower, upper)`` ranges of similar size.
+
+    Labels with fewer than ``min_rows`` nodes per range are not split.
+    """
+    total = session.run(f"MATCH (n:{_quote(label)}) RETURN count(n) AS c").single()["c"]
+    if partitions <= 1 or total < partitions * max(min_rows, 1):
+        return [(None, None)]
+    step = total // partitions
+    k = _identity("n", key)
+    bounds: list[Any] = []
+    for i in range(1, partitions):
+        record = session.run(
+            f"MATCH (n:{_quote(label)}) WHERE {k} IS NOT NULL "
+            f"WITH {k} AS k ORDER BY k SKIP $skip LIMIT 1 RETURN k",
+            {"skip": i * step},
+        ).single()
+        if record is not None and (not bounds or record["k"] != bounds[-1]):
+            bounds.append(record["k"])
+    edges = [None, *bounds, None]
+    return list(zip(edges[:-1], edges[1:]))
+
+
+def _native(value: Any) -> Any:
+    # neo4j.time values (DateTime, Date, Duration) to their Python equivalents
+    to_native = getattr(value, "to_native", None)
+    return to_native() if to_native is not None else value
+
+
+def _kind(ontology_type: str) -> str:
+    # "float | None" -> "float", as for loads (see ingest.prepare.native_types)
+    return ontology_type.split("|")[0].strip()
+
+
+def _arrow_type(pa, ontology_type: str):
+    return {
+        "str": pa.string(),
+        "int": pa.int64(),
+        "float": pa.float64(),
+        "bool": pa.bool_(),
+        "date": pa.date32(),
+        "datetime": pa.timestamp("us", tz="UTC"),
+    }.get(_kind(ontology_type))
+
+
+class _ParquetSink:
+    def __init__(self, path: str, columns: tuple[tuple[str, str], ...]):
+        import pyarrow.parquet as pq
+
+        from neo4j_ontology_loader.ingest.arrow_io import require_pyarrow
+
+        self.pa = require_pyarrow()
+        self.path = path
+        self.columns = columns
+        # Types the ontology declares; others (lists, models) are written as text
+        self.schema = self.pa.schema(
+            [self.pa.field(name, _arrow_type(self.pa, t) or self.pa.string()) for name, t in columns]
+        )
+        self.writer = pq.ParquetWriter(path, self.schema, compression="zstd")
+
+    def _array(self, values: list, ontology_type: str, type_):
+        from neo4j_ontology_loader.ingest.validation import coerce_column
+
+        if _arrow_type(self.pa, ontology_type) is None:
+            values = [None if v is None else str(_csv_value(v)) for v in values]
+        else:
+            # Stored values may predate typed loads (numbers in str properties, text dates)
+            values = coerce_column(pd.Series(values, dtype=object), _kind(ontology_type)).tolist()
+        return self.pa.array(values, type=type_)
+
+    def write(self, data: dict[str, list]) -> None:
+        arrays = [self._array(data[name], t, f.type) for (name, t), f in zip(self.columns, self.schema)]
+        self.writer.write_table(self.pa.Table.from_arrays(arrays, schema=self.schema))
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, default=str)
+    return value
+
+
+class _CsvSink:
+    def __init__(self, path: str, columns: tuple[tuple[str, str], ...]):
+        self.path = path
+        self.names = [name for name, _ in columns]
+        self.file = open(path, "w", newline="", encoding="utf-8")
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(self.names)
+
+    def write(self, data: dict[str, list]) -> None:
+        columns = [[_csv_value(v) for v in data[name]] for name in self.names]
+        self.writer.writerows(zip(*columns))
+
+    def close(self) -> None:
+        self.file.close()
+
+
+def _pages(session, table: ExportTable, lower, upper, page_size: int) -> Iterator[dict[str, list]]:
+    """Yield the pages of one key range as columns; ``$last`` is the last key of the previous page."""
+    names = [name for name, _ in table.columns]
+    last, first = None, True
+    while True:
+        kwargs = dict(first=first, lower=lower is not None, upper=upper is not None)
+        if table.kind == "node":
+            query = node_page_cypher(table.label, table.key, names, **kwargs)
+        else:
+            query = edge_page_cypher(table.rel_type, table.label, table.to_label, table.key, table.to_key, **kwargs)
+        params = {"last": last, "lower": lower, "upper": upper, "limit": page_size}
+        records = list(session.run(query, params))
+        if not records:
+            return
+        if table.kind == "node":
+            data = {name: [_native(r[name]) for r in records] for name in names}
+            last = records[-1][_key_column(table.key)]
+        else:
+            pairs = [(r["from_id"], to_id) for r in records for to_id in r["to_ids"]]
+            data = {"from_id": [_native(a) for a, _ in pairs], "to_id": [_native(b) for _, b in pairs]}
+            last = records[-1]["from_id"]
+        first = False
+        yield data
+        if len(records) < page_size:
+            return
+
+
+def export_graph(
+    driver: Driver,
+    out_dir: str,
+    *,
+    fmt: str = "parquet",
+    labels: list[str] | None = None,
+    keys: dict[str, str] | None = None,
+    relationships: bool = True,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    sessions: int = DEFAULT_SESSIONS,
+    partitions: int | None = None,
+    progress: ProgressCallback | None = None,
+) -> ExportReport:
+    """Export the nodes (and relationship edge lists) of the ontology's labels to ``out_dir``.
+
+    Labels are paged by their loader key (``keys``, default
+    ``loader_keys()``), else a unique property, else elementId. They are
+    split into up to ``partitions`` key ranges (default: ``sessions``) when
+    they have at least a page of nodes per range; the ranges of all tables
+    are exported by ``sessions`` parallel sessions, one part file per
+    non-empty range.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown export format: {fmt} (expected one of {', '.join(FORMATS)})")
+    if fmt == "parquet":
+        from neo4j_ontology_loader.ingest.arrow_io import require_pyarrow
+
+        require_pyarrow()
+    sink_cls = _ParquetSink if fmt == "parquet" else _CsvSink
+    partitions = partitions or sessions
+    report = ExportReport()
+    start = time.perf_counter()
+
+    tables = ontology_tables(driver, labels=labels, keys=keys)
+    if not relationships:
+        tables = [t for t in tables if t.kind == "node"]
+
+    # Ranges per label are computed once and shared by the label's nodes and outgoing edge lists
+    ranges: dict[str, list[tuple[Any, Any]]] = {}
+    with driver.session() as session:
+        for table in tables:
+            if table.label not in ranges:
+                ranges[table.label] = key_ranges(session, table.label, table.key, partitions, page_size)
+
+    def export_range(table: ExportTable, part: int, lower, upper) -> tuple[ExportTable, int, str | None]:
+        directory = os.path.join(out_dir, "nodes" if table.kind == "node" else "relationships", table.name)
+        path = os.path.join(directory, f"part-{part:05d}.{fmt}")
+        sink, rows = None, 0
+        try:
+            with driver.session() as session:
+                for data in _pages(session, table, lower, upper, page_size):
+                    count = len(next(iter(data.values())))
+                    if not count:
+                        continue
+                    if sink is None:
+                        os.makedirs(directory, exist_ok=True)
+                        sink = sink_cls(path, table.columns)
+                    sink.write(data)
+                    rows += count
+                    if progress:
+                        progress(table.name, rows, time.perf_counter() - start)
+        finally:
+            if sink is not None:
+                sink.close()
+        return table, rows, path if sink is not None else None
+
+    jobs = [
+        (table, part, lower, upper)
+        for table in tables
+        for part, (lower, upper) in enumerate(ranges[table.label])
+    ]
+    with ThreadPoolExecutor(max_workers=max(sessions, 1)) as pool:
+        for table, rows, path in pool.map(lambda job: export_range(*job), jobs):
+            report.per_target[table.name] = report.per_target.get(table.name, 0) + rows
+            if table.kind == "node":
+                report.nodes += rows
+            else:
+                report.relationships += rows
+            if path is not None:
+                report.files.append(path)
+    report.seconds = time.perf_counter() - start
+    return report
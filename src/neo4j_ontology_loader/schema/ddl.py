@@ -4,4 +4,4 @@ This module now re-exports schema creation helpers from ddl_schema to allow
 progressive migration without breaking existing imports.
 """
 
-from .ddl_schema import constraint_cypher
+from .ddl_schema import constraint_cypher, object_property_constraint_cypher, schema_constraint_cypher
@@ -0,0 +1,252 @@
+"""Index advisor: derive the indexes loads need from the specs and keep them ONLINE.
+
+Every MERGE looks its node up by the label's key, and every relationship
+spec matches both endpoints by ``from_prop``/``to_prop``; without an index
+each of those is a label scan per row. The advisor collects these lookups
+from the SZKB node and relationship specs (plus the ObjectProperty keys and
+a few query indexes), drops the ones the uniqueness constraints from
+``constraint_cypher`` already serve, and compares the rest with the
+indexes on the database:
+
+- missing lookups become ``CREATE INDEX`` statements, applied in parallel
+  and awaited with ``db.awaitIndexes`` before loading starts;
+- lookups served by a constraint that is not installed yet are reported
+  (``install-schema`` creates them; an index there would block the
+  constraint);
+- duplicate indexes, and indexes that have not been read since the
+  server started tracking, are reported, since each one slows down writes.
+"""
+from __future__ import annotations
+
+import re
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Iterable, Sequence
+
+from neo4j import Driver
+
+from neo4j_ontology_loader.neo4j.execution import run_statement
+from neo4j_ontology_loader.schema.types import OBJECT_PROPERTY_KEY, OntologySchema
+
+DEFAULT_CONCURRENCY = 4
+# Seconds db.awaitIndexes waits for new indexes to come ONLINE
+DEFAULT_AWAIT_TIMEOUT = 600
+
+# Lookups made by queries rather than loads
+QUERY_INDEXES: list[tuple[str, tuple[str, ...], str]] = [
+    ("CrossCurrencyRate", ("currency", "date"), "as-of lookups (queries.cross_rates)"),
+]
+
+_UNIQUE = re.compile(r"FOR \(n:`?(\w+)`?\) REQUIRE n\.`?(\w+)`? IS UNIQUE")
+
+
+@dataclass(frozen=True)
+class IndexNeed:
+    label: str
+    properties: tuple[str, ...]
+    reasons: tuple[str, ...] = ()
+
+
+@dataclass(frozen=True)
+class ExistingIndex:
+    name: str
+    type: str
+    label: str
+    properties: tuple[str, ...]
+    state: str = "ONLINE"
+    constraint: str | None = None
+    # Reads since ``tracked_since``; None where the server does not report usage
+    read_count: int | None = None
+    tracked_since: object = None
+
+
+@dataclass
+class IndexAdvice:
+    missing: list[IndexNeed] = field(default_factory=list)
+    # Served by a uniqueness constraint from the schema that is not installed yet
+    uninstalled_constraints: list[IndexNeed] = field(default_factory=list)
+    redundant: list[tuple[ExistingIndex, str]] = field(default_factory=list)
+    unused: list[ExistingIndex] = field(default_factory=list)
+
+    def statements(self) -> list[str]:
+        return [index_cypher(need) for need in self.missing]
+
+
+def index_cypher(need: IndexNeed) -> str:
+    props = ", ".join(f"n.{p}" for p in need.properties)
+    return f"CREATE INDEX IF NOT EXISTS FOR (n:{need.label}) ON ({props})"
+
+
+def load_index_needs(
+    schema: OntologySchema,
+    node_specs: Iterable | None = None,
+    rel_specs: Iterable | None = None,
+    *,
+    extra: Iterable[IndexNeed] = (),
+    object_properties: bool = True,
+    queries: bool = True,
+) -> list[IndexNeed]:
+    """Lookups made by loads of ``node_specs`` and ``rel_specs`` (default: the SZKB specs), merged per index.
+
+    ``object_properties`` adds the ObjectProperty value keys, ``queries``
+    the ``QUERY_INDEXES``.
+    """
+    from neo4j_ontology_loader.schema.szkb_specs import get_szkb_node_specs, get_szkb_relationship_specs
+
+    node_specs = get_szkb_node_specs() if node_specs is None else node_specs
+    rel_specs = get_szkb_relationship_specs() if rel_specs is None else rel_specs
+    found: dict[tuple[str, tuple[str, ...]], list[str]] = {}
+
+    def need(label: str, properties: tuple[str, ...], reason: str) -> None:
+        reasons = found.setdefault((label, properties), [])
+        if reason not in reasons:
+            reasons.append(reason)
+
+    for spec in node_specs:
+        need(spec.label, (spec.key,), f"MERGE key of {spec.source}")
+    for rel in rel_specs:
+        need(rel.from_label, (rel.from_prop,), f"{rel.rel_type} start")
+        need(rel.to_label, (rel.to_prop,), f"{rel.rel_type} end")
+    for node in schema.complex_properties if object_properties else ():
+        need(node.name, (OBJECT_PROPERTY_KEY,), "MERGE key of object property values")
+    if queries:
+        for label, properties, reason in QUERY_INDEXES:
+            need(label, properties, reason)
+    for item in extra:
+        for reason in item.reasons or ("",):
+            need(item.label, item.properties, reason)
+    return [IndexNeed(label, props, tuple(reasons)) for (label, props), reasons in found.items()]
+
+
+def planned_unique_keys(schema: OntologySchema) -> set[tuple[str, tuple[str, ...]]]:
+    """``(label, (property,))`` of the uniqueness constraints ``install-schema`` creates."""
+    from neo4j_ontology_loader.schema.ddl_schema import schema_constraint_cypher
+
+    return {(m.group(1), (m.group(2),)) for m in map(_UNIQUE.search, schema_constraint_cypher(schema)) if m}
+
+
+def existing_indexes(driver: Driver) -> list[ExistingIndex]:
+    """Node indexes on the database (token lookup indexes excluded)."""
+    indexes: list[ExistingIndex] = []
+    with driver.session() as session:
+        for record in session.run("SHOW INDEXES YIELD *"):
+            row = record.data()
+            if row.get("entityType") != "NODE" or row.get("type") == "LOOKUP" or not row.get("labelsOrTypes"):
+                continue
+            for label in row["labelsOrTypes"]:
+                indexes.append(
+                    ExistingIndex(
+                        name=row["name"],
+                        type=row["type"],
+                        label=label,
+                        properties=tuple(row.get("properties") or ()),
+                        state=row.get("state", "ONLINE"),
+                        constraint=row.get("owningConstraint"),
+                        read_count=row.get("readCount"),
+                        tracked_since=row.get("trackedSince"),
+                    )
+                )
+    return indexes
+
+
+def advise(
+    needs: Sequence[IndexNeed],
+    planned: set[tuple[str, tuple[str, ...]]],
+    existing: Sequence[ExistingIndex],
+) -> IndexAdvice:
+    """Compare the lookups loads make with the planned constraints and the existing indexes."""
+    advice = IndexAdvice()
+    # Only range indexes (and the ones backing constraints) serve equality lookups on the exact properties
+    serving = {(ix.label, ix.properties) for ix in existing if ix.type == "RANGE" and ix.state != "FAILED"}
+    for need in needs:
+        key = (need.label, need.properties)
+        if key in serving:
+            continue
+        if key in planned:
+            advice.uninstalled_constraints.append(need)
+        else:
+            advice.missing.append(need)
+
+    needed = {(need.label, need.properties) for need in needs}
+    by_schema: dict[tuple[str, str, tuple[str, ...]], list[ExistingIndex]] = {}
+    for ix in existing:
+        by_schema.setdefault((ix.type, ix.label, ix.properties), []).append(ix)
+    for same in by_schema.values():
+        if len(same) < 2:
+            continue
+        # Keep the constraint's index (or the first one); every other copy is pure write overhead
+        keep = next((ix for ix in same if ix.constraint), same[0])
+        for ix in same:
+            if ix is not keep:
+                what = f"constraint {keep.constraint}" if keep.constraint else f"index {keep.name}"
+                advice.redundant.append((ix, f"same {ix.type} index as {what}"))
+    redundant = {ix.name for ix, _ in advice.redundant}
+    for ix in existing:
+        if (
+            ix.read_count == 0
+            and not ix.constraint
+            and ix.name not in redundant
+            and (ix.label, ix.properties) not in needed
+        ):
+            advice.unused.append(ix)
+    return advice
+
+
+def advise_load_indexes(
+    driver: Driver, schema: OntologySchema, needs: Sequence[IndexNeed] | None = None
+) -> IndexAdvice:
+    """Advice for ``needs`` (default: the SZKB load lookups) against the database's indexes."""
+    needs = load_index_needs(schema) if needs is None else needs
+    return advise(needs, planned_unique_keys(schema), existing_indexes(driver))
+
+
+def apply_indexes(
+    driver: Driver,
+    statements: Sequence[str],
+    *,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    timeout: int = DEFAULT_AWAIT_TIMEOUT,
+) -> None:
+    """Create indexes in parallel sessions, then block until every index is ONLINE.
+
+    Raises ``RuntimeError`` if an index failed to populate.
+    """
+    if statements:
+        with ThreadPoolExecutor(max_workers=max(concurrency, 1)) as pool:
+            list(pool.map(lambda statement: run_statement(driver, statement), statements))
+    with driver.session() as session:
+        session.run("CALL db.awaitIndexes($timeout)", {"timeout": timeout}).consume()
+    failed = [ix.name for ix in existing_indexes(driver) if ix.state == "FAILED"]
+    if failed:
+        raise RuntimeError(f"Indexes failed to populate: {', '.join(sorted(set(failed)))}")
+
+
+def ensure_load_indexes(
+    driver: Driver,
+    schema: OntologySchema,
+    needs: Sequence[IndexNeed] | None = None,
+    *,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    timeout: int = DEFAULT_AWAIT_TIMEOUT,
+) -> IndexAdvice:
+    """Create the missing load indexes and wait until all indexes are ONLINE; returns the advice."""
+    advice = advise_load_indexes(driver, schema, needs)
+    apply_indexes(driver, advice.statements(), concurrency=concurrency, timeout=timeout)
+    return advice
+
+
+def format_advice(advice: IndexAdvice) -> list[str]:
+    lines: list[str] = []
+    for need in advice.missing:
+        lines.append(f"missing: {index_cypher(need)}  -- {', '.join(need.reasons)}")
+    for need in advice.uninstalled_constraints:
+        lines.append(
+            f"constraint not installed: {need.label}({', '.join(need.properties)}) "
+            f"-- run install-schema ({', '.join(need.reasons)})"
+        )
+    for ix, why in advice.redundant:
+        lines.append(f"redundant: {ix.name} on {ix.label}({', '.join(ix.properties)}) -- {why}")
+    for ix in advice.unused:
+        since = f" since {ix.tracked_since}" if ix.tracked_since is not None else ""
+        lines.append(f"unused: {ix.name} on {ix.label}({', '.join(ix.properties)}) -- no reads{since}")
+    return lines
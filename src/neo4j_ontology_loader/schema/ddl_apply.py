@@ -1,6 +1,8 @@
 from neo4j import Driver
+from neo4j_ontology_loader.neo4j.execution import run_statement
 
 def apply_cypher_statements(driver: Driver, statements: list[str]) -> None:
-    with driver.session() as session:
-        for stmt in statements:
-            session.run(stmt)
+    # One managed write per statement: schema commands cannot share a
+    # transaction with each other or with data writes.
+    for stmt in statements:
+        run_statement(driver, stmt)
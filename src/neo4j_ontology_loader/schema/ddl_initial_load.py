@@ -0,0 +1,270 @@
+"""Schema handling for bulk initial loads into empty labels.
+
+Every constraint and index on a label is maintained on each write. While an
+empty database is filled, only the index behind each label's MERGE key is
+needed; the rest (NOT NULL and secondary uniqueness constraints, lookup
+and query indexes) can be built once over the loaded data instead.
+
+``defer_schema`` drops the constraints and indexes of the loaded labels
+except their keys, keeping their ``createStatement`` so they can be
+restored. It then makes sure each key is indexed: by its uniqueness
+constraint where ``install-schema`` plans one, otherwise by a range index.
+``restore_schema`` recreates the dropped statements, the full
+``constraint_cypher`` set and the load indexes, then verifies that every
+constraint exists. Constraints the data violates are reported with the
+offending values instead of being left out silently.
+"""
+from __future__ import annotations
+
+import re
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Iterable, Sequence
+
+from neo4j import Driver
+from neo4j.exceptions import Neo4jError
+
+from neo4j_ontology_loader.neo4j.execution import run_statement
+from neo4j_ontology_loader.schema.ddl_advisor import (
+    DEFAULT_AWAIT_TIMEOUT,
+    DEFAULT_CONCURRENCY,
+    IndexNeed,
+    apply_indexes,
+    existing_indexes,
+    index_cypher,
+)
+from neo4j_ontology_loader.schema.ddl_schema import schema_constraint_cypher
+from neo4j_ontology_loader.schema.types import OntologySchema
+
+# Offending values reported per violated constraint
+MAX_EXAMPLES = 5
+
+_CONSTRAINT = re.compile(r"FOR \(n:`?(\w+)`?\) REQUIRE (.+?) IS (UNIQUE|NOT NULL|NODE KEY)")
+_INDEX = re.compile(r"FOR \(n:`?(\w+)`?\) ON \((.+)\)")
+_PROPERTY = re.compile(r"n\.`?(\w+)`?")
+
+
+@dataclass(frozen=True)
+class SchemaItem:
+    """A parsed constraint or index statement."""
+
+    kind: str  # UNIQUE | NOT NULL | NODE KEY | INDEX
+    label: str
+    properties: tuple[str, ...]
+
+
+def _quote(name: str) -> str:
+    return "`" + name.replace("`", "``") + "`"
+
+
+def parse_statement(statement: str) -> SchemaItem | None:
+    """The schema a ``CREATE CONSTRAINT``/``CREATE INDEX`` statement defines (None if not recognised)."""
+    if match := _CONSTRAINT.search(statement):
+        return SchemaItem(match.group(3), match.group(1), tuple(_PROPERTY.findall(match.group(2))))
+    if match := _INDEX.search(statement):
+        return SchemaItem("INDEX", match.group(1), tuple(_PROPERTY.findall(match.group(2))))
+    return None
+
+
+def _constraint_kind(type_: str) -> str:
+    # SHOW CONSTRAINTS types: UNIQUENESS / NODE_PROPERTY_UNIQUENESS, NODE_PROPERTY_EXISTENCE, NODE_KEY
+    if "UNIQUENESS" in type_:
+        return "UNIQUE"
+    if "EXISTENCE" in type_:
+        return "NOT NULL"
+    if "KEY" in type_:
+        return "NODE KEY"
+    return type_
+
+
+@dataclass
+class DeferredSchema:
+    # MERGE key per loaded label
+    keys: dict[str, str]
+    # createStatement of every dropped constraint and index
+    dropped: list[str] = field(default_factory=list)
+
+
+@dataclass
+class ConstraintViolation:
+    statement: str
+    error: str
+    item: SchemaItem | None = None
+    # Duplicate values (UNIQUE) or nodes without the property (NOT NULL); None if not checked
+    violations: int | None = None
+    examples: list = field(default_factory=list)
+
+
+@dataclass
+class RestoreReport:
+    created: list[str] = field(default_factory=list)
+    violations: list[ConstraintViolation] = field(default_factory=list)
+
+
+def nonempty_labels(driver: Driver, labels: Iterable[str]) -> list[str]:
+    """Labels that already have nodes (counts come from the count store)."""
+    busy: list[str] = []
+    with driver.session() as session:
+        for label in labels:
+            record = session.run(f"MATCH (n:{_quote(label)}) RETURN count(n) AS nodes").single()
+            if record and record["nodes"]:
+                busy.append(label)
+    return busy
+
+
+def defer_schema(
+    driver: Driver,
+    keys: dict[str, str],
+    unique_keys: set[tuple[str, tuple[str, ...]]],
+    *,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    timeout: int = DEFAULT_AWAIT_TIMEOUT,
+) -> DeferredSchema:
+    """Drop everything but the key constraints/indexes of the ``keys`` labels, then index each key.
+
+    ``unique_keys`` are the ``(label, (key,))`` pairs ``install-schema``
+    backs with a uniqueness constraint (``ddl_advisor.planned_unique_keys``);
+    those keys get the constraint now, the others a range index.
+    """
+    deferred = DeferredSchema(keys=dict(keys))
+
+    def is_key(row: dict) -> bool:
+        return any(list(row["properties"] or []) == [keys.get(label)] for label in row["labelsOrTypes"] or [])
+
+    with driver.session() as session:
+        constraints = [
+            r.data()
+            for r in session.run(
+                "SHOW CONSTRAINTS YIELD name, type, entityType, labelsOrTypes, properties, createStatement"
+            )
+        ]
+        for row in constraints:
+            if row["entityType"] != "NODE" or not set(row["labelsOrTypes"] or []) & keys.keys():
+                continue
+            if _constraint_kind(row["type"]) == "UNIQUE" and is_key(row):
+                continue
+            session.run(f"DROP CONSTRAINT {_quote(row['name'])} IF EXISTS").consume()
+            deferred.dropped.append(row["createStatement"])
+        indexes = [
+            r.data()
+            for r in session.run(
+                "SHOW INDEXES YIELD name, type, entityType, labelsOrTypes, properties, owningConstraint, "
+                "createStatement WHERE type <> 'LOOKUP' AND owningConstraint IS NULL RETURN *"
+            )
+        ]
+        for row in indexes:
+            if row["entityType"] != "NODE" or not set(row["labelsOrTypes"] or []) & keys.keys():
+                continue
+            key_index = is_key(row)
+            replaced = any((label, tuple(row["properties"])) in unique_keys for label in row["labelsOrTypes"])
+            if key_index and not replaced:
+                continue
+            # A plain index on a key would block the key's uniqueness constraint, which replaces it
+            session.run(f"DROP INDEX {_quote(row['name'])} IF EXISTS").consume()
+            if not key_index:
+                deferred.dropped.append(row["createStatement"])
+
+    statements = [
+        f"CREATE CONSTRAINT IF NOT EXISTS FOR (n:{label}) REQUIRE n.{key} IS UNIQUE"
+        if (label, (key,)) in unique_keys
+        else index_cypher(IndexNeed(label, (key,)))
+        for label, key in keys.items()
+    ]
+    apply_indexes(driver, statements, concurrency=concurrency, timeout=timeout)
+    return deferred
+
+
+def _violations(driver: Driver, item: SchemaItem, key: str | None) -> tuple[int, list]:
+    label = _quote(item.label)
+    props = [f"n.{_quote(p)}" for p in item.properties]
+    with driver.session() as session:
+        if item.kind == "NOT NULL":
+            example = f"n.{_quote(key)}" if key else "elementId(n)"
+            query = (
+                f"MATCH (n:{label}) WHERE {props[0]} IS NULL "
+                f"RETURN count(n) AS violations, collect({example})[..$limit] AS examples"
+            )
+        else:
+            value = props[0] if len(props) == 1 else f"[{', '.join(props)}]"
+            present = " AND ".join(f"{p} IS NOT NULL" for p in props)
+            query = (
+                f"MATCH (n:{label}) WHERE {present} WITH {value} AS value, count(*) AS nodes WHERE nodes > 1 "
+                f"RETURN count(value) AS violations, collect(value)[..$limit] AS examples"
+            )
+        record = session.run(query, {"limit": MAX_EXAMPLES}).single()
+    return (record["violations"], list(record["examples"])) if record else (0, [])
+
+
+def restore_schema(
+    driver: Driver,
+    schema: OntologySchema,
+    deferred: DeferredSchema,
+    index_statements: Sequence[str] = (),
+    *,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    timeout: int = DEFAULT_AWAIT_TIMEOUT,
+) -> RestoreReport:
+    """Recreate the deferred statements, the full constraint set and ``index_statements``; verify them.
+
+    Statements defining the same schema are applied once (dropped ones keep
+    their names). Failed statements are reported with their violations,
+    as are constraints missing afterwards and indexes that failed to build.
+    """
+    report = RestoreReport()
+    planned: dict[object, str] = {}
+    for statement in [*deferred.dropped, *schema_constraint_cypher(schema), *index_statements]:
+        planned.setdefault(parse_statement(statement) or statement, statement)
+
+    def apply(statement: str) -> tuple[str, Neo4jError | None]:
+        try:
+            run_statement(driver, statement)
+            return statement, None
+        except Neo4jError as e:
+            return statement, e
+
+    with ThreadPoolExecutor(max_workers=max(concurrency, 1)) as pool:
+        results = list(pool.map(apply, planned.values()))
+    failed: set[str] = set()
+    for statement, error in results:
+        if error is None:
+            report.created.append(statement)
+            continue
+        failed.add(statement)
+        item = parse_statement(statement)
+        violation = ConstraintViolation(statement, str(error), item)
+        if item is not None and item.kind != "INDEX":
+            try:
+                violation.violations, violation.examples = _violations(
+                    driver, item, deferred.keys.get(item.label)
+                )
+            except Neo4jError:
+                pass
+        report.violations.append(violation)
+
+    with driver.session() as session:
+        session.run("CALL db.awaitIndexes($timeout)", {"timeout": timeout}).consume()
+        present = {
+            SchemaItem(_constraint_kind(r["type"]), label, tuple(r["properties"] or ()))
+            for r in session.run("SHOW CONSTRAINTS YIELD type, labelsOrTypes, properties")
+            for label in r["labelsOrTypes"] or ()
+        }
+    for statement in report.created:
+        item = parse_statement(statement)
+        if item is not None and item.kind != "INDEX" and item not in present:
+            report.violations.append(ConstraintViolation(statement, "constraint missing after creation", item))
+    for ix in existing_indexes(driver):
+        if ix.state == "FAILED":
+            item = SchemaItem("INDEX", ix.label, ix.properties)
+            report.violations.append(ConstraintViolation(f"index {ix.name}", "index failed to populate", item))
+    return report
+
+
+def format_restore(report: RestoreReport) -> list[str]:
+    lines = [f"Schema rebuilt: {len(report.created)} constraints and indexes created."]
+    for v in report.violations:
+        lines.append(f"FAILED: {v.statement}")
+        lines.append(f"  {v.error}")
+        if v.violations:
+            what = "nodes without the property" if v.item.kind == "NOT NULL" else "duplicated values"
+            lines.append(f"  {v.violations} {what}, e.g. {', '.join(map(str, v.examples))}")
+    return lines
@@ -1,42 +1,285 @@
+"""Database reset engine.
+
+Three strategies:
+
+- ``recreate``: ``CREATE OR REPLACE DATABASE`` on the system database
+  (Enterprise edition only). Fastest; also drops all schema.
+- ``delete``: drop constraints/indexes, then delete relationships per type
+  and nodes per label with ``CALL { ... } IN CONCURRENT TRANSACTIONS``,
+  running several types/labels in parallel sessions and repeating each
+  pass until nothing is left.
+- selective (``clean_selection``): delete only given labels, optionally
+  restricted to a date range on the label's date property (e.g. Quotes).
+
+``IN TRANSACTIONS`` requires auto-commit transactions, so these statements
+use ``session.run`` rather than the managed write layer.
+"""
+from __future__ import annotations
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable
+
 from neo4j import Driver
 
+from neo4j_ontology_loader.neo4j.query_cache import clear_query_cache, invalidate_labels
+from utils.logging import get_logger
 
-def clean_database(driver: Driver) -> None:
-    """Drop all constraints and non-lookup indexes, then delete all nodes and relationships.
+# Date property used for range-restricted selective cleans
+DATE_PROPERTIES: dict[str, str] = {
+    "Quote": "quote_date",
+    "CrossCurrencyRate": "date",
+}
+
+DEFAULT_BATCH_SIZE = 10_000
+DEFAULT_CONCURRENCY = 4
+# Passes per label/type before giving up (each pass normally deletes everything)
+MAX_PASSES = 20
+
+ProgressCallback = Callable[[str, int, int, float], None]
+
+
+@dataclass
+class ResetReport:
+    mode: str
+    nodes_deleted: int = 0
+    relationships_deleted: int = 0
+    seconds: float = 0.0
+    # Deleted entities per label / relationship type
+    per_target: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def throughput(self) -> float:
+        """Deleted nodes + relationships per second."""
+        total = self.nodes_deleted + self.relationships_deleted
+        return total / self.seconds if self.seconds else 0.0
+
+
+def _quote(name: str) -> str:
+    return "`" + name.replace("`", "``") + "`"
+
+
+def _scalar(driver: Driver, query: str, **params):
+    with driver.session() as session:
+        record = session.run(query, params).single()
+        return None if record is None else record[0]
+
+
+def server_edition(driver: Driver) -> str:
+    return (_scalar(driver, "CALL dbms.components() YIELD edition RETURN edition") or "").lower()
+
+
+def current_database(driver: Driver) -> str | None:
+    return _scalar(driver, "CALL db.info() YIELD name RETURN name")
+
+
+def drop_schema(driver: Driver) -> None:
+    """Drop all constraints and non-lookup indexes (token lookup indexes are kept)."""
+    with driver.session() as session:
+        # Drop all constraints (Neo4j 5 syntax). Constraint-backed indexes go with them.
+        names = [r["name"] for r in session.run("SHOW CONSTRAINTS YIELD name RETURN name")]
+        for name in names:
+            session.run(f"DROP CONSTRAINT {_quote(name)} IF EXISTS").consume()
+        names = [
+            r["name"]
+            for r in session.run("SHOW INDEXES YIELD name, type WHERE type <> 'LOOKUP' RETURN name")
+        ]
+        for name in names:
+            session.run(f"DROP INDEX {_quote(name)} IF EXISTS").consume()
+
+
+def _delete_until_empty(
+    driver: Driver,
+    target: str,
+    count_query: str,
+    delete_query: str,
+    params: dict,
+    progress: ProgressCallback | None,
+) -> int:
+    """Run ``delete_query`` until ``count_query`` returns 0; return the number deleted."""
+    logger = get_logger()
+    start = time.perf_counter()
+    remaining = _scalar(driver, count_query, **params) or 0
+    initial = remaining
+    passes = 0
+    while remaining and passes < MAX_PASSES:
+        passes += 1
+        with driver.session() as session:
+            session.run(delete_query, params).consume()
+        before, remaining = remaining, _scalar(driver, count_query, **params) or 0
+        if progress:
+            progress(target, initial - remaining, remaining, time.perf_counter() - start)
+        if remaining >= before:
+            # ON ERROR CONTINUE may skip deadlocked batches; no progress at all means something else is wrong
+            logger.warning("reset no progress target=%s remaining=%d", target, remaining)
+            break
+    if remaining:
+        logger.warning("reset incomplete target=%s remaining=%d passes=%d", target, remaining, passes)
+    return initial - remaining
+
+
+def _in_transactions(batch_size: int, concurrency: int) -> str:
+    concurrent = f"{concurrency} CONCURRENT " if concurrency > 1 else ""
+    # Deadlocked batches (concurrent deletes touching shared nodes) are skipped
+    # and picked up by the next pass.
+    return f"IN {concurrent}TRANSACTIONS OF {batch_size} ROWS ON ERROR CONTINUE"
+
+
+def delete_all(
+    driver: Driver,
+    *,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    progress: ProgressCallback | None = None,
+) -> ResetReport:
+    """Delete all data: relationships per type, then nodes per label, in parallel."""
+    report = ResetReport(mode="delete")
+    start = time.perf_counter()
+    tx_clause = _in_transactions(batch_size, concurrency)
 
-    Intended for maintenance/cleanup only. Destructive.
-    """
     with driver.session() as session:
-        # Drop all constraints (Neo4j 5 syntax)
-        for record in session.run("SHOW CONSTRAINTS YIELD name RETURN name"):
-            name = record["name"]
-            session.run(f"DROP CONSTRAINT `{name}` IF EXISTS")
-
-        # Drop all non-lookup indexes (avoid dropping token lookup indexes)
-        for record in session.run(
-            "SHOW INDEXES YIELD name, type WHERE type <> 'LOOKUP' RETURN name"
-        ):
-            name = record["name"]
-            session.run(f"DROP INDEX `{name}` IF EXISTS")
-
-        # Delete all relationships in batches to avoid large transaction memory usage
-        session.run(
-            """
-            CALL () {
-              MATCH ()-[r]-()
-              WITH r LIMIT 100000
-              DELETE r
-            } IN TRANSACTIONS OF 10000 ROWS
-            """
+        rel_types = [r[0] for r in session.run("CALL db.relationshipTypes()")]
+        labels = [r[0] for r in session.run("CALL db.labels()")]
+
+    def delete_rel_type(rel_type: str) -> tuple[str, int]:
+        t = _quote(rel_type)
+        return rel_type, _delete_until_empty(
+            driver,
+            rel_type,
+            f"MATCH ()-[r:{t}]->() RETURN count(r)",
+            f"MATCH ()-[r:{t}]->() CALL (r) {{ DELETE r }} {tx_clause}",
+            {},
+            progress,
         )
 
-        # Delete remaining nodes in batches
-        session.run(
-            """
-            CALL () {
-              MATCH (n)
-              WITH n LIMIT 100000
-              DETACH DELETE n
-            } IN TRANSACTIONS OF 10000 ROWS
-            """
+    def delete_label(label: str) -> tuple[str, int]:
+        t = _quote(label)
+        return label, _delete_until_empty(
+            driver,
+            label,
+            f"MATCH (n:{t}) RETURN count(n)",
+            f"MATCH (n:{t}) CALL (n) {{ DETACH DELETE n }} {tx_clause}",
+            {},
+            progress,
         )
+
+    # Relationships first so that node deletes do not contend on shared relationships
+    with ThreadPoolExecutor(max_workers=max(concurrency, 1)) as pool:
+        for rel_type, deleted in pool.map(delete_rel_type, rel_types):
+            report.per_target[rel_type] = deleted
+            report.relationships_deleted += deleted
+        for label, deleted in pool.map(delete_label, labels):
+            report.per_target[label] = deleted
+            report.nodes_deleted += deleted
+
+    # Unlabelled leftovers
+    report.nodes_deleted += _delete_until_empty(
+        driver,
+        "(all)",
+        "MATCH (n) RETURN count(n)",
+        f"MATCH (n) CALL (n) {{ DETACH DELETE n }} IN TRANSACTIONS OF {batch_size} ROWS",
+        {},
+        progress,
+    )
+    clear_query_cache()
+    report.seconds = time.perf_counter() - start
+    return report
+
+
+def recreate_database(driver: Driver, database: str) -> ResetReport:
+    """Replace ``database`` with an empty one (Enterprise edition)."""
+    start = time.perf_counter()
+    with driver.session(database="system") as session:
+        session.run(f"CREATE OR REPLACE DATABASE {_quote(database)} WAIT").consume()
+    clear_query_cache()
+    return ResetReport(mode="recreate", seconds=time.perf_counter() - start)
+
+
+def _temporal_function(label: str, prop: str) -> str:
+    """Cypher function building a bound comparable to ``label.prop``: ``date`` or ``datetime``."""
+    from neo4j_ontology_loader.ingest.prepare import native_types
+    from neo4j_ontology_loader.schema.registry import load_ontology_schema
+
+    kinds = dict(native_types(load_ontology_schema().entity(label)))
+    return "date" if kinds.get(prop) == "date" else "datetime"
+
+
+def clean_selection(
+    driver: Driver,
+    labels: list[str],
+    *,
+    date_from: str | None = None,
+    date_to: str | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    progress: ProgressCallback | None = None,
+) -> ResetReport:
+    """Delete nodes (and their relationships) of ``labels``, keeping schema.
+
+    With ``date_from``/``date_to`` (ISO-8601, from inclusive, to exclusive),
+    only nodes whose date property (see ``DATE_PROPERTIES``) lies in the range
+    are deleted; labels without a date property are rejected. The bounds are
+    converted with ``date()``/``datetime()`` to match the property's native type.
+    """
+    report = ResetReport(mode="selective")
+    start = time.perf_counter()
+    tx_clause = _in_transactions(batch_size, concurrency)
+    for label in labels:
+        t = _quote(label)
+        conditions: list[str] = []
+        if date_from is not None or date_to is not None:
+            prop = DATE_PROPERTIES.get(label)
+            if prop is None:
+                raise ValueError(f"No date property known for label {label}; cannot clean by date range")
+            # Compare native temporals so the range index on the property is used
+            temporal = _temporal_function(label, prop)
+            if date_from is not None:
+                conditions.append(f"n.{_quote(prop)} >= {temporal}($date_from)")
+            if date_to is not None:
+                conditions.append(f"n.{_quote(prop)} < {temporal}($date_to)")
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        deleted = _delete_until_empty(
+            driver,
+            label,
+            f"MATCH (n:{t}){where} RETURN count(n)",
+            f"MATCH (n:{t}){where} CALL (n) {{ DETACH DELETE n }} {tx_clause}",
+            {"date_from": date_from, "date_to": date_to},
+            progress,
+        )
+        report.per_target[label] = deleted
+        report.nodes_deleted += deleted
+    invalidate_labels(labels)
+    report.seconds = time.perf_counter() - start
+    return report
+
+
+def clean_database(
+    driver: Driver,
+    *,
+    mode: str = "auto",
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    progress: ProgressCallback | None = None,
+) -> ResetReport:
+    """Reset the database: remove all constraints, indexes, nodes and relationships.
+
+    ``mode``: ``recreate`` (CREATE OR REPLACE DATABASE, Enterprise only),
+    ``delete`` (drop schema + parallel batched deletes) or ``auto`` (recreate
+    when the edition allows it, else delete).
+
+    Intended for maintenance/cleanup only. Destructive.
+    """
+    if mode not in ("auto", "recreate", "delete"):
+        raise ValueError(f"Unknown reset mode: {mode}")
+    if mode in ("auto", "recreate"):
+        database = current_database(driver)
+        enterprise = server_edition(driver) == "enterprise"
+        if enterprise and database and database != "system":
+            return recreate_database(driver, database)
+        if mode == "recreate":
+            raise RuntimeError("CREATE OR REPLACE DATABASE requires Neo4j Enterprise Edition")
+        get_logger().info("reset mode=delete (database recreation not available on this edition)")
+
+    drop_schema(driver)
+    return delete_all(driver, batch_size=batch_size, concurrency=concurrency, progress=progress)
@@ -1,4 +1,4 @@
-from neo4j_ontology_loader.schema.types import EntityDef
+from neo4j_ontology_loader.schema.types import OBJECT_PROPERTY_KEY, ComplexPropertiesDef, EntityDef, OntologySchema
 
 
 def constraint_cypher(node: EntityDef) -> list[str]:
@@ -19,3 +19,17 @@ def constraint_cypher(node: EntityDef) -> list[str]:
                 f"CREATE CONSTRAINT IF NOT EXISTS FOR (n:{node.name}) REQUIRE n.{p.name} IS NOT NULL"
             )
     return cyphers
+
+
+def object_property_constraint_cypher(node: ComplexPropertiesDef) -> list[str]:
+    """Uniqueness of the content key of materialized ObjectProperty nodes (one node per value)."""
+    return [
+        f"CREATE CONSTRAINT IF NOT EXISTS FOR (n:{node.name}) REQUIRE n.{OBJECT_PROPERTY_KEY} IS UNIQUE"
+    ]
+
+
+def schema_constraint_cypher(schema: OntologySchema) -> list[str]:
+    """Every constraint ``install-schema`` applies: entity constraints, then ObjectProperty keys."""
+    statements = [s for node in schema.entities for s in constraint_cypher(node)]
+    statements += [s for node in schema.complex_properties for s in object_property_constraint_cypher(node)]
+    return statements
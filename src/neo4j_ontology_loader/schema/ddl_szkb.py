@@ -4,19 +4,25 @@ This module contains non-unique indexes that speed up MERGE/lookup operations
 for labels/properties that are only present in the SZKB load and not part of
 the core ontology schema constraints.
 """
+from __future__ import annotations
 
+from neo4j_ontology_loader.schema.types import OntologySchema
 
-def szkb_loading_indexes() -> list[str]:
-    statements: list[str] = []
-    # Synthetic ids used during CSV load for these labels; add non-unique indexes
-    # to speed up MERGE operations. Constraints for core ontology labels are
-    # handled by ddl_schema.constraint_cypher based on model definitions.
-    statements.append(
-        "CREATE INDEX IF NOT EXISTS FOR (n:CrossCurrencyRate) ON (n.id)"
-    )
-    # Relationship creation for Quote -> Listing matches Quote by listing_id,
-    # not by the synthetic Quote.id. Index listing_id to accelerate MATCH.
-    statements.append(
-        "CREATE INDEX IF NOT EXISTS FOR (n:Quote) ON (n.listing_id)"
-    )
-    return statements
+
+def szkb_loading_indexes(schema: OntologySchema | None = None) -> list[str]:
+    """Index statements for the SZKB load's lookups that no schema constraint covers.
+
+    Derived by ``ddl_advisor`` from the node specs' MERGE keys (e.g. the
+    synthetic Quote and CrossCurrencyRate ids), the relationship specs'
+    endpoints (e.g. Quote.listing_id for QuoteOfListing) and the as-of
+    lookup on CrossCurrencyRate(currency, date). Keys that get a uniqueness
+    constraint from ``ddl_schema.constraint_cypher`` are left to
+    ``install-schema``.
+    """
+    from neo4j_ontology_loader.schema.ddl_advisor import advise, load_index_needs, planned_unique_keys
+
+    if schema is None:
+        from neo4j_ontology_loader.schema.registry import load_ontology_schema
+
+        schema = load_ontology_schema()
+    return advise(load_index_needs(schema), planned_unique_keys(schema), []).statements()
@@ -1,20 +1,9 @@
 from pydantic import BaseModel
 from neo4j_ontology_loader.schema.types import EntityDef, PropertyDef, RelTypeDef, ComplexPropertiesDef
 import re
-from neo4j_ontology_loader.models.issuer import Issuer
-from neo4j_ontology_loader.models.instrument_type import InstrumentType
-from neo4j_ontology_loader.models.trading_venue import TradingVenue
-from neo4j_ontology_loader.models.listing import Listing
-from neo4j_ontology_loader.models.quotes import Quote
-from neo4j_ontology_loader.models.relationships import (
-    IssuedBy,
-    UltimatelyIssuedBy,
-    HasType,
-    MainTradingPlace,
-    ListingOfInstrument,
-    ListedOn,
-    QuoteOfListing,
-)
+
+# Domain models are imported inside the functions that need them so that
+# importing this module (e.g. from the CLI) does not load every model.
 
 def infer_key(model: type[BaseModel]) -> str:
     """Infer ontology node type key from the class name.
@@ -60,6 +49,11 @@ def all_relationship_types() -> list[RelTypeDef]:
 
     Mapping is defined from the domain comments in models/relationships.py.
     """
+    from neo4j_ontology_loader.models.trading_venue import TradingVenue
+    from neo4j_ontology_loader.models.listing import Listing
+    from neo4j_ontology_loader.models.quotes import Quote
+    from neo4j_ontology_loader.models.relationships import ListedOn, QuoteOfListing
+
     # Only include relationships that do not involve abstract marker nodes.
     # Abstract nodes (e.g., FinancialInstrument) are used exclusively for IsA relations.
     return [
@@ -68,21 +62,19 @@ def all_relationship_types() -> list[RelTypeDef]:
     ]
 
 
-# Extended property-as-relationship schema definitions for types in models/types.py
-from neo4j_ontology_loader.models.types import (
-    FinancialInstrument as FI,
-    Currency,
-    Date,
-    Price,
-    InterestRate,
-    Shorttext,
-    Longtext,
-    FinancialInstrumentIdentification,
-    CfiCode,
-)
+def rollup_relationship_types() -> list[RelTypeDef]:
+    """Relationships of nodes derived during ingest (Quote rollups)."""
+    from neo4j_ontology_loader.models.listing import Listing
+    from neo4j_ontology_loader.models.quote_bar import QuoteBar
+    from neo4j_ontology_loader.models.relationships import BarOfListing
+
+    return [extract_rel_type(BarOfListing.__name__, QuoteBar, Listing)]
 
 
+# Extended property-as-relationship schema definitions for types in models/types.py
 def property_relationship_types() -> list[RelTypeDef]:
+    from neo4j_ontology_loader.models.types import Currency, Date, Price, InterestRate
+
     rels: list[RelTypeDef] = []
     # Only nested relations of type objects. Abstract marker nodes carry no properties.
     rels.append(extract_rel_type("PaymentDate", InterestRate, Date))
@@ -114,6 +106,27 @@ def bond_property_relationship_types() -> list[RelTypeDef]:
     return rels
 
 
+def _pascal(field: str) -> str:
+    return "".join(part[:1].upper() + part[1:] for part in field.split("_"))
+
+
+def object_relationship_name(field: str) -> str:
+    """Relationship from an entity to the ObjectProperty node held in its ``field``.
+
+    Follows the Bond relations above: interestRate -> HasInterestRate,
+    dividend_policy -> HasDividendPolicy; the currency of denomination keeps
+    its generic name.
+    """
+    if field == "currencyOfDenomination":
+        return "CurrencyOfDenomination"
+    return f"Has{_pascal(field)}"
+
+
+def nested_relationship_name(model_name: str, field: str) -> str:
+    """Relationship between ObjectProperty nodes: Price.currency -> PriceCurrency."""
+    return f"{model_name}{field[0].upper()}{field[1:]}"
+
+
 def inheritance_relationship_types() -> list[RelTypeDef]:
     """Ontology-level inheritance (schema) relations between concrete subtypes and FinancialInstrument."""
     rels: list[RelTypeDef] = []
@@ -125,9 +138,9 @@ def inheritance_relationship_types() -> list[RelTypeDef]:
 
 # ------------------- ObjectProperty support -------------------
 
-from typing import get_origin, get_args, Optional as TypingOptional
+from typing import Union, get_origin, get_args, Optional as TypingOptional
 import inspect
-import neo4j_ontology_loader.models.types as model_types
+import types
 
 
 def _is_basic_type(annotation: object) -> bool:
@@ -157,16 +170,13 @@ def _is_object_property_model(obj: object) -> bool:
 
 
 def discover_object_property_models() -> list[type[BaseModel]]:
-    """Discover embedded object property models defined in models/types.py.
+    """Return the embedded object property models registered in models/types.py.
 
-    We treat all Pydantic BaseModel classes in models/types.py, except abstract markers,
-    as ObjectProperty node candidates.
+    Models opt in with ``@register_object_property``; abstract markers are excluded.
     """
-    models: list[type[BaseModel]] = []
-    for _, obj in vars(model_types).items():
-        if _is_object_property_model(obj):
-            models.append(obj)
-    return models
+    from neo4j_ontology_loader.schema.registry import object_property_models
+
+    return [e.model for e in object_property_models() if _is_object_property_model(e.model)]
 
 
 def extract_object_property_node(model: type[BaseModel]) -> ComplexPropertiesDef:
@@ -199,16 +209,18 @@ def complex_properties_relationship_types() -> list[RelTypeDef]:
     for model in candidates.values():
         for fname, field in model.model_fields.items():
             ann = field.annotation
-            # Unwrap Optional[T]
+            # Unwrap Optional[T] (a Union with None) and List[T]
             origin = get_origin(ann)
-            if origin is TypingOptional:
+            if origin is Union or origin is types.UnionType:
                 args = [a for a in get_args(ann) if a is not type(None)]  # noqa: E721
-                if args:
+                if len(args) == 1:
                     ann = args[0]
                     origin = get_origin(ann)
+            if origin is list:
+                ann = get_args(ann)[0]
             if inspect.isclass(ann) and issubclass(ann, BaseModel) and ann.__name__ in candidates:
                 # Create a relationship from model to ann using a deterministic name
-                rel_name = f"{model.__name__}{fname[0].upper()}{fname[1:]}"
+                rel_name = nested_relationship_name(model.__name__, fname)
                 rels.append(
                     RelTypeDef(
                         name=rel_name,
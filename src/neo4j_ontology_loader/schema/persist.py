@@ -1,4 +1,6 @@
 from neo4j import Driver
+from neo4j_ontology_loader.neo4j.execution import run_write
+from neo4j_ontology_loader.neo4j.query_cache import invalidate_labels
 from neo4j_ontology_loader.schema.types import EntityDef, RelTypeDef
 
 ONTO_NODE = "Entity"
@@ -6,8 +8,8 @@ ONTO_PROP = "PropertyDefinition"
 ONTO_REL = "RelType"
 
 def persist_schema(driver: Driver, node: EntityDef) -> None:
-    with driver.session() as session:
-        session.execute_write(_persist_node_type, node)
+    run_write(driver, _persist_node_type, node)
+    invalidate_labels([ONTO_NODE, ONTO_PROP])
 
 def _persist_node_type(tx, node: EntityDef) -> None:
     tx.run(
@@ -34,9 +36,9 @@ def _persist_node_type(tx, node: EntityDef) -> None:
 
 
 def persist_relationship_types(driver: Driver, rels: list[RelTypeDef]) -> None:
-    with driver.session() as session:
-        for rel in rels:
-            session.execute_write(_persist_rel_type, rel)
+    for rel in rels:
+        run_write(driver, _persist_rel_type, rel)
+    invalidate_labels([ONTO_NODE, ONTO_REL])
 
 
 def _persist_rel_type(tx, rel: RelTypeDef) -> None:
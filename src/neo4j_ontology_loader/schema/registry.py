@@ -0,0 +1,202 @@
+"""Registry of ontology models and cached schema extraction.
+
+Models register themselves with ``register_entity`` / ``register_object_property``
+when their module is imported. ``load_ontology_schema`` derives all schema
+definitions from the registry once per process and persists them to an
+on-disk cache keyed by a hash of the model and extraction sources, so warm
+starts neither import the models nor introspect Pydantic fields. Writing a
+new cache file removes the ones left by earlier sources.
+"""
+from __future__ import annotations
+
+import importlib
+import json
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, TypeVar
+
+from neo4j_ontology_loader.schema.types import (
+    ComplexPropertiesDef,
+    EntityDef,
+    OntologySchema,
+    PropertyDef,
+    RelTypeDef,
+)
+from utils.hashing import hash_files
+from utils.logging import get_logger
+
+T = TypeVar("T", bound=type)
+
+# Modules whose import registers the ontology models, in persistence order.
+MODEL_MODULES: tuple[str, ...] = (
+    "neo4j_ontology_loader.models.issuer",
+    "neo4j_ontology_loader.models.instrument_type",
+    "neo4j_ontology_loader.models.trading_venue",
+    "neo4j_ontology_loader.models.listing",
+    "neo4j_ontology_loader.models.cross_currency_rate",
+    "neo4j_ontology_loader.models.quotes",
+    "neo4j_ontology_loader.models.quote_bar",
+    "neo4j_ontology_loader.models.types",
+)
+
+_PACKAGE_DIR = Path(__file__).resolve().parents[1]
+# Any change to these files may change the derived schema and invalidates the cache.
+_SCHEMA_SOURCES: tuple[Path, ...] = (
+    *sorted((_PACKAGE_DIR / "models").glob("*.py")),
+    _PACKAGE_DIR / "schema" / "extract.py",
+    _PACKAGE_DIR / "schema" / "registry.py",
+    _PACKAGE_DIR / "schema" / "szkb_specs.py",
+    _PACKAGE_DIR / "schema" / "types.py",
+)
+
+
+@dataclass(frozen=True)
+class ModelEntry:
+    model: type
+    label: str
+    abstract: bool = False
+
+
+_ENTITIES: dict[str, ModelEntry] = {}
+_OBJECT_PROPERTIES: dict[str, ModelEntry] = {}
+
+
+def register_entity(cls: T | None = None, *, abstract: bool = False) -> T | Callable[[T], T]:
+    """Class decorator registering a model as an ontology entity (node type).
+
+    Usable bare (``@register_entity``) or with options
+    (``@register_entity(abstract=True)``).
+    """
+    def decorate(model: T) -> T:
+        _ENTITIES[model.__name__] = ModelEntry(model=model, label=model.__name__, abstract=abstract)
+        return model
+
+    return decorate if cls is None else decorate(cls)
+
+
+def register_object_property(cls: T) -> T:
+    """Class decorator registering a model as an embedded ObjectProperty node type."""
+    _OBJECT_PROPERTIES[cls.__name__] = ModelEntry(model=cls, label=cls.__name__)
+    return cls
+
+
+def load_models() -> None:
+    """Import all model modules so that their registrations run."""
+    for module in MODEL_MODULES:
+        importlib.import_module(module)
+
+
+def _in_module_order(entries: dict[str, ModelEntry]) -> list[ModelEntry]:
+    # Registration order depends on which module happened to be imported
+    # first; order by MODEL_MODULES (then definition order) to stay stable.
+    def rank(item: tuple[int, ModelEntry]) -> tuple[int, int]:
+        seq, entry = item
+        module = entry.model.__module__
+        return (MODEL_MODULES.index(module) if module in MODEL_MODULES else len(MODEL_MODULES), seq)
+
+    return [entry for _, entry in sorted(enumerate(entries.values()), key=rank)]
+
+
+def entity_models() -> list[ModelEntry]:
+    load_models()
+    return _in_module_order(_ENTITIES)
+
+
+def object_property_models() -> list[ModelEntry]:
+    load_models()
+    return _in_module_order(_OBJECT_PROPERTIES)
+
+
+def schema_source_hash() -> str:
+    return hash_files(_SCHEMA_SOURCES)
+
+
+def build_ontology_schema() -> OntologySchema:
+    """Derive the ontology schema from the registered models (Pydantic introspection)."""
+    from neo4j_ontology_loader.schema.extract import (
+        all_relationship_types,
+        complex_properties_node_types,
+        complex_properties_relationship_types,
+        extract_node_type,
+        inheritance_relationship_types,
+        rollup_relationship_types,
+    )
+    from neo4j_ontology_loader.schema.szkb_specs import szkb_bond_entity
+
+    entities = [extract_node_type(e.model, abstract=e.abstract) for e in entity_models()]
+    # Bond is persisted in the flattened shape it has in the SZKB feed rather
+    # than derived from the nested Bond model.
+    entities.append(szkb_bond_entity())
+    return OntologySchema(
+        entities=entities,
+        relationship_types=all_relationship_types() + rollup_relationship_types(),
+        inheritance_relationship_types=inheritance_relationship_types(),
+        complex_properties=complex_properties_node_types(),
+        complex_property_relationship_types=complex_properties_relationship_types(),
+    )
+
+
+def _schema_from_dict(data: dict) -> OntologySchema:
+    def props(items: list[dict]) -> list[PropertyDef]:
+        return [PropertyDef(**p) for p in items]
+
+    def rels(items: list[dict]) -> list[RelTypeDef]:
+        return [RelTypeDef(**r) for r in items]
+
+    return OntologySchema(
+        entities=[EntityDef(**{**e, "properties": props(e["properties"])}) for e in data["entities"]],
+        relationship_types=rels(data["relationship_types"]),
+        inheritance_relationship_types=rels(data["inheritance_relationship_types"]),
+        complex_properties=[
+            ComplexPropertiesDef(**{**c, "properties": props(c["properties"])})
+            for c in data["complex_properties"]
+        ],
+        complex_property_relationship_types=rels(data["complex_property_relationship_types"]),
+    )
+
+
+def _cache_path(cache_dir: str | Path | None) -> Path:
+    if cache_dir is None:
+        from neo4j_ontology_loader.config import settings
+
+        cache_dir = settings.cache_dir
+    return Path(cache_dir) / f"schema-{schema_source_hash()}.json"
+
+
+def load_ontology_schema(cache_dir: str | Path | None = None, *, use_cache: bool = True) -> OntologySchema:
+    """Return the ontology schema, reading it from the on-disk cache when fresh.
+
+    The result is memoized per process (per cache directory). A missing,
+    stale or unreadable cache falls back to introspection and rewrites it.
+    """
+    if not use_cache:
+        return build_ontology_schema()
+    return _load_cached(str(_cache_path(cache_dir)))
+
+
+@lru_cache(maxsize=None)
+def _load_cached(path_str: str) -> OntologySchema:
+    logger = get_logger()
+    path = Path(path_str)
+    try:
+        return _schema_from_dict(json.loads(path.read_text(encoding="utf-8")))
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        logger.warning("schema cache unreadable path=%s error=%s", path, e)
+
+    schema = build_ontology_schema()
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(asdict(schema)), encoding="utf-8")
+        tmp.replace(path)
+    except OSError as e:
+        logger.warning("schema cache not written path=%s error=%s", path, e)
+        return schema
+    # Caches of earlier model sources are never read again
+    for stale in path.parent.glob("schema-*.json"):
+        if stale != path:
+            stale.unlink(missing_ok=True)
+    return schema
@@ -1,6 +1,241 @@
+import math
 from dataclasses import dataclass
 from typing import Callable, Iterable
 
+from neo4j_ontology_loader.schema.types import EntityDef, PropertyDef
+
+
+@dataclass(frozen=True)
+class NodeSpec:
+    label: str
+    # File stem in the SZKB base directory ('instruments' -> instruments.csv / .parquet / ...)
+    source: str
+    key: str = "id"
+    # Columns joined with ':' into the key when the feed has no single natural key
+    synthetic_key: tuple[str, ...] = ()
+    # Report rows without a key as skipped (they are never written either way)
+    require_key: bool = False
+    # Properties to persist; None means all properties of the label's model
+    fields: frozenset[str] | None = None
+    # Rows need a Python transformation that cannot be expressed in Cypher,
+    # so the table is always loaded client-side
+    client_only: bool = False
+    # Maps a raw feed row to the node's properties (None drops the row); must be
+    # a module-level function so worker processes can use it
+    transform: Callable[[dict], dict | None] | None = None
+    # Maps a prepared row to its nested ObjectProperty values by model field
+    # (see ingest.object_properties); module-level like ``transform``
+    objects: Callable[[dict], dict | None] | None = None
+    # Polars expressions doing what ``transform`` does, column-wise (see ingest.polars_io)
+    expressions: Callable[[list[str]], list] | None = None
+
+    def allowed_fields(self, entity: EntityDef) -> set[str]:
+        """Properties to persist: ``fields``, else those of the label's model."""
+        if self.fields is not None:
+            return set(self.fields)
+        return {p.name for p in entity.properties}
+
+    def chunk_plan(self, entity: EntityDef, *, validate: bool = False, object_properties: bool = False):
+        """The ``ChunkPlan`` that prepares chunks of this table for writing."""
+        from neo4j_ontology_loader.ingest.prepare import ChunkPlan, native_types
+
+        return ChunkPlan(
+            label=self.label,
+            key=self.key,
+            # Field filtering is a column projection; the MERGE key (synthetic or not) must survive it
+            columns=frozenset(self.allowed_fields(entity) | {self.key}),
+            synthetic_key=self.synthetic_key,
+            transform=self.transform,
+            expressions=self.expressions,
+            validate=validate,
+            types=native_types(entity),
+            objects=self.objects if object_properties else None,
+        )
+
+
+def _is_missing(value) -> bool:
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+
+def _interest_type(value) -> str | None:
+    s = str(value).strip().lower()
+    if not s or s == 'nan':
+        return None
+    if 'fixed' in s:
+        return 'fixed'
+    if 'variable' in s or 'float' in s:
+        return 'variable'
+    if 'stagger' in s:
+        return 'staggered'
+    return s
+
+
+def _payment_frequency(period) -> str | None:
+    s = str(period).strip().upper()
+    if not s or s == 'NAN':
+        return None
+    return {
+        'P1Y': 'annual',
+        'P6M': 'semiAnnual',
+        'P3M': 'quarterly',
+        'P1M': 'monthly',
+    }.get(s, 'other')
+
+
+def _float_or_none(value, scale: float = 1.0) -> float | None:
+    try:
+        return float(value) / scale if not _is_missing(value) else None
+    except (TypeError, ValueError):
+        return None
+
+
+def bond_from_szkb_row(r: dict) -> dict | None:
+    """Flat Bond properties (see ``szkb_bond_entity``) from a bonds.csv row; None without an id."""
+    if r.get('id') is None or str(r.get('id')).strip() == '':
+        return None
+    return {
+        'id': r.get('id'),
+        'isin': r.get('isin'),
+        'name': r.get('name@de') or r.get('shortName@de'),
+        'short_name': r.get('shortName@de'),
+        'currency_of_denomination': r.get('nominalCurrency'),
+        'denomination': r.get('denomination'),
+        'nominal_amount': r.get('nominalAmount'),
+        'issuer_id': r.get('issuerId'),
+        'interest_type': _interest_type(r.get('interestType')),
+        # Interest rate value in the feed is a percentage (e.g., 4.375), stored as decimal
+        'interest_rate': _float_or_none(r.get('actInterestRate'), 100.0),
+        'interest_payment_frequency': _payment_frequency(r.get('payFreqPeriod')),
+        'maturity_date': r.get('maturityDate'),
+        'last_coupon_date': r.get('lastCouponDate'),
+        'is_callable': r.get('isCallable'),
+        'underlying_id': r.get('underlyingId'),
+        'conversion_price_value': _float_or_none(r.get('exercisePrice')),
+        'conversion_price_currency': r.get('exercisePriceCurr'),
+    }
+
+
+def bond_polars_expressions(columns: list[str]) -> list:
+    """``bond_from_szkb_row`` as polars expressions over a bonds feed with ``columns``.
+
+    Rows without an id are dropped afterwards like any row without a key.
+    """
+    import polars as pl
+
+    def col(name: str) -> pl.Expr:
+        return pl.col(name) if name in columns else pl.lit(None, dtype=pl.String)
+
+    def text(name: str) -> pl.Expr:
+        return col(name).cast(pl.String).str.strip_chars()
+
+    def number(name: str, scale: float = 1.0) -> pl.Expr:
+        return col(name).cast(pl.String).cast(pl.Float64, strict=False) / scale
+
+    interest_type = text('interestType').str.to_lowercase()
+    frequency = text('payFreqPeriod').str.to_uppercase()
+    return [
+        col('id').alias('id'),
+        col('isin').alias('isin'),
+        pl.coalesce(col('name@de'), col('shortName@de')).alias('name'),
+        col('shortName@de').alias('short_name'),
+        col('nominalCurrency').alias('currency_of_denomination'),
+        col('denomination').alias('denomination'),
+        col('nominalAmount').alias('nominal_amount'),
+        col('issuerId').alias('issuer_id'),
+        pl.when(interest_type.is_in(['', 'nan']) | interest_type.is_null()).then(None)
+        .when(interest_type.str.contains('fixed', literal=True)).then(pl.lit('fixed'))
+        .when(interest_type.str.contains('variable|float')).then(pl.lit('variable'))
+        .when(interest_type.str.contains('stagger', literal=True)).then(pl.lit('staggered'))
+        .otherwise(interest_type)
+        .alias('interest_type'),
+        number('actInterestRate', 100.0).alias('interest_rate'),
+        pl.when(frequency.is_in(['', 'NAN']) | frequency.is_null()).then(None)
+        .otherwise(frequency.replace_strict(
+            {'P1Y': 'annual', 'P6M': 'semiAnnual', 'P3M': 'quarterly', 'P1M': 'monthly'},
+            default='other', return_dtype=pl.String,
+        ))
+        .alias('interest_payment_frequency'),
+        col('maturityDate').alias('maturity_date'),
+        col('lastCouponDate').alias('last_coupon_date'),
+        col('isCallable').alias('is_callable'),
+        col('underlyingId').alias('underlying_id'),
+        number('exercisePrice').alias('conversion_price_value'),
+        col('exercisePriceCurr').alias('conversion_price_currency'),
+    ]
+
+
+def _text(value) -> str | None:
+    if _is_missing(value) or str(value).strip() == '':
+        return None
+    return str(value).strip()
+
+
+def _value(model, **fields):
+    """``model(**fields)``, or None when the feed values do not form a valid value."""
+    from pydantic import ValidationError
+
+    try:
+        return model(**fields)
+    except ValidationError:
+        return None
+
+
+def bond_objects_from_row(row: dict) -> dict:
+    """Nested Bond values (by Bond model field) from a flat row produced by ``bond_from_szkb_row``."""
+    from neo4j_ontology_loader.models.types import (
+        Currency,
+        Date,
+        FinancialInstrumentIdentification,
+        InterestRate,
+        Longtext,
+        Price,
+        Shorttext,
+    )
+
+    def maybe(model, value, **extra):
+        return _value(model, value=value, **extra) if value is not None else None
+
+    isin = _text(row.get('isin'))
+    rate_type = _text(row.get('interest_type'))
+    price = row.get('conversion_price_value')
+    return {
+        'name': maybe(Longtext, _text(row.get('name')), language='de'),
+        'shortName': maybe(Shorttext, _text(row.get('short_name')), language='de'),
+        'identificationList': [
+            _value(FinancialInstrumentIdentification, identifier=isin, type='isin')
+        ] if isin else None,
+        'currencyOfDenomination': maybe(Currency, _text(row.get('currency_of_denomination'))),
+        'maturityDate': maybe(Date, _text(row.get('maturity_date'))),
+        'interestRate': _value(
+            InterestRate,
+            type=rate_type,
+            value=None if _is_missing(row.get('interest_rate')) else row.get('interest_rate'),
+            paymentFrequency=_text(row.get('interest_payment_frequency')),
+            paymentDate=maybe(Date, _text(row.get('last_coupon_date'))),
+        ) if rate_type else None,
+        'conversionPrice': _value(
+            Price,
+            type='actual',
+            value=price,
+            currency=maybe(Currency, _text(row.get('conversion_price_currency'))),
+        ) if not _is_missing(price) else None,
+    }
+
+
+def get_szkb_node_specs() -> list[NodeSpec]:
+    """SZKB node tables in load order."""
+    return [
+        NodeSpec(label="InstrumentType", source="instrument_types"),
+        NodeSpec(label="TradingVenue", source="trading_venues"),
+        # For Bond and Instrument we only keep the technical key 'id' (no CSV-derived attributes)
+        NodeSpec(label="Instrument", source="instruments", require_key=True, fields=frozenset({"id"})),
+        NodeSpec(label="Listing", source="listings"),
+        NodeSpec(label="CrossCurrencyRate", source="cross_rates", synthetic_key=("currency", "date")),
+        NodeSpec(label="Bond", source="bonds", require_key=True, fields=frozenset({"id"}), client_only=True,
+                 transform=bond_from_szkb_row, expressions=bond_polars_expressions, objects=bond_objects_from_row),
+        NodeSpec(label="Quote", source="quotes", synthetic_key=("listing_id", "quote_date")),
+    ]
+
 
 @dataclass(frozen=True)
 class RelSpec:
@@ -16,11 +251,16 @@ class RelSpec:
     build_rows: Callable[[Iterable[dict]], list[dict]]
 
 
+def _cell(row: dict, col: str) -> str:
+    value = row.get(col)
+    return "" if _is_missing(value) else str(value).strip()
+
+
 def _rows_from_simple_columns(rows: Iterable[dict], from_col: str, to_col: str) -> list[dict]:
     out: list[dict] = []
     for r in rows:
-        fv = str(r.get(from_col, "")).strip()
-        tv = str(r.get(to_col, "")).strip()
+        fv = _cell(r, from_col)
+        tv = _cell(r, to_col)
         if fv and tv:
             out.append({"from_value": fv, "to_value": tv})
     return out
@@ -30,9 +270,9 @@ def _rows_quote_of_listing(rows: Iterable[dict]) -> list[dict]:
     # From: Quote.listing_id -> To: Listing.id composed as instrument_id/trading_place_id
     out: list[dict] = []
     for r in rows:
-        market_id = str(r.get("listing_id", "")).strip()
-        instr_id = str(r.get("instrument_id", "")).strip()
-        quote_date = str(r.get("quote_date", "")).strip()
+        market_id = _cell(r, "listing_id")
+        instr_id = _cell(r, "instrument_id")
+        quote_date = _cell(r, "quote_date")
         if market_id and instr_id and quote_date:
             listing_composite_id = f"{instr_id}/{market_id}"
             out.append({"from_value": market_id, "to_value": listing_composite_id})
@@ -77,3 +317,34 @@ def get_szkb_relationship_specs() -> list[RelSpec]:
             build_rows=_rows_quote_of_listing,
         ),
     ]
+
+
+def szkb_bond_entity() -> EntityDef:
+    """Flat Bond node type as loaded from SZKB bonds.csv.
+
+    The Bond model has nested complex fields; we only persist what we can
+    reliably map from the SZKB feed.
+    """
+    return EntityDef(
+        name="Bond",
+        key="bond",
+        properties=[
+            PropertyDef(name="id", type="str", required=True, unique=True),
+            PropertyDef(name="isin", type="str", required=False, unique=True),
+            PropertyDef(name="name", type="str", required=False, unique=False),
+            PropertyDef(name="short_name", type="str", required=False, unique=False),
+            PropertyDef(name="currency_of_denomination", type="str", required=False, unique=False),
+            PropertyDef(name="denomination", type="float", required=False, unique=False),
+            PropertyDef(name="nominal_amount", type="float", required=False, unique=False),
+            PropertyDef(name="issuer_id", type="str", required=False, unique=False),
+            PropertyDef(name="interest_type", type="str", required=False, unique=False),
+            PropertyDef(name="interest_rate", type="float", required=False, unique=False),
+            PropertyDef(name="interest_payment_frequency", type="str", required=False, unique=False),
+            PropertyDef(name="maturity_date", type="date", required=False, unique=False),
+            PropertyDef(name="last_coupon_date", type="date", required=False, unique=False),
+            PropertyDef(name="is_callable", type="bool", required=False, unique=False),
+            PropertyDef(name="underlying_id", type="str", required=False, unique=False),
+            PropertyDef(name="conversion_price_value", type="float", required=False, unique=False),
+            PropertyDef(name="conversion_price_currency", type="str", required=False, unique=False),
+        ],
+    )
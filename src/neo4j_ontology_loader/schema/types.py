@@ -8,6 +8,10 @@ class PropertyDef:
     required: bool
     unique: bool
 
+# Content-derived key of materialized ObjectProperty nodes (see ingest.object_properties)
+OBJECT_PROPERTY_KEY = "id"
+
+
 @dataclass(frozen=True)
 class ComplexPropertiesDef:
     """Schema definition for an ObjectProperty node type.
@@ -39,3 +43,23 @@ class RelTypeDef:
     def __iter__(self):
         # convenience unpacking (name, from_label, to_label, from_key, to_key)
         return iter((self.name, self.from_label, self.to_label, self.from_key, self.to_key))
+
+
+@dataclass(frozen=True)
+class OntologySchema:
+    """All schema definitions derived from the registered models.
+
+    Built once from Pydantic introspection and cached on disk (see
+    schema.registry) so that later runs can skip the introspection.
+    """
+    entities: list[EntityDef]
+    relationship_types: list[RelTypeDef]
+    inheritance_relationship_types: list[RelTypeDef]
+    complex_properties: list[ComplexPropertiesDef]
+    complex_property_relationship_types: list[RelTypeDef]
+
+    def entity(self, label: str) -> EntityDef | None:
+        for node in self.entities:
+            if node.name == label:
+                return node
+        return None
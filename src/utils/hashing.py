@@ -0,0 +1,18 @@
+import hashlib
+from pathlib import Path
+from typing import Iterable
+
+
+def hash_files(paths: Iterable[Path]) -> str:
+    """Return a short, stable content hash over the given files.
+
+    Files are hashed in sorted path order together with their names so that
+    renames and reordering change the digest as well as edits.
+    """
+    digest = hashlib.sha256()
+    for path in sorted(Path(p) for p in paths):
+        digest.update(path.name.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(path.read_bytes())
+        digest.update(b"\0")
+    return digest.hexdigest()[:16]
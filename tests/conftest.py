@@ -1,8 +1,125 @@
 import sys
 from pathlib import Path
 
+import pytest
+
 # Ensure "src" is on sys.path for imports when running tests from repo root
 ROOT = Path(__file__).resolve().parents[1]
 SRC = ROOT / "src"
 if str(SRC) not in sys.path:
     sys.path.insert(0, str(SRC))
+
+
+@pytest.fixture(scope="session")
+def _cache_dir(tmp_path_factory):
+    return tmp_path_factory.mktemp("nolo-cache")
+
+
+@pytest.fixture(autouse=True)
+def _isolated_cache_dir(_cache_dir, monkeypatch):
+    """Keep the schema and Parquet caches out of the user's ~/.cache during tests."""
+    from neo4j_ontology_loader.config import settings
+
+    monkeypatch.setenv("NOLO_CACHE_DIR", str(_cache_dir))
+    monkeypatch.setattr(settings, "cache_dir", str(_cache_dir))
+
+
+class FakeRecord(dict):
+    """A driver record: access by name or position, plus ``data()``."""
+
+    def __getitem__(self, key):
+        return list(self.values())[key] if isinstance(key, int) else super().__getitem__(key)
+
+    def data(self):
+        return dict(self)
+
+
+class FakeResult:
+    """A driver result over ``records``, pulled lazily as the real one is."""
+
+    def __init__(self, records=()):
+        self._records = iter(records)
+
+    def __iter__(self):
+        return self._records
+
+    def single(self):
+        return next(self._records, None)
+
+    def consume(self):
+        for _ in self._records:
+            pass
+
+    def to_df(self, expand=False):
+        import pandas as pd
+
+        return pd.DataFrame([record.data() for record in self._records])
+
+
+class FakeGraph:
+    """Driver, session and transaction in one object that records every statement.
+
+    ``answer(query, params)`` gives the records a statement returns (dicts
+    become ``FakeRecord``s; a generator is pulled lazily) and ``fail(query,
+    params)`` an exception to raise instead of running it.
+    """
+
+    def __init__(self, answer=None, fail=None):
+        self.answer = answer or (lambda query, params: [])
+        self.fail = fail or (lambda query, params: None)
+        # (query, params) of every statement run, in order
+        self.queries = []
+        # Keyword arguments of every session opened
+        self.sessions = []
+        self.closed = 0
+
+    def session(self, **kwargs):
+        self.sessions.append(kwargs)
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.closed += 1
+        return False
+
+    def run(self, query, parameters=None, **params):
+        params = {**(parameters or {}), **params}
+        error = self.fail(query, params)
+        if error is not None:
+            raise error
+        self.queries.append((query, params))
+        return FakeResult(FakeRecord(r) if isinstance(r, dict) else r for r in self.answer(query, params))
+
+    def execute_write(self, work, *args, **kwargs):
+        return work(self, *args, **kwargs)
+
+    execute_read = execute_write
+
+    def begin_transaction(self):
+        return self
+
+    def commit(self):
+        self.queries.append(("COMMIT", {}))
+
+    def rollback(self):
+        self.queries.append(("ROLLBACK", {}))
+
+    def statements(self, fragment: str = "") -> list[str]:
+        return [query for query, _ in self.queries if fragment in query]
+
+    def written(self, fragment: str = "") -> list[dict]:
+        """The ``rows`` parameter of the statements containing ``fragment``, concatenated."""
+        return [row for query, params in self.queries if fragment in query for row in params.get("rows", ())]
+
+
+@pytest.fixture
+def fake_graph():
+    """The ``FakeGraph`` class, for tests that configure or subclass it."""
+    return FakeGraph
+
+
+@pytest.fixture
+def graph():
+    return FakeGraph()
@@ -0,0 +1,83 @@
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+import pyarrow.parquet as pq  # noqa: E402
+
+from neo4j_ontology_loader.ingest.arrow_io import (  # noqa: E402
+    add_joined_column,
+    cached_parquet_for_csv,
+    drop_empty,
+    input_format,
+    iter_record_batches,
+)
+from neo4j_ontology_loader.ingest.pandas_io import iter_csv_chunks  # noqa: E402
+from neo4j_ontology_loader.ingest.prepare import ChunkPlan, prepare_chunk  # noqa: E402
+
+
+def _quotes_table():
+    return pa.table({
+        "listing_id": ["4411", "4412", None],
+        "quote_date": ["2024-01-01", "2024-01-02", "2024-01-03"],
+        "quote": [1.0, 2.0, 3.0],
+        "source": ["a", "b", "c"],
+    })
+
+
+def test_input_format_by_suffix():
+    assert input_format("q.parquet") == "parquet"
+    assert input_format("q.arrow") == "arrow"
+    assert input_format("q.csv") == "csv"
+
+
+def test_parquet_batches_follow_row_groups_and_projection(tmp_path):
+    path = tmp_path / "quotes.parquet"
+    pq.write_table(_quotes_table(), path, row_group_size=2)
+    batches = list(iter_record_batches(str(path), columns={"listing_id", "quote", "missing"}))
+    assert [b.num_rows for b in batches] == [2, 1]
+    assert batches[0].schema.names == ["listing_id", "quote"]
+
+
+def test_arrow_ipc_batches(tmp_path):
+    path = tmp_path / "quotes.arrow"
+    table = _quotes_table()
+    with pa.OSFile(str(path), "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table, max_chunksize=2)
+    rows = [r for b in iter_record_batches(str(path), columns=["quote"]) for r in b.to_pylist()]
+    assert rows == [{"quote": 1.0}, {"quote": 2.0}, {"quote": 3.0}]
+
+
+def test_synthetic_id_and_drop_empty():
+    batch = _quotes_table().to_batches()[0]
+    batch = add_joined_column(batch, "id", ["listing_id", "quote_date"], ":")
+    kept, dropped = drop_empty(batch, "id")
+    assert dropped == 1
+    assert kept.column("id").to_pylist() == ["4411:2024-01-01", "4412:2024-01-02"]
+
+
+def test_csv_conversion_is_cached(tmp_path):
+    csv = tmp_path / "quotes.csv"
+    csv.write_text("listing_id,quote\n4411,1.5\n", encoding="utf-8")
+    first = cached_parquet_for_csv(str(csv), str(tmp_path / "cache"))
+    assert cached_parquet_for_csv(str(csv), str(tmp_path / "cache")) == first
+    assert pq.read_table(first).to_pylist() == [{"listing_id": 4411, "quote": 1.5}]
+
+
+def test_converted_csv_gives_the_ids_and_values_of_the_csv_path(tmp_path):
+    csv = tmp_path / "quotes.csv"
+    csv.write_text("listing_id,quote_date,quote\n4411,2024-01-01,1.5\n,2024-01-02,1.6\n0042,2024-01-03,\n")
+    plan = ChunkPlan(
+        label="Quote", synthetic_key=("listing_id", "quote_date"), types=(("listing_id", "str"), ("quote", "float"))
+    )
+
+    parquet = cached_parquet_for_csv(str(csv), str(tmp_path / "cache"), text_columns=plan.text_columns())
+
+    def rows(chunks):
+        return [row for chunk in chunks for row in prepare_chunk(chunk, plan).rows.records(drop_missing=True)]
+
+    converted = rows(iter_record_batches(parquet))
+    assert converted == rows(iter_csv_chunks(str(csv), dtype=plan.csv_dtypes()))
+    assert [(row["id"], row["listing_id"]) for row in converted] == [
+        ("4411:2024-01-01", "4411"), ("0042:2024-01-03", "0042"),
+    ]
+    # Typed differently, so cached separately
+    assert cached_parquet_for_csv(str(csv), str(tmp_path / "cache")) != parquet
@@ -0,0 +1,42 @@
+import subprocess
+import sys
+import textwrap
+
+from conftest import SRC
+
+
+HEAVY_MODULES = (
+    "pandas",
+    "neo4j",
+    "neo4j_ontology_loader.models.types",
+    "neo4j_ontology_loader.schema.extract",
+)
+
+
+def _heavy_modules_loaded_after(code: str) -> set[str]:
+    """Run ``code`` in a fresh interpreter and report which heavy modules it imported."""
+    probe = textwrap.dedent(
+        f"""
+        import sys
+        sys.path.insert(0, {str(SRC)!r})
+        {code}
+        print("LOADED=" + ",".join(m for m in {HEAVY_MODULES!r} if m in sys.modules))
+        """
+    )
+    out = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True, check=True)
+    loaded = out.stdout.strip().splitlines()[-1].removeprefix("LOADED=")
+    return {m for m in loaded.split(",") if m}
+
+
+def test_cli_import_does_not_load_heavy_dependencies():
+    assert _heavy_modules_loaded_after("import neo4j_ontology_loader.cli") == set()
+
+
+def test_cli_help_does_not_load_heavy_dependencies():
+    code = "from typer.testing import CliRunner; from neo4j_ontology_loader.cli import app; CliRunner().invoke(app, ['--help'])"
+    assert _heavy_modules_loaded_after(code) == set()
+
+
+def test_schema_extract_does_not_import_models_eagerly():
+    loaded = _heavy_modules_loaded_after("import neo4j_ontology_loader.schema.extract")
+    assert "neo4j_ontology_loader.models.types" not in loaded
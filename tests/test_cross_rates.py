@@ -0,0 +1,55 @@
+from datetime import datetime, timezone
+
+import pandas as pd
+
+from neo4j_ontology_loader.ingest.pandas_io import to_utc_datetime
+from neo4j_ontology_loader.queries.cross_rates import convert_amounts, rates_as_of
+
+UTC = timezone.utc
+RATES = {
+    "USD": [(datetime(2024, 1, 1, tzinfo=UTC), 0.90), (datetime(2024, 1, 3, tzinfo=UTC), 0.85)],
+    "EUR": [(datetime(2024, 1, 1, tzinfo=UTC), 0.95)],
+}
+
+
+def rate_lookups(query, params):
+    records = []
+    for lookup in params["lookups"]:
+        older = [(d, r) for d, r in RATES.get(lookup["currency"], []) if d <= lookup["at"]]
+        if older:
+            date, rate = max(older)
+            records.append({"idx": lookup["idx"], "rate": rate, "date": date})
+    return records
+
+
+def test_rates_as_of_batches_and_dedupes(fake_graph):
+    graph = fake_graph(answer=rate_lookups)
+    rates = rates_as_of(
+        [
+            ("USD", "2024-01-02T12:00:00Z"),
+            ("USD", datetime(2024, 1, 5)),
+            ("USD", "2024-01-02T12:00:00+00:00"),
+            ("EUR", "2023-12-31"),
+            ("CHF", "2024-01-02"),
+        ],
+        driver=graph,
+    )
+    assert rates == [0.90, 0.85, 0.90, None, 1.0]
+    # One round trip; the duplicate lookup and the base currency are not sent
+    assert len(graph.queries) == 1 and len(graph.queries[0][1]["lookups"]) == 3
+
+
+def test_convert_amounts_across_currencies(fake_graph):
+    out = convert_amounts(
+        [100.0, 100.0, 5.0], ["USD", "CHF", "XXX"], ["2024-01-04"] * 3, "EUR", driver=fake_graph(answer=rate_lookups)
+    )
+    assert out[0] == 100.0 * 0.85 / 0.95
+    assert out[1] == 100.0 / 0.95
+    assert out[2] is None
+
+
+def test_to_utc_datetime_parses_iso_and_keeps_missing():
+    out = to_utc_datetime(pd.Series(["2024-01-01", "2024-01-01T10:00:00+02:00", None, "garbage"]))
+    assert out[0] == pd.Timestamp("2024-01-01", tz="UTC")
+    assert out[1] == pd.Timestamp("2024-01-01T08:00:00", tz="UTC")
+    assert out[2] is None and out[3] is None
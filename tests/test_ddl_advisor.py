@@ -0,0 +1,81 @@
+import pytest
+
+from neo4j_ontology_loader.schema import ddl_advisor
+from neo4j_ontology_loader.schema.ddl_advisor import (
+    ExistingIndex,
+    IndexNeed,
+    advise,
+    apply_indexes,
+    load_index_needs,
+    planned_unique_keys,
+)
+from neo4j_ontology_loader.schema.ddl_szkb import szkb_loading_indexes
+from neo4j_ontology_loader.schema.registry import load_ontology_schema
+
+
+def _index(name, label, props, type="RANGE", **kwargs):
+    row = {"name": name, "type": type, "entityType": "NODE", "labelsOrTypes": [label], "properties": props}
+    row.update(kwargs)
+    return row
+
+
+def test_szkb_needs_skip_constrained_keys():
+    schema = load_ontology_schema()
+    needs = {(n.label, n.properties): n for n in load_index_needs(schema)}
+
+    # Quote is MERGEd by its synthetic id and matched by listing_id for QuoteOfListing
+    assert "MERGE key of quotes" in needs[("Quote", ("id",))].reasons
+    assert needs[("Quote", ("listing_id",))].reasons == ("QuoteOfListing start",)
+    assert ("Listing", ("id",)) in planned_unique_keys(schema)
+
+    statements = szkb_loading_indexes(schema)
+    assert "CREATE INDEX IF NOT EXISTS FOR (n:Quote) ON (n.id)" in statements
+    assert "CREATE INDEX IF NOT EXISTS FOR (n:CrossCurrencyRate) ON (n.currency, n.date)" in statements
+    # Left to the uniqueness constraint install-schema creates
+    assert not any("(n:Listing)" in s or "(n:Currency)" in s for s in statements)
+
+
+def test_advise_reports_missing_pending_redundant_and_unused():
+    needs = [
+        IndexNeed("Quote", ("id",), ("MERGE key of quotes",)),
+        IndexNeed("Quote", ("listing_id",), ("QuoteOfListing start",)),
+        IndexNeed("Listing", ("id",), ("MERGE key of listings",)),
+    ]
+    existing = [
+        ExistingIndex("quote_listing", "RANGE", "Quote", ("listing_id",), read_count=0),
+        ExistingIndex("listing_id_unique", "RANGE", "Listing", ("id",), constraint="listing_id_unique"),
+        ExistingIndex("listing_id_copy", "RANGE", "Listing", ("id",), read_count=0),
+        ExistingIndex("venue_name", "RANGE", "TradingVenue", ("name",), read_count=0),
+        ExistingIndex("venue_name_text", "TEXT", "TradingVenue", ("name",), read_count=12),
+    ]
+
+    advice = advise(needs, {("Listing", ("id",)), ("Quote", ("listing_id",))}, existing)
+
+    assert [n.label + "." + n.properties[0] for n in advice.missing] == ["Quote.id"]
+    # Served by existing indexes, whether or not a constraint is planned for them
+    assert advice.uninstalled_constraints == []
+    assert [(ix.name, why) for ix, why in advice.redundant] == [
+        ("listing_id_copy", "same RANGE index as constraint listing_id_unique")
+    ]
+    # Needed indexes are kept even without reads (yet)
+    assert [ix.name for ix in advice.unused] == ["venue_name"]
+
+    pending = advise(needs[2:], {("Listing", ("id",))}, [])
+    assert pending.missing == [] and [n.label for n in pending.uninstalled_constraints] == ["Listing"]
+
+
+def test_apply_indexes_creates_in_parallel_and_awaits(monkeypatch, fake_graph):
+    created = []
+    monkeypatch.setattr(ddl_advisor, "run_statement", lambda driver, cypher: created.append(cypher))
+    indexes = [_index("quote_id", "Quote", ["id"], state="ONLINE")]
+    graph = fake_graph(answer=lambda query, params: indexes if query.startswith("SHOW INDEXES") else [])
+    statements = [f"CREATE INDEX IF NOT EXISTS FOR (n:L{i}) ON (n.id)" for i in range(6)]
+
+    apply_indexes(graph, statements, concurrency=3, timeout=30)
+
+    assert sorted(created) == sorted(statements)
+    assert graph.statements()[0] == "CALL db.awaitIndexes($timeout)"
+
+    indexes.append(_index("quote_listing", "Quote", ["listing_id"], state="FAILED"))
+    with pytest.raises(RuntimeError, match="quote_listing"):
+        apply_indexes(graph, [])
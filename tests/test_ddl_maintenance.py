@@ -0,0 +1,75 @@
+import pytest
+
+from neo4j_ontology_loader.schema.ddl_maintenance import clean_database, clean_selection
+
+
+class LabelCounts:
+    """Answers for a tiny database: counts per label that delete statements drain in passes."""
+
+    def __init__(self, edition="community", counts=None):
+        self.edition = edition
+        self.counts = dict(counts or {})
+
+    def __call__(self, query, params):
+        if "dbms.components" in query:
+            return [[self.edition]]
+        if "db.info" in query:
+            return [["neo4j"]]
+        if "db.labels" in query:
+            return [[label] for label in self.counts]
+        if query.startswith("SHOW") or "relationshipTypes" in query:
+            return []
+        for label in self.counts:
+            if f"(n:`{label}`)" in query:
+                if "count(n)" in query:
+                    return [[self.counts[label]]]
+                # Each pass deletes at most 100 nodes to exercise the loop
+                self.counts[label] = max(0, self.counts[label] - 100)
+                return []
+        if "count(n)" in query:
+            return [[sum(self.counts.values())]]
+        return []
+
+
+def test_auto_mode_recreates_on_enterprise(fake_graph):
+    graph = fake_graph(answer=LabelCounts(edition="enterprise"))
+    report = clean_database(graph)
+    assert report.mode == "recreate"
+    assert "CREATE OR REPLACE DATABASE `neo4j` WAIT" in graph.statements()
+    assert {"database": "system"} in graph.sessions
+
+
+def test_recreate_mode_requires_enterprise(fake_graph):
+    with pytest.raises(RuntimeError):
+        clean_database(fake_graph(answer=LabelCounts()), mode="recreate")
+
+
+def test_delete_mode_loops_per_label_until_empty(fake_graph):
+    graph = fake_graph(answer=LabelCounts(counts={"Quote": 250, "Listing": 20}))
+    progress = []
+    report = clean_database(graph, progress=lambda *a: progress.append(a))
+    assert report.mode == "delete"
+    assert report.nodes_deleted == 270
+    assert report.per_target == {"Quote": 250, "Listing": 20}
+    deletes = [q for q in graph.statements("DETACH DELETE") if "`Quote`" in q]
+    assert len(deletes) == 3
+    assert "IN 4 CONCURRENT TRANSACTIONS OF 10000 ROWS" in deletes[0]
+    assert progress[-1][0] == "Listing"
+
+
+def test_selective_clean_by_date_range(fake_graph):
+    graph = fake_graph(answer=LabelCounts(counts={"Quote": 50}))
+    report = clean_selection(graph, ["Quote"], date_from="2024-01-01", date_to="2024-02-01", concurrency=1)
+    assert report.nodes_deleted == 50
+    query, params = next(q for q in graph.queries if "DETACH DELETE" in q[0])
+    assert "n.`quote_date` >= datetime($date_from)" in query
+    assert "n.`quote_date` < datetime($date_to)" in query
+    assert "toString" not in query
+    assert "CONCURRENT" not in query
+    assert params == {"date_from": "2024-01-01", "date_to": "2024-02-01"}
+    assert not graph.statements("DROP ")
+
+
+def test_selective_clean_rejects_label_without_date_property(fake_graph):
+    with pytest.raises(ValueError):
+        clean_selection(fake_graph(answer=LabelCounts(counts={"Listing": 1})), ["Listing"], date_from="2024-01-01")
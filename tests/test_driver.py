@@ -0,0 +1,65 @@
+from neo4j_ontology_loader.config import Settings
+from neo4j_ontology_loader.neo4j import driver as driver_module
+from neo4j_ontology_loader.neo4j.driver import (
+    close_shared_drivers,
+    create_driver,
+    driver_config,
+    shared_driver,
+    shared_drivers,
+)
+
+
+def _settings(**overrides) -> Settings:
+    return Settings().with_overrides(neo4j_warm_up=False, **overrides)
+
+
+def test_with_overrides_ignores_none():
+    base = Settings()
+    assert base.with_overrides(neo4j_fetch_size=None) == base
+    assert base.with_overrides(neo4j_fetch_size=50).neo4j_fetch_size == 50
+
+
+def test_driver_config_only_sets_database_when_given():
+    assert "database" not in driver_config(_settings(neo4j_database=None))
+    assert driver_config(_settings(neo4j_database="staging"))["database"] == "staging"
+
+
+def test_create_driver_applies_pool_and_session_defaults():
+    driver = create_driver(_settings(neo4j_database="staging", neo4j_fetch_size=250, neo4j_max_connection_pool_size=7))
+    try:
+        # Creating a driver does not connect; session defaults come from the driver config
+        with driver.session() as session:
+            assert session._config.database == "staging"
+            assert session._config.fetch_size == 250
+    finally:
+        driver.close()
+
+
+def test_shared_driver_is_reused_per_config(monkeypatch):
+    created = []
+
+    class FakeDriver:
+        def close(self):
+            created.remove(self)
+
+    def fake_create(config):
+        created.append(FakeDriver())
+        return created[-1]
+
+    monkeypatch.setattr(driver_module, "create_driver", fake_create)
+    a = shared_driver(_settings())
+    assert shared_driver(_settings()) is a
+    b = shared_driver(_settings(neo4j_database="other"))
+    assert b is not a and len(created) == 2
+    close_shared_drivers()
+    assert created == []
+
+
+def test_shared_drivers_give_each_target_database_its_own_driver(monkeypatch):
+    monkeypatch.setattr(driver_module, "create_driver", lambda config: config.neo4j_database)
+    try:
+        drivers = shared_drivers(_settings(neo4j_database="prod"), [None, "staging"])
+        assert drivers == {"prod": "prod", "staging": "staging"}
+        assert shared_drivers(_settings(), [None]) == {"default": None}
+    finally:
+        driver_module._shared.clear()
@@ -0,0 +1,83 @@
+from neo4j_ontology_loader.ingest.element_ids import ElementIdCache
+from neo4j_ontology_loader.ingest.relationship import ingest_relationships
+
+
+NODES = {
+    "Quote": {f"q{i}": [f"4:x:{i}"] for i in range(6)},
+    "Listing": {"L1": ["4:x:100"], "L2": ["4:x:101"]},
+    # Quotes by their non-unique listing_id
+    "QuoteByListing": {"L1": ["4:x:1", "4:x:3"], "L2": ["4:x:0"]},
+}
+
+
+def answer(query, params):
+    # Key lookups: UNWIND $values ... RETURN value, elementId(n)
+    if "values" not in params:
+        return []
+    label, key = query.split("MATCH (n:")[1].split(" {")[0], query.split("{")[1].split(":")[0]
+    nodes = NODES["QuoteByListing" if key == "listing_id" else label]
+    return [{"value": v, "element_id": e} for v in params["values"] for e in nodes.get(v, [])]
+
+
+def lookups(graph):
+    return [list(params["values"]) for _, params in graph.queries if "values" in params]
+
+
+def writes(graph):
+    return [(query, params) for query, params in graph.queries if "rows" in params]
+
+
+def test_resolve_fetches_only_unknown_keys_once(fake_graph):
+    graph = fake_graph(answer=answer)
+    cache = ElementIdCache()
+    expected = {"L1": ("4:x:100",), "L2": ("4:x:101",)}
+    assert cache.resolve(graph, "Listing", "id", ["L1", "L2", "missing"]) == expected
+    assert cache.resolve(graph, "Listing", "id", ["L1", "L2"]) == expected
+    assert len(lookups(graph)) == 1
+
+
+def test_bounded_per_label_and_evicted_per_phase():
+    cache = ElementIdCache(max_per_label=2)
+    cache.capture("Listing", "id", [("a", "1"), ("b", "2"), ("c", "3")])
+    cache.capture("Quote", "id", [("q", "9")])
+    assert len(cache) == 3
+    cache.evict(["Listing"])
+    assert len(cache) == 1
+    cache.evict()
+    assert len(cache) == 0
+
+
+def test_relationships_written_by_element_id(fake_graph):
+    graph = fake_graph(answer=answer)
+    cache = ElementIdCache()
+    rows = [{"quote": f"q{i}", "listing": "L1" if i % 2 else "L2"} for i in range(6)]
+    rows.append({"quote": "q0", "listing": "unknown"})
+    ingest_relationships(
+        graph, "QuoteOfListing", "Quote", "id", "Listing", "id", rows, "quote", "listing",
+        batch_size=3, id_cache=cache,
+    )
+    cypher, params = writes(graph)[0]
+    assert "elementId(a) = row.from_id" in cypher
+    assert params["rows"][0] == {"from_id": "4:x:0", "to_id": "4:x:101", "props": {}}
+    assert sum(len(p["rows"]) for _, p in writes(graph)) == 6
+    # Listings are looked up once, then served from the cache
+    listing_lookups = [values for values in lookups(graph) if values and values[0].startswith(("L", "u"))]
+    assert sorted(listing_lookups[0]) == ["L1", "L2"]
+    assert listing_lookups[1:] == [["unknown"]]
+
+
+def test_endpoints_on_a_non_unique_key_keep_all_nodes(fake_graph):
+    graph = fake_graph(answer=answer)
+    cache = ElementIdCache()
+    rows = [{"listing": "L1", "listing_id": "L1"}, {"listing": "L2", "listing_id": "L2"}]
+    for _ in range(2):  # the second pass is served from the cache
+        ingest_relationships(
+            graph, "QuoteOfListing", "Quote", "listing_id", "Listing", "id", rows, "listing_id", "listing",
+            id_cache=cache,
+        )
+    first, second = (p["rows"] for _, p in writes(graph))
+    assert first == second
+    assert sorted((r["from_id"], r["to_id"]) for r in first) == [
+        ("4:x:0", "4:x:101"), ("4:x:1", "4:x:100"), ("4:x:3", "4:x:100"),
+    ]
+    assert len(lookups(graph)) == 2
@@ -0,0 +1,70 @@
+import pytest
+from neo4j.exceptions import ConstraintError, ServiceUnavailable, TransientError
+
+from neo4j_ontology_loader.ingest.nodes import ingest_nodes
+from neo4j_ontology_loader.neo4j.execution import RetryPolicy, WriteMetrics, is_retryable, run_write
+
+NO_WAIT = RetryPolicy(max_attempts=3, initial_delay=0.0)
+
+
+def test_retryable_classification():
+    assert is_retryable(TransientError("deadlock"))
+    assert is_retryable(ServiceUnavailable("leader switch"))
+    assert not is_retryable(ConstraintError("duplicate"))
+    assert not is_retryable(ValueError("bug"))
+
+
+def test_backoff_is_capped_and_jittered():
+    policy = RetryPolicy(initial_delay=1.0, max_delay=4.0, multiplier=2.0, jitter=0.5)
+    delays = [policy.delay(n) for n in (1, 2, 3, 10)]
+    assert 0.5 <= delays[0] <= 1.5
+    assert 1.0 <= delays[1] <= 3.0
+    assert 2.0 <= delays[3] <= 6.0
+
+
+def test_run_write_retries_escaped_transient_errors(fake_graph):
+    errors = [ServiceUnavailable("gone"), TransientError("deadlock")]
+    driver = fake_graph(fail=lambda query, params: errors.pop(0) if errors else None)
+    metrics = WriteMetrics()
+
+    def work(tx, value):
+        tx.run("RETURN $v", v=value)
+        return value
+
+    assert run_write(driver, work, 42, rows=1, policy=NO_WAIT, metrics=metrics) == 42
+    assert sum(metrics.retries.values()) == 2
+    assert sum(metrics.attempt_errors.values()) == 2
+    assert metrics.units == 1 and metrics.rows == 1
+    # One explicit commit; the driver's own retries are not involved
+    assert driver.statements("COMMIT") == ["COMMIT"]
+
+
+def test_run_write_gives_up_after_max_attempts(fake_graph):
+    driver = fake_graph(fail=lambda query, params: TransientError("deadlock"))
+    metrics = WriteMetrics()
+    with pytest.raises(TransientError):
+        run_write(driver, lambda tx: tx.run("RETURN 1"), policy=NO_WAIT, metrics=metrics)
+    assert sum(metrics.retries.values()) == 2
+    assert sum(metrics.failures.values()) == 1
+
+
+def test_ingest_nodes_batches_and_isolates_bad_rows(fake_graph):
+    def fail(query, params):
+        # The whole batch and the single bad row violate a constraint
+        rows = params.get("rows") or [{"key_value": params.get("key_value")}]
+        if any(r["key_value"] == "bad" for r in rows):
+            return ConstraintError("duplicate")
+        return None
+
+    driver = fake_graph(fail=fail)
+    rows = [{"id": "a"}, {"id": None}, {"id": "bad"}, {"id": "b"}, {"id": "c"}]
+    ingest_nodes(driver, label="Quote", key="id", rows=rows, batch_size=2, policy=NO_WAIT, metrics=WriteMetrics())
+
+    written = []
+    for _, params in driver.queries:
+        if "rows" in params:
+            written += [r["key_value"] for r in params["rows"]]
+        elif "key_value" in params:
+            written.append(params["key_value"])
+    # Batch [a, bad] falls back to row-by-row; the empty key is skipped up front
+    assert written == ["a", "b", "c"]
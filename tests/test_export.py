@@ -0,0 +1,139 @@
+import csv
+import re
+from datetime import date, datetime, timezone
+
+import pyarrow.parquet as pq
+
+from neo4j_ontology_loader.queries.export import export_graph, node_page_cypher
+
+QUOTES = [
+    {
+        "id": f"q{i:03d}",
+        "price": float(i),
+        "quote_date": datetime(2024, 1, 1 + i % 28, tzinfo=timezone.utc),
+        # Stored before typed loads: numbers in a str property, a property empty on the first pages
+        "venue": i if i % 2 else f"v{i}",
+        "volume": i if i >= 200 else None,
+    }
+    for i in range(250)
+]
+LISTINGS = [{"id": f"l{i}", "name": f"listing {i}", "listed": date(2020, 1, 1 + i)} for i in range(3)]
+ISSUERS = [{"lei": f"LEI{i}", "name": f"issuer {i}"} for i in range(2)]
+RATINGS = [{"element_id": f"4:x:{i}", "grade": g} for i, g in enumerate(["AA", "B", "AA"])]
+ENTITIES = [
+    {"label": "FinancialInstrument", "properties": [], "abstract": True},
+    {
+        "label": "Issuer",
+        "properties": [{"name": "lei", "type": "str", "unique": True}, {"name": "name", "type": "str"}],
+    },
+    {
+        "label": "Listing",
+        "properties": [
+            {"name": "id", "type": "str", "unique": True},
+            {"name": "listed", "type": "date | None"},
+            {"name": "name", "type": "str"},
+        ],
+    },
+    {
+        # As in the ontology: the synthetic id Quotes are loaded by is not declared, nor is any unique property
+        "label": "Quote",
+        "properties": [
+            {"name": "price", "type": "float"},
+            {"name": "quote_date", "type": "datetime"},
+            {"name": "venue", "type": "str"},
+            {"name": "volume", "type": "int | None"},
+        ],
+    },
+    {"label": "Rating", "properties": [{"name": "grade", "type": "str"}]},
+]
+RELS = [{"type": "QuoteOfListing", "from_label": "Quote", "to_label": "Listing"}]
+
+
+NODES = {"Quote": QUOTES, "Listing": LISTINGS, "Issuer": ISSUERS, "Rating": RATINGS}
+# Property (or elementId) each label is paged by: the load key, a unique property, else elementId
+KEYS = {"Quote": "id", "Listing": "id", "Issuer": "lei", "Rating": "element_id"}
+EDGES = {q["id"]: f"l{i % 3}" for i, q in enumerate(QUOTES)}
+
+
+def answer(query, params):
+    """Serves the schema, counts, split points and key-range pages of ``NODES``."""
+    if "HAS_PROPERTY" in query:
+        return [{"label": e["label"], "properties": e["properties"]} for e in ENTITIES if not e.get("abstract")]
+    if "RelType" in query:
+        return RELS
+    label = re.search(r"MATCH \(n:`(\w+)`\)", query).group(1)
+    key = KEYS[label]
+    nodes = sorted(NODES[label], key=lambda n: n[key])
+    if "count(n)" in query:
+        return [{"c": len(nodes)}]
+    assert ("elementId(n)" if key == "element_id" else f"n.`{key}`") in query
+    if "SKIP $skip" in query:
+        return [{"k": nodes[params["skip"]][key]}]
+    if "> $last" in query:
+        nodes = [n for n in nodes if n[key] > params["last"]]
+    if ">= $lower" in query:
+        nodes = [n for n in nodes if n[key] >= params["lower"]]
+    if "< $upper" in query:
+        nodes = [n for n in nodes if n[key] < params["upper"]]
+    page = nodes[: params["limit"]]
+    if "to_ids" in query:
+        return [{"from_id": n["id"], "to_ids": [EDGES[n["id"]]]} for n in page]
+    columns = re.findall(r"AS `(\w+)`", query)
+    return [{c: n.get(c) for c in columns} for n in page]
+
+
+def test_node_page_cypher_uses_key_range_cursor():
+    assert node_page_cypher("Quote", "id", ["id", "price"], first=False, lower=False, upper=True) == (
+        "MATCH (n:`Quote`) WHERE n.`id` > $last AND n.`id` < $upper "
+        "RETURN n.`id` AS `id`, n.`price` AS `price` ORDER BY n.`id` LIMIT $limit"
+    )
+
+
+def test_export_parquet_partitions_and_pages(tmp_path, fake_graph):
+    graph = fake_graph(answer=answer)
+    report = export_graph(graph, str(tmp_path), page_size=40, sessions=2, partitions=3)
+
+    assert report.nodes == 258
+    assert report.relationships == 250
+    quote_parts = sorted((tmp_path / "nodes" / "Quote").glob("part-*.parquet"))
+    assert len(quote_parts) == 3
+    table = pq.read_table(tmp_path / "nodes" / "Quote")
+    assert table.schema.field("price").type == "double"
+    assert str(table.schema.field("quote_date").type) == "timestamp[us, tz=UTC]"
+    # Quotes are paged and exported by the id load-szkb MERGEs them by
+    assert table.schema.names[0] == "id" and table.schema.field("id").type == "string"
+    assert sorted(table.column("id").to_pylist()) == [q["id"] for q in QUOTES]
+    assert not any("elementId" in q for q in graph.statements("(n:`Quote`)"))
+    # Typed as declared, not as the first page holds them
+    assert table.schema.field("venue").type == "string"
+    assert sorted(table.column("venue").to_pylist())[:2] == ["1", "101"]
+    assert table.schema.field("volume").type == "int64"
+    assert table.column("volume").drop_null().to_pylist() == list(range(200, 250))
+    listings = pq.read_table(tmp_path / "nodes" / "Listing")
+    assert listings.column("listed").to_pylist() == [date(2020, 1, 1 + i) for i in range(3)]
+    edges = pq.read_table(tmp_path / "relationships" / "Quote-QuoteOfListing-Listing").to_pylist()
+    assert sorted((e["from_id"], e["to_id"]) for e in edges) == sorted(EDGES.items())
+    # No abstract labels, and every page query after the first resumes from the last key
+    assert not (tmp_path / "nodes" / "FinancialInstrument").exists()
+    assert not any("SKIP" in q and "RETURN n." in q for q in graph.statements())
+
+
+def test_export_csv_single_label(tmp_path, fake_graph):
+    report = export_graph(fake_graph(answer=answer), str(tmp_path), fmt="csv", labels=["Listing"], page_size=2)
+
+    assert report.per_target == {"Listing": 3}
+    with open(tmp_path / "nodes" / "Listing" / "part-00000.csv", newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert rows == [{"id": f"l{i}", "listed": f"2020-01-0{1 + i}", "name": f"listing {i}"} for i in range(3)]
+
+
+def test_labels_are_paged_by_their_own_unique_key(tmp_path, fake_graph):
+    graph = fake_graph(answer=answer)
+    export_graph(graph, str(tmp_path), labels=["Issuer", "Rating"], page_size=2)
+
+    issuers = pq.read_table(tmp_path / "nodes" / "Issuer").to_pylist()
+    assert issuers == [{"lei": f"LEI{i}", "name": f"issuer {i}"} for i in range(2)]
+    # No unique property: paged by elementId, so ratings sharing a grade are all exported
+    ratings = pq.read_table(tmp_path / "nodes" / "Rating").to_pylist()
+    assert ratings == [{"element_id": r["element_id"], "grade": r["grade"]} for r in RATINGS]
+    assert any("elementId(n) > $last" in q for q in graph.statements())
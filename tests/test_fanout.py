@@ -0,0 +1,76 @@
+import threading
+
+from neo4j.exceptions import ServiceUnavailable
+
+from neo4j_ontology_loader.ingest.fanout import FanOut, LoadCheckpoint
+
+
+def _load(fanout, inputs, written, fail=lambda target, name, index: False):
+    """Feed ``inputs`` ({name: parts}) through ``fanout``; writes are recorded in ``written``."""
+    lock = threading.Lock()
+    for name, parts in inputs.items():
+        fanout.begin(name, "v1")
+        for index in range(parts):
+
+            def write(target, driver, name=name, index=index):
+                if fail(target, name, index):
+                    raise ServiceUnavailable("connection lost")
+                with lock:
+                    written.append((target, name, index))
+
+            fanout.submit(index, 10, write)
+        fanout.end(parts)
+    fanout.close()
+
+
+def test_failing_target_stops_while_the_others_finish(tmp_path):
+    written = []
+    checkpoint = LoadCheckpoint(str(tmp_path / "load.jsonl"))
+    fanout = FanOut({"prod": "prod-driver", "sandbox": "sandbox-driver"}, checkpoint, max_pending=1)
+
+    def fail(target, name, index):
+        return target == "sandbox" and name == "quotes" and index == 1
+
+    _load(fanout, {"listings": 2, "quotes": 3}, written, fail)
+
+    assert [w for w in written if w[0] == "prod"] == [
+        ("prod", "listings", 0), ("prod", "listings", 1),
+        ("prod", "quotes", 0), ("prod", "quotes", 1), ("prod", "quotes", 2),
+    ]
+    assert [w for w in written if w[0] == "sandbox"] == [
+        ("sandbox", "listings", 0), ("sandbox", "listings", 1), ("sandbox", "quotes", 0),
+    ]
+    reports = fanout.reports
+    assert reports["prod"].rows == 50 and not reports["prod"].failed
+    assert reports["sandbox"].failed_at == "quotes part 1" and "connection lost" in reports["sandbox"].error
+    assert checkpoint.done("prod", "quotes", "v1") and not checkpoint.done("sandbox", "quotes", "v1")
+    assert checkpoint.parts("sandbox", "quotes", "v1") == 1
+
+
+def test_rerun_resumes_each_target_from_its_checkpoint(tmp_path):
+    path = str(tmp_path / "load.jsonl")
+    first = FanOut({"prod": None, "sandbox": None}, LoadCheckpoint(path))
+    _load(first, {"listings": 2, "quotes": 3}, [], lambda *part: part == ("sandbox", "quotes", 2))
+
+    written = []
+    second = FanOut({"prod": None, "sandbox": None}, LoadCheckpoint(path))
+    _load(second, {"listings": 2, "quotes": 3}, written)
+
+    # Only the part sandbox is missing is written again
+    assert written == [("sandbox", "quotes", 2)]
+    assert second.reports["sandbox"].resumed == 2
+    # A changed input (new fingerprint) starts over
+    assert LoadCheckpoint(path).parts("sandbox", "quotes", "v2") == 0
+
+
+def test_after_runs_once_a_target_has_written_the_input():
+    events = []
+    fanout = FanOut({"prod": "prod-driver", "sandbox": "sandbox-driver"})
+    fanout.begin("bonds")
+    for index in range(2):
+        fanout.submit(index, 10, lambda target, driver, index=index: events.append((target, index)))
+    fanout.end(2, after=lambda target: events.append((target, "evict")))
+    fanout.close()
+
+    for target in ("prod", "sandbox"):
+        assert [e for t, e in events if t == target] == [0, 1, "evict"]
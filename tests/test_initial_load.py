@@ -0,0 +1,118 @@
+from neo4j.exceptions import ClientError, ServiceUnavailable
+
+from neo4j_ontology_loader.ingest.nodes import NewKeys, ingest_nodes
+from neo4j_ontology_loader.neo4j.execution import RetryPolicy, WriteMetrics
+from neo4j_ontology_loader.schema.ddl_initial_load import (
+    DeferredSchema,
+    defer_schema,
+    parse_statement,
+    restore_schema,
+)
+from neo4j_ontology_loader.schema.registry import load_ontology_schema
+
+NO_WAIT = RetryPolicy(max_attempts=3, initial_delay=0.0)
+
+
+def shown(constraints=(), indexes=(), answer=lambda query, params: []):
+    """Answers SHOW CONSTRAINTS / SHOW INDEXES from ``constraints``/``indexes``, the rest from ``answer``."""
+
+    def respond(query, params):
+        if query.startswith("SHOW CONSTRAINTS"):
+            return constraints
+        if query.startswith("SHOW INDEXES"):
+            return indexes
+        return answer(query, params)
+
+    return respond
+
+
+def sent(graph):
+    # (MERGE or CREATE, keys) per write batch
+    return [(q.split()[4], [r["key_value"] for r in params["rows"]]) for q, params in graph.queries if "rows" in params]
+
+
+def _constraint(name, label, prop, type_):
+    kind = "IS UNIQUE" if type_ == "UNIQUENESS" else "IS NOT NULL"
+    return {
+        "name": name, "type": type_, "entityType": "NODE", "labelsOrTypes": [label], "properties": [prop],
+        "createStatement": f"CREATE CONSTRAINT `{name}` FOR (n:`{label}`) REQUIRE (n.`{prop}`) {kind}",
+    }
+
+
+def test_new_keys_create_first_sightings_and_merge_repeats(fake_graph):
+    errors = [ServiceUnavailable("commit lost")]
+
+    def fail(query, params):
+        # The first CREATE batch fails in transit and is retried
+        if "CREATE (n:Quote" in query and errors:
+            return errors.pop()
+        return None
+
+    graph = fake_graph(fail=fail)
+    new_keys = NewKeys()
+    rows = [{"id": "a"}, {"id": "b"}, {"id": "a"}, {"id": "c"}, {"id": "b"}]
+
+    ingest_nodes(graph, "Quote", "id", rows, batch_size=3, new_keys=new_keys, policy=NO_WAIT, metrics=WriteMetrics())
+
+    assert len(new_keys) == 3
+    # The retried first batch MERGEs, since the lost commit may have gone through
+    assert sent(graph) == [("MERGE", ["a", "b"]), ("MERGE", ["a"]), ("CREATE", ["c"]), ("MERGE", ["b"])]
+
+
+def test_defer_schema_keeps_key_constraints_and_records_the_rest(fake_graph):
+    graph = fake_graph(answer=shown(
+        constraints=[
+            _constraint("listing_id", "Listing", "id", "UNIQUENESS"),
+            _constraint("listing_ticker", "Listing", "ticker", "NODE_PROPERTY_EXISTENCE"),
+            _constraint("issuer_lei", "Issuer", "lei", "UNIQUENESS"),
+        ],
+        indexes=[
+            {"name": "quote_listing", "type": "RANGE", "entityType": "NODE", "labelsOrTypes": ["Quote"],
+             "properties": ["listing_id"], "owningConstraint": None,
+             "createStatement": "CREATE RANGE INDEX `quote_listing` FOR (n:`Quote`) ON (n.`listing_id`)"},
+            {"name": "quote_id", "type": "RANGE", "entityType": "NODE", "labelsOrTypes": ["Quote"],
+             "properties": ["id"], "owningConstraint": None,
+             "createStatement": "CREATE RANGE INDEX `quote_id` FOR (n:`Quote`) ON (n.`id`)"},
+        ],
+    ))
+
+    deferred = defer_schema(graph, {"Listing": "id", "Quote": "id"}, {("Listing", ("id",))})
+
+    assert [parse_statement(s) for s in deferred.dropped] == [
+        parse_statement("CREATE CONSTRAINT FOR (n:Listing) REQUIRE n.ticker IS NOT NULL"),
+        parse_statement("CREATE INDEX FOR (n:Quote) ON (n.listing_id)"),
+    ]
+    drops = graph.statements("DROP ")
+    assert drops == ["DROP CONSTRAINT `listing_ticker` IF EXISTS", "DROP INDEX `quote_listing` IF EXISTS"]
+    assert "CREATE CONSTRAINT IF NOT EXISTS FOR (n:Listing) REQUIRE n.id IS UNIQUE" in graph.statements()
+    assert "CREATE INDEX IF NOT EXISTS FOR (n:Quote) ON (n.id)" in graph.statements()
+
+
+def test_restore_schema_reports_violated_constraints(fake_graph):
+    schema = load_ontology_schema()
+    present = [_constraint("c_listing_id", "Listing", "id", "UNIQUENESS")]
+
+    def fail(query, params):
+        if "(n:Listing) REQUIRE n.ticker IS NOT NULL" in query:
+            return ClientError("Unable to create Constraint( name='c', type='NODE PROPERTY EXISTENCE' )")
+        return None
+
+    def answer(query, params):
+        if "n.`ticker` IS NULL" in query:
+            return [{"violations": 2, "examples": ["L1", "L7"]}]
+        return []
+
+    graph = fake_graph(answer=shown(constraints=present, answer=answer), fail=fail)
+    deferred = DeferredSchema(keys={"Listing": "id"})
+
+    report = restore_schema(graph, schema, deferred, ["CREATE INDEX IF NOT EXISTS FOR (n:Quote) ON (n.listing_id)"])
+
+    failed = [v for v in report.violations if v.error.startswith("Unable")]
+    assert len(failed) == 1
+    assert failed[0].item.properties == ("ticker",) and failed[0].violations == 2
+    assert failed[0].examples == ["L1", "L7"]
+    # Created but not listed by SHOW CONSTRAINTS afterwards
+    missing = {v.statement for v in report.violations if v.error == "constraint missing after creation"}
+    assert "CREATE CONSTRAINT IF NOT EXISTS FOR (n:Bond) REQUIRE n.isin IS UNIQUE" in missing
+    assert "CREATE CONSTRAINT IF NOT EXISTS FOR (n:Listing) REQUIRE n.id IS UNIQUE" not in missing
+    assert "CREATE INDEX IF NOT EXISTS FOR (n:Quote) ON (n.listing_id)" in report.created
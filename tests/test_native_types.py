@@ -0,0 +1,75 @@
+import math
+from datetime import date, datetime, timezone
+
+import pandas as pd
+import pytest
+
+from neo4j_ontology_loader.ingest.nodes import ingest_nodes
+from neo4j_ontology_loader.ingest.prepare import ChunkPlan, native_types, prepare_chunk
+from neo4j_ontology_loader.neo4j.execution import RetryPolicy, WriteMetrics
+from neo4j_ontology_loader.schema.registry import load_ontology_schema
+
+TYPES = (("listing_id", "str"), ("quote", "float"), ("volume", "int"), ("is_callable", "bool"),
+         ("maturity_date", "date"), ("quote_date", "datetime"))
+
+
+def _feed() -> pd.DataFrame:
+    return pd.DataFrame({
+        "id": ["a", "b", "c"],
+        # Read as floats because of the blank cell
+        "listing_id": [4411.0, None, 12.5],
+        "quote": ["1.5", "n/a", None],
+        "volume": ["10", "2.5", "7.0"],
+        "is_callable": ["True", "no", "maybe"],
+        "maturity_date": ["2030-06-30", "2031-01-15T00:00:00", None],
+        "quote_date": ["2024-01-02T10:00:00+01:00", "2024-01-02", "garbage"],
+        "note": ["x", None, "z"],
+    })
+
+
+def test_native_types_come_from_the_schema():
+    schema = load_ontology_schema()
+
+    assert ("quote_date", "datetime") in native_types(schema.entity("Quote"))
+    assert ("quote", "float") in native_types(schema.entity("Quote"))
+    bond = dict(native_types(schema.entity("Bond")))
+    assert bond["maturity_date"] == "date" and bond["is_callable"] == "bool" and bond["interest_rate"] == "float"
+    assert bond["isin"] == "str" and dict(native_types(schema.entity("Listing")))["instrument_id"] == "str"
+
+
+def test_typed_columns_are_written_natively_and_missing_values_dropped(graph):
+    plan = ChunkPlan(label="Quote", types=TYPES)
+
+    part = prepare_chunk(_feed(), plan)
+    ingest_nodes(
+        graph, label="Quote", key="id", rows=part.rows,
+        policy=RetryPolicy(max_attempts=1), metrics=WriteMetrics(),
+    )
+
+    rows = [item["props"] for item in graph.written()]
+    assert rows[0] == {
+        "id": "a", "listing_id": "4411", "quote": 1.5, "volume": 10, "is_callable": True,
+        "maturity_date": date(2030, 6, 30),
+        "quote_date": datetime(2024, 1, 2, 9, tzinfo=timezone.utc), "note": "x",
+    }
+    # Values that do not convert and missing ones are not sent as properties
+    assert rows[1] == {
+        "id": "b", "is_callable": False, "maturity_date": date(2031, 1, 15),
+        "quote_date": datetime(2024, 1, 2, tzinfo=timezone.utc),
+    }
+    assert rows[2] == {"id": "c", "listing_id": "12.5", "volume": 7, "note": "z"}
+    assert not any(isinstance(v, float) and math.isnan(v) for row in rows for v in row.values())
+
+
+def test_polars_backend_types_like_pandas(tmp_path):
+    pytest.importorskip("polars")
+    from neo4j_ontology_loader.ingest.polars_io import iter_prepared_polars
+
+    path = tmp_path / "quotes.csv"
+    _feed().to_csv(path, index=False)
+    plan = ChunkPlan(label="Quote", types=TYPES)
+
+    expected = list(prepare_chunk(pd.read_csv(path, dtype=plan.csv_dtypes()), plan).rows.records(drop_missing=True))
+    rows = [row for part in iter_prepared_polars(str(path), plan, 10) for row in part.rows.records(drop_missing=True)]
+
+    assert rows == expected
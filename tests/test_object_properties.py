@@ -0,0 +1,85 @@
+from neo4j_ontology_loader.ingest.element_ids import ElementIdCache
+from neo4j_ontology_loader.ingest.object_properties import ValueInterner, ingest_object_properties
+from neo4j_ontology_loader.models.types import (
+    Currency,
+    CurrencyAmount,
+    DayCountBasis,
+    DividendPolicy,
+    InterestRate,
+    Price,
+)
+from neo4j_ontology_loader.neo4j.execution import RetryPolicy, WriteMetrics
+from neo4j_ontology_loader.schema.extract import complex_properties_relationship_types
+from neo4j_ontology_loader.schema.szkb_specs import bond_from_szkb_row, bond_objects_from_row
+
+
+def nodes(graph, label):
+    writes = [params["rows"] for q, params in graph.queries if f"(n:{label} " in q and "MERGE (a)" not in q]
+    return [row["props"] for rows in writes for row in rows]
+
+
+def rels(graph, rel_type):
+    return graph.written(f":{rel_type}]")
+
+
+def load(driver, owners, **kwargs):
+    return ingest_object_properties(
+        driver, "Bond", "id", owners, policy=RetryPolicy(max_attempts=1), metrics=WriteMetrics(), **kwargs
+    )
+
+
+def test_shared_values_are_written_once(fake_graph):
+    driver, interner = fake_graph(), ValueInterner()
+    chf = Currency(value="CHF")
+    owners = [
+        ("b1", {"currencyOfDenomination": chf, "conversionPrice": Price(type="actual", value=10.0, currency=chf)}),
+        ("b2", {"currencyOfDenomination": Currency(value="CHF")}),
+    ]
+    assert load(driver, owners, interner=interner, batch_size=1) == 2
+    assert [n["value"] for n in nodes(driver, "Currency")] == ["CHF"]
+    assert len(rels(driver, "CurrencyOfDenomination")) == 2
+    assert len(rels(driver, "PriceCurrency")) == 1
+
+    # A later load phase reuses the interner: only relationships are written
+    driver = fake_graph()
+    assert load(driver, [("b3", {"currencyOfDenomination": chf})], interner=interner) == 0
+    assert nodes(driver, "Currency") == [] and len(rels(driver, "CurrencyOfDenomination")) == 1
+
+
+def element_ids(query, params):
+    # Upserts returning elementIds, and key lookups of the owners
+    if "rows" in params and "AS element_id" in query:
+        return [{"value": row["key_value"], "element_id": f"4:{row['key_value']}"} for row in params["rows"]]
+    return [{"value": v, "element_id": f"4:{v}"} for v in params.get("values", ())]
+
+
+def test_links_match_endpoints_by_cached_element_ids(fake_graph):
+    driver, cache = fake_graph(answer=element_ids), ElementIdCache()
+    chf = Currency(value="CHF")
+    owners = [("b1", {"currencyOfDenomination": chf}), ("b2", {"currencyOfDenomination": chf})]
+    load(driver, owners, id_cache=cache, batch_size=1)
+
+    (chf_id,) = [f"4:{n['id']}" for n in nodes(driver, "Currency")]
+    links = rels(driver, "CurrencyOfDenomination")
+    assert [(r["from_id"], r["to_id"]) for r in links] == [("4:b1", chf_id), ("4:b2", chf_id)]
+    # The value was captured when it was written; only the owners are looked up
+    assert [p["values"] for _, p in driver.queries if "values" in p] == [["b1"], ["b2"]]
+
+
+def test_nested_values_and_enums_are_flattened(graph):
+    policy = DividendPolicy(frequency="annual", dividendPerShare=CurrencyAmount(amount=1.5, currency=Currency(value="USD")))
+    rate = InterestRate(type="fixed", value=0.01, dayCountBasis=DayCountBasis.ACT_360)
+    assert load(graph, [("e1", {"dividend_policy": policy, "interestRate": rate})]) == 4
+    assert nodes(graph, "InterestRate")[0]["dayCountBasis"] == "act_360"
+    assert len(rels(graph, "HasDividendPolicy")) == 1
+    assert len(rels(graph, "DividendPolicyDividendPerShare")) == 1
+    assert len(rels(graph, "CurrencyAmountCurrency")) == 1
+    assert {r.name for r in complex_properties_relationship_types()} >= {"DividendPolicyDividendPerShare", "PriceCurrency"}
+
+
+def test_bond_feed_rows_map_to_values():
+    row = bond_from_szkb_row({"id": "B1", "isin": "CH1", "actInterestRate": 2.5, "interestType": "Fixed", "payFreqPeriod": "P1Y"})
+    values = bond_objects_from_row(row)
+    assert values["interestRate"].value == 0.025 and values["interestRate"].paymentFrequency == "annual"
+    assert values["identificationList"][0].identifier == "CH1"
+    assert values["conversionPrice"] is None and values["maturityDate"] is None
@@ -0,0 +1,84 @@
+import bz2
+import gzip
+import lzma
+
+import pytest
+
+from neo4j_ontology_loader.ingest.pandas_io import iter_csv_chunks
+from neo4j_ontology_loader.ingest.prepare import ChunkPlan, prepare_chunk
+from utils.prefetch import read_ahead
+
+CSV = b"listing_id,quote\n4411,1.5\n4412,2.5\n4413,3.5\n"
+
+
+@pytest.mark.parametrize(
+    "name, compress",
+    [
+        ("quotes.csv", lambda b: b),
+        ("quotes.csv.gz", gzip.compress),
+        ("quotes.csv.bz2", bz2.compress),
+        ("quotes.csv.xz", lzma.compress),
+        # Compressed content without a telling suffix is detected by magic bytes
+        ("quotes.dat", gzip.compress),
+    ],
+)
+def test_iter_csv_chunks_decompresses_transparently(tmp_path, name, compress):
+    path = tmp_path / name
+    path.write_bytes(compress(CSV))
+    chunks = list(iter_csv_chunks(str(path), chunksize=2))
+    assert [len(c) for c in chunks] == [2, 1]
+    assert chunks[1].to_dict(orient="records") == [{"listing_id": 4413, "quote": 3.5}]
+
+
+def test_iter_csv_chunks_zstd(tmp_path):
+    zstandard = pytest.importorskip("zstandard")
+    path = tmp_path / "quotes.csv.zst"
+    path.write_bytes(zstandard.ZstdCompressor().compress(CSV))
+    assert sum(len(c) for c in iter_csv_chunks(str(path), chunksize=2)) == 3
+
+
+def test_read_ahead_preserves_order_and_propagates_errors():
+    assert list(read_ahead(range(10), depth=2)) == list(range(10))
+
+    def failing():
+        yield 1
+        raise ValueError("boom")
+
+    it = read_ahead(failing())
+    assert next(it) == 1
+    with pytest.raises(ValueError, match="boom"):
+        next(it)
+
+
+def test_read_ahead_stops_producer_when_consumer_breaks():
+    produced = []
+
+    def items():
+        for i in range(1000):
+            produced.append(i)
+            yield i
+
+    for item in read_ahead(items(), depth=1):
+        if item == 2:
+            break
+    # Bounded by the queue depth plus the item being handed over
+    assert len(produced) < 10
+
+
+def test_chunks_split_at_a_blank_cell_keep_string_ids(tmp_path):
+    path = tmp_path / "quotes.csv"
+    path.write_text(
+        "listing_id,quote_date,quote\n0441,2024-01-01,1.5\n0441,2024-01-02,1.6\n,2024-01-03,1.7\n0441,2024-01-04,1.8\n"
+    )
+    plan = ChunkPlan(
+        label="Quote", synthetic_key=("listing_id", "quote_date"), types=(("listing_id", "str"), ("quote", "float"))
+    )
+
+    parts = [prepare_chunk(chunk, plan) for chunk in iter_csv_chunks(str(path), 2, dtype=plan.csv_dtypes())]
+
+    rows = [row for part in parts for row in part.rows.records(drop_missing=True)]
+    # Guessed types would read 441 in the first chunk and 441.0 in the second
+    assert [(row["id"], row["listing_id"]) for row in rows] == [
+        ("0441:2024-01-01", "0441"), ("0441:2024-01-02", "0441"), ("0441:2024-01-04", "0441"),
+    ]
+    assert sum(part.skipped for part in parts) == 1
@@ -0,0 +1,72 @@
+import gzip
+
+import pandas as pd
+
+from neo4j_ontology_loader.ingest.parallel import can_shard, iter_prepared_shards, shard_ranges
+from neo4j_ontology_loader.ingest.prepare import ChunkPlan, prepare_chunk
+from neo4j_ontology_loader.schema.szkb_specs import bond_from_szkb_row
+
+QUOTES = "".join(
+    ["listing_id,quote_date,quote,source\n"]
+    + [f"{4400 + i % 7},2024-01-{1 + i % 28:02d}T10:{i % 60:02d}:00,{i / 10},feed\n" for i in range(500)]
+)
+
+PLAN = ChunkPlan(
+    label="Quote",
+    key="id",
+    columns=frozenset({"id", "listing_id", "quote", "quote_date"}),
+    synthetic_key=("listing_id", "quote_date"),
+)
+
+
+def test_shards_cover_whole_lines(tmp_path):
+    path = tmp_path / "quotes.csv"
+    path.write_text(QUOTES)
+    header, ranges = shard_ranges(str(path), shard_bytes=1000)
+    data = path.read_bytes()
+    assert header == b"listing_id,quote_date,quote,source\n" and len(ranges) > 5
+    assert b"".join(data[start:end] for start, end in ranges) == data[len(header):]
+    assert all(data[end - 1:end] == b"\n" for _, end in ranges)
+
+
+def test_sharded_preparation_matches_sequential(tmp_path):
+    path = tmp_path / "quotes.csv"
+    path.write_text(QUOTES)
+    assert can_shard(str(path))
+    sequential = prepare_chunk(pd.read_csv(path, dtype=PLAN.csv_dtypes()), PLAN)
+    parts = list(iter_prepared_shards(str(path), PLAN, workers=2, shard_bytes=2000))
+    assert len(parts) > 1
+    assert [r for p in parts for r in p.rows.records()] == list(sequential.rows.records())
+
+    gz = tmp_path / "quotes.csv.gz"
+    gz.write_bytes(gzip.compress(QUOTES.encode()))
+    assert not can_shard(str(gz)) and not can_shard("-")
+
+
+def test_shards_read_ids_as_strings(tmp_path):
+    path = tmp_path / "quotes.csv"
+    # The blank listing id falls in the second shard only
+    path.write_text(
+        "listing_id,quote_date,quote\n" + "0441,2024-01-01,1.0\n" * 40 + ",2024-01-02,2.0\n0441,2024-01-03,3.0\n"
+    )
+    plan = ChunkPlan(label="Quote", synthetic_key=("listing_id", "quote_date"), types=(("listing_id", "str"),))
+
+    parts = list(iter_prepared_shards(str(path), plan, workers=2, shard_bytes=400))
+
+    assert len(parts) > 1 and sum(part.skipped for part in parts) == 1
+    rows = [r for p in parts for r in p.rows.records()]
+    assert {(r["id"], r["listing_id"]) for r in rows} == {("0441:2024-01-01", "0441"), ("0441:2024-01-03", "0441")}
+
+
+def test_transform_drops_unmapped_rows_and_projects():
+    raw = pd.DataFrame({
+        "id": ["B1", None],
+        "actInterestRate": [4.375, 1.0],
+        "payFreqPeriod": ["P6M", "P1Y"],
+        "interestType": ["Fixed rate", None],
+    })
+    plan = ChunkPlan(label="Bond", key="id", columns=frozenset({"id", "interest_rate"}), transform=bond_from_szkb_row)
+    part = prepare_chunk(raw, plan)
+    assert part.skipped == 1
+    assert list(part.rows.records()) == [{"id": "B1", "interest_rate": 0.04375}]
+    assert bond_from_szkb_row({"id": "B2", "interestType": "Fixed", "payFreqPeriod": "P6M"})["interest_payment_frequency"] == "semiAnnual"
@@ -0,0 +1,47 @@
+import pandas as pd
+
+from neo4j_ontology_loader.ingest.plan import KeyCardinality, format_plan, probe_write_rate, scan_table
+from neo4j_ontology_loader.ingest.prepare import ChunkPlan
+from neo4j_ontology_loader.schema.szkb_specs import get_szkb_relationship_specs
+
+
+def test_key_cardinality_is_exact_then_estimated():
+    exact = KeyCardinality()
+    exact.add(["a", "b", "a"])
+    exact.add([1, "b"])
+    assert exact.exact and exact.count() == 3
+
+    estimated = KeyCardinality(exact_limit=1000)
+    for start in range(0, 200_000, 50_000):
+        estimated.add([f"key-{i}" for i in range(start, start + 50_000)])
+    estimated.add([f"key-{i}" for i in range(10_000)])
+    assert not estimated.exact
+    assert abs(estimated.count() - 200_000) < 200_000 * 0.03
+
+
+def test_scan_table_reports_keys_duplicates_nulls_and_relationships():
+    chunks = [
+        pd.DataFrame({"id": ["1/4", "2/4", None], "trading_place_id": [4, 4, 5], "instrument_id": [1, 2, 3],
+                      "ticker": ["A", None, "C"]}),
+        pd.DataFrame({"id": ["1/4", " "], "trading_place_id": [4, 5], "instrument_id": [1, 3], "ticker": ["A", "D"]}),
+    ]
+    rel_specs = [s for s in get_szkb_relationship_specs() if s.source == "listings"]
+    stats = scan_table(chunks, ChunkPlan(label="Listing", columns=frozenset({"id", "ticker"})), rel_specs)
+
+    assert (stats.rows, stats.skipped, stats.distinct_keys, stats.duplicates) == (3, 2, 2, 1)
+    assert stats.null_rates() == {"id": 0.0, "ticker": 1 / 3}
+    listed_on = next(r for r in stats.relationships if r.rel_type == "ListedOn")
+    assert (listed_on.rows, listed_on.pairs.count()) == (3, 2)
+    report = "\n".join(format_plan([stats]))
+    assert "Listing: rows=3 keys=2 duplicates=1 skipped=2" in report
+    assert "nulls: ticker=33.3%" in report
+
+
+def test_probe_runs_merge_batches_and_rolls_back(graph):
+    stats = scan_table([pd.DataFrame({"id": range(2500), "name": "x"})], ChunkPlan(label="TradingVenue"))
+
+    rate = probe_write_rate(graph, stats, batch_size=1000)
+
+    assert [len(params.get("rows", ())) for _, params in graph.queries] == [1000, 1000, 500, 0]
+    assert graph.queries[-1][0] == "ROLLBACK"
+    assert rate > 0 and stats.seconds is not None
@@ -0,0 +1,101 @@
+import gzip
+
+import pandas as pd
+import pytest
+
+pl = pytest.importorskip("polars")
+
+from neo4j_ontology_loader.ingest.pandas_io import iter_csv_chunks  # noqa: E402
+from neo4j_ontology_loader.ingest.polars_io import INFER_SCHEMA_ROWS, can_scan, iter_prepared_polars  # noqa: E402
+from neo4j_ontology_loader.ingest.prepare import ChunkPlan, prepare_chunk  # noqa: E402
+from neo4j_ontology_loader.schema.szkb_specs import (  # noqa: E402
+    _is_missing,
+    bond_from_szkb_row,
+    bond_polars_expressions,
+)
+
+
+def _rows(parts):
+    return [row for part in parts for row in part.rows.records()]
+
+
+def test_synthetic_ids_and_projection_match_pandas(tmp_path):
+    path = tmp_path / "quotes.csv"
+    pd.DataFrame({
+        "listing_id": ["L1", "L2", "L3", "L4", "L5"],
+        "quote_date": ["2024-01-02", "2024-01-02", "2024-01-03", None, "2024-01-04"],
+        "quote": [1.5, 2.0, None, 4.0, 5.0],
+        "bid": [1, 2, 3, 4, 5],
+    }).to_csv(path, index=False)
+    plan = ChunkPlan(
+        label="Quote", columns=frozenset({"id", "listing_id", "quote"}), synthetic_key=("listing_id", "quote_date")
+    )
+
+    parts = list(iter_prepared_polars(str(path), plan, chunk_size=2))
+
+    rows = _rows(parts)
+    expected = _rows(prepare_chunk(chunk, plan) for chunk in iter_csv_chunks(str(path), 2, dtype=plan.csv_dtypes()))
+    # The row missing its date gets no id and is skipped
+    assert [r["id"] for r in rows] == [r["id"] for r in expected]
+    assert rows[0] == {"listing_id": "L1", "quote": 1.5, "id": "L1:2024-01-02"}
+    assert rows[2]["quote"] is None
+    assert sum(part.skipped for part in parts) == 1
+
+
+def test_bond_expressions_match_the_row_mapping():
+    feed = pl.DataFrame({
+        "id": ["B1", "B2", "B3", "B4"],
+        "isin": ["CH1", None, "CH3", "CH4"],
+        "name@de": ["Anleihe", None, "Obligation", None],
+        "shortName@de": ["Anl", "Kurz", None, "K4"],
+        "interestType": [" Fixed rate", "Floating", "staggered coupon", None],
+        "actInterestRate": ["4.375", "n/a", None, "1"],
+        "payFreqPeriod": ["p1y", "P2Y", None, "P6M"],
+        "exercisePrice": [None, "101.5", None, None],
+    })
+
+    mapped = feed.select(bond_polars_expressions(feed.columns)).to_dicts()
+
+    for row, polars_row in zip(feed.to_dicts(), mapped):
+        # As pandas reads a CSV row: missing cells are NaN
+        expected = bond_from_szkb_row({k: float("nan") if v is None else v for k, v in row.items()})
+        assert polars_row.keys() == expected.keys()
+        for field, value in expected.items():
+            if field == "name":
+                continue
+            if _is_missing(value):
+                assert polars_row[field] is None, field
+            else:
+                assert polars_row[field] == pytest.approx(value), field
+    # A missing name falls back to the short name
+    assert [row["name"] for row in mapped] == ["Anleihe", "Kurz", "Obligation", "K4"]
+
+
+def test_row_mappings_without_expressions_and_compressed_input(tmp_path):
+    path = tmp_path / "bonds.csv"
+    pd.DataFrame({"id": ["B1", "", "B3"], "isin": ["CH1", "CH2", None]}).to_csv(path, index=False)
+    plan = ChunkPlan(label="Bond", columns=frozenset({"id", "isin"}), transform=bond_from_szkb_row)
+
+    parts = list(iter_prepared_polars(str(path), plan, chunk_size=10))
+
+    assert _rows(parts) == [{"id": "B1", "isin": "CH1"}, {"id": "B3", "isin": None}]
+    assert sum(part.skipped for part in parts) == 1
+    compressed = tmp_path / "bonds.csv.gz"
+    compressed.write_bytes(gzip.compress(path.read_bytes()))
+    assert can_scan(str(path)) and not can_scan(str(compressed)) and not can_scan("-")
+
+
+def test_ids_past_the_inferred_rows_may_change_type(tmp_path):
+    path = tmp_path / "quotes.csv"
+    lines = [f"{4400 + i % 7},2024-01-01T00:{i % 60:02d}:{i // 60 % 60:02d},{i}" for i in range(INFER_SCHEMA_ROWS)]
+    path.write_text("\n".join(["listing_id,quote_date,quote", *lines, "X1,2024-01-02,1.5", ",2024-01-03,2.5"]) + "\n")
+    plan = ChunkPlan(
+        label="Quote", synthetic_key=("listing_id", "quote_date"), types=(("listing_id", "str"), ("quote", "float"))
+    )
+
+    parts = list(iter_prepared_polars(str(path), plan, chunk_size=4000))
+
+    rows = _rows(parts)
+    assert len(rows) == INFER_SCHEMA_ROWS + 1 and sum(part.skipped for part in parts) == 1
+    assert rows[0]["listing_id"] == "4400" and rows[0]["id"] == "4400:2024-01-01T00:00:00"
+    assert rows[-1] == {"listing_id": "X1", "quote_date": rows[-1]["quote_date"], "quote": 1.5, "id": "X1:2024-01-02"}
@@ -0,0 +1,57 @@
+import time
+
+from neo4j_ontology_loader.neo4j import query_cache as qc
+from neo4j_ontology_loader.neo4j.query_cache import QueryCache, is_read_only, query_labels
+from neo4j_ontology_loader.neo4j.session import run_query
+
+
+def test_labels_and_read_only_detection():
+    assert query_labels("MATCH (e:Entity)-[:HAS_PROPERTY]->(p:`PropertyDefinition`) RETURN e") == {
+        "Entity", "PropertyDefinition",
+    }
+    assert query_labels("MATCH (n:A:B) WHERE n.x = '(m:C)' RETURN n") == {"A", "B"}
+    assert is_read_only("MATCH (n:Entity) RETURN n.created_at")
+    assert not is_read_only("MERGE (n:Entity {name: $n})")
+
+
+def test_lru_ttl_and_size_cap():
+    cache = QueryCache(max_entries=2, ttl=60, max_rows=2)
+    cache.put("a", [{"x": 1}], {"A"})
+    cache.put("b", [{"x": 2}], {"B"})
+    assert cache.get("a") == [{"x": 1}]
+    cache.put("c", [{"x": 3}], {"C"})
+    # "b" was least recently used
+    assert cache.get("b") is None and len(cache) == 2
+    cache.put("big", [{}, {}, {}], {"A"})
+    assert cache.get("big") is None
+
+    short = QueryCache(ttl=0.01)
+    short.put("a", [{"x": 1}], {"A"})
+    time.sleep(0.02)
+    assert short.get("a") is None
+
+
+def test_invalidation_by_label():
+    cache = QueryCache()
+    cache.put("a", [], {"Entity"})
+    cache.put("b", [], {"TradingVenue"})
+    cache.put("c", [], set())
+    assert cache.invalidate(["Entity"]) == 2
+    assert cache.get("b") == []
+
+
+def test_run_query_reads_through(monkeypatch, fake_graph):
+    monkeypatch.setattr(qc, "_cache", QueryCache())
+    driver = fake_graph(answer=lambda query, params: [{"name": "Quote"}])
+    query = "MATCH (e:Entity) RETURN e.name AS name"
+    rows = run_query(query, driver=driver, cache=True)
+    rows[0]["name"] = "mutated"
+    assert run_query("MATCH (e:Entity)\n  RETURN e.name AS name", driver=driver, cache=True) == [{"name": "Quote"}]
+    assert len(driver.queries) == 1
+
+    qc.invalidate_labels(["Entity"])
+    run_query(query, driver=driver, cache=True)
+    assert len(driver.queries) == 2
+    # Uncached calls always go to the server
+    run_query(query, driver=driver)
+    assert len(driver.queries) == 3
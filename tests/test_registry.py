@@ -0,0 +1,73 @@
+import pytest
+
+from neo4j_ontology_loader.schema import registry
+from neo4j_ontology_loader.schema.registry import (
+    build_ontology_schema,
+    entity_models,
+    load_ontology_schema,
+    object_property_models,
+)
+
+
+def test_entity_registry_contains_models_in_persistence_order():
+    labels = [e.label for e in entity_models()]
+    assert labels[:6] == ["Issuer", "InstrumentType", "TradingVenue", "Listing", "CrossCurrencyRate", "Quote"]
+    assert labels[-1] == "FinancialInstrument"
+    abstract = {e.label for e in entity_models() if e.abstract}
+    assert abstract == {"FinancialInstrument"}
+
+
+def test_object_property_registry_excludes_abstract_marker():
+    labels = {e.label for e in object_property_models()}
+    assert {"Currency", "Price", "InterestRate", "DividendPolicy", "KeyFigures"} <= labels
+    assert "FinancialInstrument" not in labels
+    assert "BaseModel" not in labels
+
+
+def test_schema_includes_flat_bond_and_abstract_financial_instrument():
+    schema = build_ontology_schema()
+    bond = schema.entity("Bond")
+    assert bond is not None
+    assert "interest_rate" in {p.name for p in bond.properties}
+    fi = schema.entity("FinancialInstrument")
+    assert fi.abstract is True and fi.properties == []
+    assert schema.entity("Unknown") is None
+
+
+def test_schema_cache_round_trip_skips_introspection(tmp_path, monkeypatch):
+    registry._load_cached.cache_clear()
+    cold = load_ontology_schema(tmp_path)
+    assert len(list(tmp_path.glob("schema-*.json"))) == 1
+
+    registry._load_cached.cache_clear()
+
+    def fail():
+        raise AssertionError("schema should be served from the on-disk cache")
+
+    monkeypatch.setattr(registry, "build_ontology_schema", fail)
+    warm = load_ontology_schema(tmp_path)
+    assert warm == cold
+    registry._load_cached.cache_clear()
+
+
+def test_schema_cache_rebuilds_when_unreadable(tmp_path):
+    registry._load_cached.cache_clear()
+    path = registry._cache_path(tmp_path)
+    path.write_text("{not json", encoding="utf-8")
+    schema = load_ontology_schema(tmp_path)
+    assert schema == build_ontology_schema()
+    registry._load_cached.cache_clear()
+
+
+def test_schema_cache_removes_files_of_earlier_sources(tmp_path):
+    registry._load_cached.cache_clear()
+    stale = tmp_path / "schema-0000.json"
+    stale.write_text("{}", encoding="utf-8")
+    unrelated = tmp_path / "other.json"
+    unrelated.write_text("{}", encoding="utf-8")
+
+    load_ontology_schema(tmp_path)
+
+    assert [p.name for p in tmp_path.glob("schema-*.json")] == [registry._cache_path(tmp_path).name]
+    assert unrelated.exists()
+    registry._load_cached.cache_clear()
@@ -0,0 +1,79 @@
+import pandas as pd
+
+from neo4j_ontology_loader.ingest.rollup import compute_bars, ingest_quotes_with_bars
+from neo4j_ontology_loader.ingest.rows import RowBatch
+from neo4j_ontology_loader.neo4j.execution import RetryPolicy
+
+QUOTES = pd.DataFrame({
+    "instrument_id": [100.0, 100.0, 100.0, 100.0],
+    "listing_id": [4, 4, 4, 4],
+    "quote": [12.0, 13.5, 11.0, 12.5],
+    # Out of order on purpose; 2024-01-08 is a Monday
+    "quote_date": ["2024-01-08T10:00:00", "2024-01-02", "2024-01-08T09:00:00Z", "2024-01-10"],
+})
+
+
+def bar(bars, period, start):
+    row = bars[(bars["period"] == period) & (bars["period_start"] == start)]
+    assert len(row) == 1
+    return row.iloc[0]
+
+
+def test_compute_bars_ohlc_per_period():
+    bars = compute_bars(QUOTES)
+    day = bar(bars, "day", "2024-01-08")
+    assert (day["open"], day["high"], day["low"], day["close"], day["count"]) == (11.0, 12.0, 11.0, 12.0, 2)
+    assert day["id"] == "100/4:day:2024-01-08"
+    assert day["first_quote_date"] == "2024-01-08T09:00:00.000000"
+
+    week = bar(bars, "week", "2024-01-08")
+    assert (week["open"], week["close"], week["count"]) == (11.0, 12.5, 3)
+    assert bar(bars, "week", "2024-01-01")["count"] == 1
+
+    month = bar(bars, "month", "2024-01-01")
+    assert (month["open"], month["high"], month["low"], month["close"], month["count"]) == (13.5, 13.5, 11.0, 12.5, 4)
+
+
+def test_compute_bars_ignores_unusable_quotes():
+    frame = pd.DataFrame({"instrument_id": ["1"], "listing_id": ["2"], "quote": ["n/a"], "quote_date": ["2024-01-01"]})
+    assert compute_bars(frame).empty
+
+
+class QuoteStore:
+    """Answers the rollup's MERGE with the keys it created and keeps the bar rows."""
+
+    def __init__(self):
+        self.quotes = set()
+        self.bar_rows = []
+
+    def __call__(self, query, params):
+        rows = params.get("rows", [])
+        if "QuoteBar" in query:
+            self.bar_rows.extend(rows)
+            return []
+        created = [r["key_value"] for r in rows if r["key_value"] not in self.quotes]
+        self.quotes.update(r["key_value"] for r in rows)
+        return [{"value": v} for v in created]
+
+
+def test_only_new_quotes_are_rolled_up(fake_graph):
+    store = QuoteStore()
+    graph = fake_graph(answer=store)
+    rows = QUOTES.assign(id=[f"q{i}" for i in range(4)]).to_dict(orient="records")
+    policy = RetryPolicy(max_attempts=1)
+    assert ingest_quotes_with_bars(graph, rows, periods=["day"], batch_size=3, policy=policy) == 4
+    assert sum(r["count"] for r in store.bar_rows) == 4
+
+    # Re-running the same quotes plus one late quote only adds the late one
+    late = {"id": "q9", "instrument_id": 100, "listing_id": 4, "quote": 10.0, "quote_date": "2024-01-08T08:00:00"}
+    assert ingest_quotes_with_bars(graph, rows + [late], periods=["day"], policy=policy) == 1
+    assert store.bar_rows[-1]["id"] == "100/4:day:2024-01-08" and store.bar_rows[-1]["open"] == 10.0
+
+
+def test_row_batches_are_rolled_up_like_dict_rows(fake_graph):
+    store = QuoteStore()
+    graph = fake_graph(answer=store)
+    rows = RowBatch.from_frame(QUOTES.assign(id=["q0", "q1", None, "q1"]))
+    assert ingest_quotes_with_bars(graph, rows, periods=["month"], policy=RetryPolicy(max_attempts=1)) == 2
+    # The later duplicate of q1 wins
+    assert store.bar_rows[0]["count"] == 2 and store.bar_rows[0]["close"] == 12.5
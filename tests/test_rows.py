@@ -0,0 +1,34 @@
+import math
+
+import pandas as pd
+
+from neo4j_ontology_loader.ingest.nodes import ingest_nodes
+from neo4j_ontology_loader.ingest.rows import RowBatch
+from neo4j_ontology_loader.neo4j.execution import RetryPolicy, WriteMetrics
+
+
+def test_row_batch_projects_columns_without_building_rows():
+    df = pd.DataFrame({"id": ["a", "b"], "quote": [1.5, None], "unused": [1, 2]})
+    batch = RowBatch.from_frame(df, {"quote", "id", "missing"})
+    assert batch.columns == ("id", "quote") and len(batch) == 2
+    assert batch.select(["id"]).column("id") is batch.column("id")
+    rows = list(batch.records())
+    assert rows[0] == {"id": "a", "quote": 1.5} and math.isnan(rows[1]["quote"])
+
+
+def test_row_batch_from_records_fills_missing_values():
+    batch = RowBatch.from_records([{"id": 1, "x": 2}, {"id": 3}], ["id", "x"])
+    assert batch.column("x") == [2, None]
+    assert batch.record(1) == {"id": 3, "x": None}
+
+
+def test_ingest_nodes_serializes_row_batches_per_write_batch(graph):
+    batch = RowBatch(["id", "quote"], [["a", None, "b", " ", "c"], [1.0, 2.0, 3.0, 4.0, 5.0]])
+    ingest_nodes(
+        graph, label="Quote", key="id", rows=batch, batch_size=2,
+        policy=RetryPolicy(max_attempts=1), metrics=WriteMetrics(),
+    )
+    assert [[r["key_value"] for r in params["rows"]] for _, params in graph.queries if "rows" in params] == [
+        ["a", "b"], ["c"],
+    ]
+    assert graph.written()[1]["props"] == {"id": "b", "quote": 3.0}
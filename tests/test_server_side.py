@@ -0,0 +1,90 @@
+import gzip
+import re
+
+from neo4j_ontology_loader.ingest.cypher_templates import load_csv_merge_nodes
+from neo4j_ontology_loader.ingest.server_side import (
+    csv_header,
+    file_url,
+    key_expression,
+    property_expressions,
+)
+from neo4j_ontology_loader.schema.szkb_specs import get_szkb_node_specs
+from neo4j_ontology_loader.schema.types import EntityDef, PropertyDef
+
+QUOTE = EntityDef(
+    name="Quote",
+    key="quote",
+    properties=[
+        PropertyDef(name="listing_id", type="str", required=True, unique=False),
+        PropertyDef(name="quote", type="float", required=True, unique=False),
+        PropertyDef(name="quote_date", type="str", required=True, unique=False),
+        PropertyDef(name="note", type="str | None", required=False, unique=False),
+    ],
+)
+
+
+def test_file_url_is_relative_to_import_dir():
+    assert file_url("szkb/quotes.csv") == "file:///szkb/quotes.csv"
+    assert file_url("quotes.csv", "file:///szkb") == "file:///szkb/quotes.csv"
+    assert file_url("my quotes.csv") == "file:///my%20quotes.csv"
+    assert file_url("https://example.org/q.csv") == "https://example.org/q.csv"
+
+
+def test_synthetic_key_expression():
+    assert key_expression("id") == "row.id"
+    assert key_expression("id", ("listing_id", "quote_date")) == "row.listing_id + ':' + row.quote_date"
+
+
+def test_property_expressions_cast_and_filter():
+    props = property_expressions(QUOTE, columns=["listing_id", "quote", "quote_date"])
+    assert props == {"listing_id": "row.listing_id", "quote": "toFloat(row.quote)", "quote_date": "row.quote_date"}
+    assert property_expressions(QUOTE, fields={"quote"}) == {"quote": "toFloat(row.quote)"}
+    assert property_expressions(None, fields={"id"}) == {"id": "row.id"}
+    assert property_expressions(None) is None
+
+
+def test_temporal_casts_follow_the_client_rules():
+    entity = EntityDef(
+        name="Rate",
+        key="rate",
+        properties=[
+            PropertyDef(name="day", type="date", required=False, unique=False),
+            PropertyDef(name="at", type="datetime | None", required=False, unique=False),
+        ],
+    )
+    props = property_expressions(entity)
+    day, at = props["day"], props["at"]
+    # A timestamp suffix is cut off before date(); malformed or impossible dates give null, not an error
+    assert "date(left(trim(row.day), 10))" in day
+    assert "(date(left(left(trim(row.day), 10), 7) + '-01') + duration('P1M') - duration('P1D')).day" in day
+    (date_pattern,) = re.findall(r"=~ '([^']*)'", day)
+    assert re.fullmatch(date_pattern, "2024-01-05T10:00:00Z"[:10])
+    assert not any(re.fullmatch(date_pattern, v[:10]) for v in ("05.01.2024", "2024-13-01", "n/a", "2024-1-5"))
+    # Naive date-times are read as UTC, as by to_utc_datetime
+    shape, date_only, naive = re.findall(r"=~ '([^']*)'", at)
+    assert "datetime(replace(trim(row.at), ' ', 'T') + 'Z')" in at
+    valid = ["2024-01-05", "2024-01-05T10:00", "2024-01-05T10:00:00.5+01:00", "2024-01-05T10:00:00Z"]
+    assert all(re.fullmatch(shape, v) for v in valid)
+    assert not any(re.fullmatch(shape, v) for v in ("2024-01-05Z", "2024-01-05T25:00", "yesterday"))
+    assert [v for v in valid if re.fullmatch(date_only, v)] == ["2024-01-05"]
+    assert [v for v in valid if re.fullmatch(naive, v)] == ["2024-01-05T10:00"]
+
+
+def test_load_csv_statement():
+    cypher = load_csv_merge_nodes("Quote", "id", "row.a + ':' + row.b", {"quote": "toFloat(row.quote)"}, 500)
+    assert "LOAD CSV WITH HEADERS FROM $url AS row" in cypher
+    assert "MERGE (n:Quote {id: key_value})" in cypher
+    assert "quote: coalesce(toFloat(row.quote), n.quote)" in cypher
+    assert "IN TRANSACTIONS OF 500 ROWS" in cypher
+    assert "SET n += row" in load_csv_merge_nodes("X", "id", "row.id", None, 10)
+
+
+def test_csv_header_reads_compressed(tmp_path):
+    path = tmp_path / "quotes.csv.gz"
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        f.write("listing_id,quote,quote_date\n4,12.5,2024-01-01\n")
+    assert csv_header(str(path)) == ["listing_id", "quote", "quote_date"]
+
+
+def test_only_bond_needs_client_side():
+    assert [s.label for s in get_szkb_node_specs() if s.client_only] == ["Bond"]
@@ -0,0 +1,45 @@
+import pytest
+
+from neo4j_ontology_loader.neo4j.session import run_query, stream_query, to_arrow, to_dataframe
+
+
+def quotes(fake_graph, n):
+    """A graph answering every query with ``n`` rows; ``graph.pulled`` lists the rows iterated so far."""
+    rows = [{"n": i, "name": f"q{i}"} for i in range(n)]
+
+    def answer(query, params):
+        for row in rows:
+            graph.pulled.append(row["n"])
+            yield row
+
+    graph = fake_graph(answer=answer)
+    graph.pulled = []
+    return graph
+
+
+def test_run_query_materializes_dicts(fake_graph):
+    assert run_query("RETURN 1", driver=quotes(fake_graph, 2)) == [{"n": 0, "name": "q0"}, {"n": 1, "name": "q1"}]
+
+
+def test_stream_query_is_lazy(fake_graph):
+    driver = quotes(fake_graph, 10)
+    records = stream_query("MATCH (q) RETURN q", driver=driver)
+    assert next(records) == {"n": 0, "name": "q0"}
+    assert driver.pulled == [0]
+    records.close()
+    assert driver.closed == 1
+
+
+def test_stream_query_batches_and_fetch_size(fake_graph):
+    driver = quotes(fake_graph, 7)
+    batches = list(stream_query("MATCH (q) RETURN q", driver=driver, batch_size=3, database="db"))
+    assert [len(b) for b in batches] == [3, 3, 1]
+    assert driver.sessions == [{"database": "db", "fetch_size": 3}]
+
+
+def test_to_dataframe_and_arrow(fake_graph):
+    frame = to_dataframe("MATCH (q) RETURN q", driver=quotes(fake_graph, 3))
+    assert list(frame["n"]) == [0, 1, 2]
+    pytest.importorskip("pyarrow")
+    table = to_arrow("MATCH (q) RETURN q", driver=quotes(fake_graph, 3))
+    assert table.num_rows == 3 and table.column_names == ["n", "name"]
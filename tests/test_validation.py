@@ -0,0 +1,86 @@
+import io
+from typing import Literal
+
+import pandas as pd
+from pydantic import BaseModel
+
+from neo4j_ontology_loader.ingest.validation import (
+    compile_entity,
+    compile_model,
+    validate_frame,
+    validator_for,
+)
+from neo4j_ontology_loader.models.quotes import Quote
+from neo4j_ontology_loader.models.types import Price
+from neo4j_ontology_loader.schema.szkb_specs import szkb_bond_entity
+
+
+def test_quote_columns_are_coerced_and_bad_rows_rejected():
+    csv = (
+        "instrument_id,listing_id,quote,quote_date,extra\n"
+        "1,4411,12.5,2024-01-01,x\n"
+        "2,,abc,2024-01-02,y\n"
+        "3,4412,7,2024-01-03,z\n"
+    )
+    df = pd.read_csv(io.StringIO(csv))
+    result = validate_frame(df, compile_model(Quote))
+
+    rows = result.frame.to_dict(orient="records")
+    assert [r["listing_id"] for r in rows] == ["4411", "4412"]
+    assert [r["instrument_id"] for r in rows] == ["1", "3"]
+    assert [r["quote"] for r in rows] == [12.5, 7.0]
+    # Non-model columns pass through untouched
+    assert [r["extra"] for r in rows] == ["x", "z"]
+
+    assert result.rows_checked == 3 and result.rows_rejected == 1
+    assert {(e.row, e.field, e.reason) for e in result.errors} == {
+        (1, "listing_id", "missing-value"),
+        (1, "quote", "invalid-float"),
+    }
+
+
+def test_missing_required_column_rejects_chunk():
+    df = pd.DataFrame({"instrument_id": ["1"], "listing_id": ["2"], "quote": [1.0]})
+    result = validate_frame(df, compile_model(Quote))
+    assert result.frame.empty
+    assert result.errors[0].reason == "missing-column"
+
+
+def test_bool_literal_int_and_complex_fallback():
+    class Sample(BaseModel):
+        flag: bool = False
+        kind: Literal["a", "b"] | None = None
+        count: int | None = None
+        price: Price | None = None
+
+    df = pd.DataFrame({
+        "flag": ["yes", "no", "maybe", "TRUE"],
+        "kind": ["a", "c", None, "b"],
+        "count": [1, 2.5, None, 4],
+        "price": ['{"type": "actual", "value": 1.5}', None, None, '{"type": "bad", "value": 1}'],
+    })
+    result = validate_frame(df, compile_model(Sample))
+    rows = result.frame.to_dict(orient="records")
+    assert rows == [
+        {"flag": True, "kind": "a", "count": 1, "price": {"type": "actual", "value": 1.5, "currency": None}},
+    ]
+    assert {(e.row, e.field) for e in result.errors} == {
+        (1, "kind"), (1, "count"), (2, "flag"), (3, "price"),
+    }
+
+
+def test_validator_for_falls_back_to_entity_def():
+    assert validator_for("Quote").label == "Quote"
+    assert validator_for("Bond") is None
+    bond = compile_entity(szkb_bond_entity())
+    kinds = {r.name: r.kind for r in bond.rules}
+    assert kinds["is_callable"] == "bool" and kinds["denomination"] == "float"
+
+
+def test_cross_rate_dates_become_utc_datetimes():
+    from neo4j_ontology_loader.models.cross_currency_rate import CrossCurrencyRate
+
+    df = pd.DataFrame({"currency": ["USD", "EUR"], "cross_rate": [0.9, 0.95], "date": ["2024-01-01", "not a date"]})
+    result = validate_frame(df, compile_model(CrossCurrencyRate))
+    assert result.frame["date"].tolist() == [pd.Timestamp("2024-01-01", tz="UTC")]
+    assert [(e.field, e.reason) for e in result.errors] == [("date", "invalid-datetime")]
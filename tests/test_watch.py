@@ -0,0 +1,113 @@
+import json
+import os
+
+import pytest
+from neo4j.exceptions import ServiceUnavailable
+
+from neo4j_ontology_loader.ingest import watch
+from neo4j_ontology_loader.ingest.watch import FolderWatcher, label_route, szkb_routes
+from neo4j_ontology_loader.schema.registry import load_ontology_schema
+
+
+@pytest.fixture
+def writes(monkeypatch):
+    calls = []
+
+    def fake_ingest_nodes(driver, label, key, rows, **kwargs):
+        if driver == "down":
+            raise ServiceUnavailable("no route")
+        calls.append((label, key, list(rows.records())))
+
+    monkeypatch.setattr(watch, "ingest_nodes", fake_ingest_nodes)
+    return calls
+
+
+def _drop(directory, name, text):
+    path = directory / name
+    path.write_text(text)
+    return path
+
+
+def _watcher(directory, driver=None, **kwargs):
+    routes = [label_route("venues_*.csv", "TradingVenue", "id", None)] + szkb_routes(load_ontology_schema())
+    kwargs.setdefault("settle", 0)
+    return FolderWatcher(driver, str(directory), routes, inotify=False, **kwargs)
+
+
+def test_watch_coalesces_files_per_label_and_records_them(tmp_path, writes):
+    _drop(tmp_path, "quotes_0900.csv", "instrument_id,listing_id,quote,quote_date\n100,4,12.5,2024-01-01\n")
+    _drop(tmp_path, "quotes_0905.csv", "instrument_id,listing_id,quote,quote_date\n100,4,12.7,2024-01-02\n")
+    _drop(tmp_path, "venues_a.csv", "id,name\n4,SIX\n")
+    _drop(tmp_path, "notes.txt", "not a feed")
+
+    stats = _watcher(tmp_path).run(once=True)
+
+    assert stats.files == 3 and stats.batches == 2 and stats.rows == 3
+    quotes = next(rows for label, _, rows in writes if label == "Quote")
+    assert [row["id"] for row in quotes] == ["4:2024-01-01", "4:2024-01-02"]
+    journal = [json.loads(line) for line in (tmp_path / ".nolo-watch.jsonl").read_text().splitlines()]
+    assert sorted(entry["name"] for entry in journal) == ["quotes_0900.csv", "quotes_0905.csv", "venues_a.csv"]
+
+    # Recorded files are not loaded again; a replaced file is
+    writes.clear()
+    assert _watcher(tmp_path).run(once=True).files == 0
+    path = _drop(tmp_path, "venues_a.csv", "id,name\n4,SIX Swiss Exchange\n")
+    os.utime(path, ns=(path.stat().st_atime_ns, path.stat().st_mtime_ns + 1))
+    assert _watcher(tmp_path).run(once=True).files == 1
+    assert writes == [("TradingVenue", "id", [{"id": "4", "name": "SIX Swiss Exchange"}])]
+
+
+def test_watch_keeps_batches_when_writes_fail(tmp_path, writes):
+    _drop(tmp_path, "venues_a.csv", "id,name\n4,SIX\n")
+    watcher = _watcher(tmp_path, driver="down", max_latency=0)
+
+    watcher.poll_once()
+    with pytest.raises(ServiceUnavailable):
+        watcher.flush_due()
+    assert not (tmp_path / ".nolo-watch.jsonl").exists()
+
+    # Once the database is back the buffered rows are written and the file recorded
+    watcher.driver = None
+    watcher.flush_due()
+    assert writes == [("TradingVenue", "id", [{"id": "4", "name": "SIX"}])]
+    assert "venues_a.csv" in (tmp_path / ".nolo-watch.jsonl").read_text()
+
+
+def test_watch_flushes_at_batch_rows_and_gives_up_on_bad_files(tmp_path, writes):
+    rows = "".join(f"{i},venue {i}\n" for i in range(5))
+    _drop(tmp_path, "venues_a.csv", "id,name\n" + rows)
+    _drop(tmp_path, "venues_b.csv", "id,name\n1,a\n2,b,c,d\n")
+    watcher = _watcher(tmp_path, batch_rows=2, chunk_size=2, max_attempts=2, max_latency=3600)
+
+    watcher.poll_once()
+    watcher.poll_once()
+
+    # Written while reading (2 + 2 rows), the rest waits for the latency deadline
+    assert [len(batch) for _, _, batch in writes] == [2, 2]
+    assert watcher.journal.status("venues_b.csv") == "failed"
+    assert watcher.journal.status("venues_a.csv") is None
+    watcher.flush_due(force=True)
+    assert watcher.journal.status("venues_a.csv") == "done"
+
+
+def test_watch_adds_no_rows_of_a_file_that_fails_half_way(tmp_path, writes, monkeypatch):
+    read_chunks = watch._chunks
+
+    def failing_chunks(path, plan, chunk_size):
+        chunks = read_chunks(path, plan, chunk_size)
+        yield next(chunks)
+        raise OSError("connection to the share lost")
+
+    monkeypatch.setattr(watch, "_chunks", failing_chunks)
+    _drop(tmp_path, "venues_b.csv", "id,name\n1,a\n2,b\n")
+    watcher = _watcher(tmp_path, chunk_size=1, max_attempts=3, max_latency=3600)
+
+    for _ in range(3):
+        watcher.poll_once()
+
+    # The rows read before each failure go with the attempt instead of piling up once per retry
+    assert watcher.journal.status("venues_b.csv") == "failed"
+    assert "TradingVenue" not in watcher._pending
+    assert watcher.stats.files == 0
+    watcher.flush_due(force=True)
+    assert writes == []